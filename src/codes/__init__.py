@@ -1,14 +1,31 @@
 """
 Specific quantum error correction code implementations.
-Includes Hamming, Steane, Reed-Muller, Surface, and Color codes.
+Includes Hamming, Steane, Shor, Reed-Muller, Surface, and Color codes, plus
+hypergraph-product and bivariate-bicycle quantum LDPC codes, and
+concatenated codes with a hierarchical soft decoder.
 """
 
-from .steane import SteaneCode, SteaneGame
-from .reed_muller import ReedMullerCode, ReedMullerGame
+from ..utils.lazy import lazy_exports
 
-__all__ = [
-    'SteaneCode',
-    'SteaneGame',
-    'ReedMullerCode',
-    'ReedMullerGame',
-]
+# Exported name -> defining submodule, imported on first access (PEP 562)
+_EXPORTS = {
+    'SteaneCode': '.steane',
+    'SteaneGame': '.steane',
+    'ShorCode': '.shor',
+    'ShorEngineCode': '.shor',
+    'ShorDecoder': '.shor',
+    'ReedMullerCode': '.reed_muller',
+    'ReedMullerGame': '.reed_muller',
+    'TriangularColorCode': '.color',
+    'ColorCodeRestrictionDecoder': '.color',
+    'SparseCSSCode': '.qldpc',
+    'HypergraphProductCode': '.qldpc',
+    'BivariateBicycleCode': '.qldpc',
+    'repetition_checks': '.qldpc',
+    'ConcatenatedCode': '.concatenated',
+    'HierarchicalDecoder': '.concatenated',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
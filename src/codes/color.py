@@ -0,0 +1,407 @@
+"""
+Triangular 6.6.6 color codes and a restriction decoder.
+
+The distance-d triangular color code places n = (3d^2 + 1) / 4 qubits on the
+vertices of a honeycomb lattice cut into a triangle. Every hexagonal (or
+truncated, weight-4) face is both an X and a Z stabilizer, so Hx = Hz = H.
+Faces are 3-colorable and each side of the triangle carries one color. The
+d = 3 member is the Steane code: 7 qubits, three weight-4 faces.
+
+Lattice coordinates: points (i, j) of a triangular lattice with i, j >= 0 and
+i + j <= N, N = 3(d - 1) / 2. Points with (i + 2j) mod 3 == 1 are face centers,
+all others are qubits; a face contains its (up to six) lattice neighbours.
+Face (i, j) has color i mod 3. The side j = 0 borders the missing color-0
+faces, i + j = N the color-1 faces and i = 0 the color-2 faces.
+"""
+
+import numpy as np
+from itertools import product
+from typing import Dict, List, Tuple
+
+from ..core.code_abstractions import CodeDefinition
+from ..core.decoders import Decoder
+
+# Lattice neighbour offsets of a point on the triangular lattice
+_NEIGHBOURS = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
+COLOR_NAMES = ('red', 'green', 'blue')
+
+
+class TriangularColorCode(CodeDefinition):
+    """
+    Triangular 6.6.6 color code of odd distance on qubits (d=2).
+
+    Attributes:
+        H: Face-qubit incidence matrix (the X and the Z check matrix)
+        face_qubits: Qubit indices of every face, in order around the face
+        face_colors: Color (0, 1, 2) of every face
+        boundary_qubits: Qubits on the side of each color, indexed by color
+        qubit_positions: (n, 2) Cartesian coordinates for drawing
+        face_centers: (m, 2) Cartesian coordinates of the face centers
+    """
+    def __init__(self, distance: int = 3):
+        """
+        :param distance: Code distance; odd and at least 3.
+        """
+        if distance < 3 or distance % 2 == 0:
+            raise ValueError(f"Triangular color codes need an odd distance >= 3, got {distance}.")
+        super().__init__(d=2, L=distance)
+        self._build_lattice()
+
+    def _build_lattice(self):
+        N = 3 * (self.L - 1) // 2
+        i, j = np.array([(a, b) for a in range(N + 1) for b in range(N + 1 - a)]).T
+        is_face = (i + 2 * j) % 3 == 1
+
+        index = np.full((N + 3, N + 3), -1, dtype=np.int64)  # padded so i-1, j-1 index -1
+        qi, qj = i[~is_face], j[~is_face]
+        index[qi, qj] = np.arange(len(qi))
+        fi, fj = i[is_face], j[is_face]
+
+        # Neighbours are visited in angular order, so face_qubits trace the polygon
+        neighbours = np.stack([index[fi + di, fj + dj] for di, dj in _NEIGHBOURS], axis=1)
+        self.face_qubits: List[np.ndarray] = [row[row >= 0] for row in neighbours]
+        self.face_colors = fi % 3
+        self.H = np.zeros((len(fi), len(qi)), dtype=np.uint8)
+        for face, qubits in enumerate(self.face_qubits):
+            self.H[face, qubits] = 1
+
+        self.boundary_qubits = [np.flatnonzero(qj == 0), np.flatnonzero(qi + qj == N),
+                                np.flatnonzero(qi == 0)]
+        to_xy = lambda a, b: np.column_stack([a + b / 2.0, b * np.sqrt(3) / 2.0])
+        self.qubit_positions = to_xy(qi, qj)
+        self.face_centers = to_xy(fi, fj)
+
+    @property
+    def n_physical(self) -> int:
+        return (3 * self.L**2 + 1) // 4
+
+    @property
+    def k_logical(self) -> int:
+        return 1
+
+    @property
+    def distance(self) -> int:
+        return self.L
+
+    def get_stabilizer_matrix(self) -> np.ndarray:
+        # X-type face checks stacked on identical Z-type face checks
+        return np.vstack([self.H, self.H])
+
+    def get_css_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.H, self.H
+
+    def get_topology(self) -> str:
+        return "Triangular 6.6.6 Color Code (Qubit)"
+
+    def get_geometry(self) -> Dict:
+        """
+        Drawing data for the visualizers.
+
+        :return: Dictionary with 'qubit_positions', 'face_centers', 'face_colors'
+                 (color names), 'face_qubits' (polygon vertex order) and
+                 'boundary_qubits' keyed by color name.
+        """
+        return {
+            'qubit_positions': self.qubit_positions.tolist(),
+            'face_centers': self.face_centers.tolist(),
+            'face_colors': [COLOR_NAMES[c] for c in self.face_colors],
+            'face_qubits': [qubits.tolist() for qubits in self.face_qubits],
+            'boundary_qubits': {COLOR_NAMES[c]: q.tolist() for c, q in enumerate(self.boundary_qubits)},
+        }
+
+
+def _gf2_solver(M: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute solutions of M x = b over GF(2) for a small matrix M (r x k).
+
+    Returns:
+        Tuple (P, N): x = P b solves the system whenever it is consistent, and
+        the rows of N span the nullspace of M
+    """
+    A = M.astype(np.uint8) % 2
+    r, k = A.shape
+    T = np.eye(r, dtype=np.uint8)
+    pivots = []
+    row = 0
+    for col in range(k):
+        hits = np.flatnonzero(A[row:, col]) + row
+        if hits.size == 0:
+            continue
+        p = hits[0]
+        A[[row, p]], T[[row, p]] = A[[p, row]], T[[p, row]]
+        others = np.flatnonzero(A[:, col])
+        others = others[others != row]
+        A[others] ^= A[row]
+        T[others] ^= T[row]
+        pivots.append(col)
+        row += 1
+        if row == r:
+            break
+    P = np.zeros((k, r), dtype=np.uint8)
+    P[pivots] = T[:len(pivots)]
+    free = [col for col in range(k) if col not in pivots]
+    N = np.zeros((len(free), k), dtype=np.uint8)
+    for f, col in enumerate(free):
+        N[f, col] = 1
+        N[f, pivots] = A[:len(pivots), col]
+    return P, N
+
+
+class ColorCodeRestrictionDecoder(Decoder):
+    """
+    Restriction decoder for triangular color codes (Delfosse; Kubica-Delfosse).
+
+    Faces and the three sides form a 3-colored graph in which two vertices
+    are adjacent when they share qubits. Every qubit lies on exactly one
+    vertex of each color, so the syndrome of a side vertex is the error
+    weight parity plus the parity of the lit faces of its color. The two
+    parities give corrections in the two logical classes; both are tried.
+
+    For a shared color, keeping only its vertices and one other color gives
+    a restricted lattice whose defects, sides included, are paired along
+    shortest paths by a minimum-weight perfect matching (exact for small
+    defect counts, greedy beyond). The matched edges are lifted to qubits
+    locally around every shared-color vertex: the lightest set of that
+    vertex's qubits whose overlap parities with its neighbours equal its
+    matched edges.
+
+    Matching lengths do not track lifted weights, and near the sides a
+    restriction can return a heavy representative of the right class. So
+    every shared color is tried, each candidate is reduced by flipping
+    faces and adjacent face pairs while that lowers its weight, and the
+    lightest candidate is kept.
+
+    Two corrections of weight at most t = (d - 1) / 2 with the same syndrome
+    differ by a stabilizer, so a candidate that light is right. When none
+    is, a bounded depth-first search looks for any correction of weight at
+    most t. Every error of weight up to t is therefore corrected; the
+    search only runs for heavier candidates, which are rare at low noise.
+
+    Corrections always reproduce the syndrome. decode_batch takes face
+    syndromes of shape (shots, m) and returns (shots, n) corrections.
+    """
+    name = "color_restriction"
+    # Largest defect count per restricted lattice matched exactly (2^k work)
+    EXACT_MATCHING = 12
+
+    def __init__(self, code: TriangularColorCode):
+        m, n = code.H.shape
+        super().__init__(n, m)
+        self.code = code
+        # Vertices: faces 0..m-1, then one boundary vertex per color (m + color)
+        self.vertex_colors = np.concatenate([code.face_colors, np.arange(3)])
+        self.vertex_qubits = list(code.face_qubits) + list(code.boundary_qubits)
+
+        incidence = np.zeros((m + 3, n), dtype=np.int64)
+        for v, qubits in enumerate(self.vertex_qubits):
+            incidence[v, qubits] = 1
+        overlaps = incidence @ incidence.T
+        # Sides meet at the corner qubits, so they are adjacent to each other too
+        self.adjacent = np.column_stack(np.nonzero(np.triu(overlaps > 0, 1)))
+        self.restrictions = [self._restriction(color) for color in range(3)]
+
+        # Descent moves: every face, and every pair of faces that share qubits
+        a, b = np.nonzero(np.triu(overlaps[:m, :m] > 0, 1))
+        H = code.H.astype(np.int64)
+        self.moves = np.vstack([H, H[a] ^ H[b]])
+
+        # Bounded search: faces as bits of Python integers
+        self.radius = (code.distance - 1) // 2
+        self.qubit_faces = [sum(1 << int(f) for f in np.flatnonzero(column)) for column in code.H.T]
+
+    def _restriction(self, shared: int) -> Dict:
+        """Edges, restricted lattices and lifts for one shared color."""
+        u, w = self.adjacent.T
+        keep = (self.vertex_colors[u] == shared) ^ (self.vertex_colors[w] == shared)
+        u, w = u[keep], w[keep]
+        # Orient every edge as (shared-color vertex, other vertex)
+        swap = self.vertex_colors[u] != shared
+        edges = np.column_stack([np.where(swap, w, u), np.where(swap, u, w)])
+        return {'shared': shared, 'edges': edges,
+                'lattices': [self._restricted_lattice(edges, color) for color in range(3) if color != shared],
+                'lifts': [self._lift(edges, v) for v in np.flatnonzero(self.vertex_colors == shared)]}
+
+    def _restricted_lattice(self, edges: np.ndarray, color: int) -> Dict:
+        """
+        Edges between the shared color and 'color', with breadth-first
+        shortest paths between all of the lattice's vertices.
+        """
+        edge_ids = np.flatnonzero(self.vertex_colors[edges[:, 1]] == color)
+        adjacency: Dict[int, List[Tuple[int, int]]] = {}
+        for e in edge_ids:
+            a, b = (int(x) for x in edges[e])
+            adjacency.setdefault(a, []).append((b, int(e)))
+            adjacency.setdefault(b, []).append((a, int(e)))
+
+        size = len(self.vertex_colors)
+        distance = np.full((size, size), size, dtype=np.int64)
+        via_edge = np.full((size, size), -1, dtype=np.int64)   # last edge on the path source -> v
+        via_vertex = np.full((size, size), -1, dtype=np.int64)
+        for source in adjacency:
+            distance[source, source] = 0
+            frontier = [source]
+            for v in frontier:
+                for w, e in adjacency[v]:
+                    if distance[source, w] == size:
+                        distance[source, w] = distance[source, v] + 1
+                        via_edge[source, w], via_vertex[source, w] = e, v
+                        frontier.append(w)
+        return {'color': color, 'distance': distance, 'via_edge': via_edge, 'via_vertex': via_vertex}
+
+    def _path(self, lattice: Dict, source: int, target: int) -> List[int]:
+        """Edge ids of the stored shortest path from source to target."""
+        edges = []
+        while target != source:
+            edges.append(int(lattice['via_edge'][source, target]))
+            target = int(lattice['via_vertex'][source, target])
+        return edges
+
+    def _match(self, lattice: Dict, defects: np.ndarray) -> List[int]:
+        """
+        Pair up an even number of defects with minimum total path length,
+        exactly for up to EXACT_MATCHING defects and greedily beyond.
+
+        Returns:
+            Edge ids of the matching paths (an edge may appear twice)
+        """
+        k = len(defects)
+        pair_cost = lattice['distance'][np.ix_(defects, defects)]
+
+        pairs: List[Tuple[int, int]] = []
+        if k <= self.EXACT_MATCHING:
+            # best[mask] = cheapest perfect matching of the defects in an even
+            # mask; the lowest defect in the mask is paired with another one
+            full = (1 << k) - 1
+            best = np.zeros(1 << k, dtype=np.int64)
+            choice = np.zeros(1 << k, dtype=np.int64)
+            for mask in range(3, full + 1):
+                if bin(mask).count('1') % 2:
+                    continue
+                i = (mask & -mask).bit_length() - 1
+                rest = mask ^ (1 << i)
+                best[mask] = -1
+                j_mask = rest
+                while j_mask:
+                    j = (j_mask & -j_mask).bit_length() - 1
+                    j_mask ^= 1 << j
+                    cost = pair_cost[i, j] + best[rest ^ (1 << j)]
+                    if best[mask] < 0 or cost < best[mask]:
+                        best[mask], choice[mask] = cost, j
+            mask = full
+            while mask:
+                i = (mask & -mask).bit_length() - 1
+                j = int(choice[mask])
+                pairs.append((i, j))
+                mask ^= (1 << i) | (1 << j)
+        else:
+            left = set(range(k))
+            while left:
+                i, j = min(((i, j) for i in left for j in left if i < j), key=lambda ij: pair_cost[ij])
+                pairs.append((i, j))
+                left -= {i, j}
+
+        edges: List[int] = []
+        for i, j in pairs:
+            edges.extend(self._path(lattice, int(defects[i]), int(defects[j])))
+        return edges
+
+    def _lift(self, edges: np.ndarray, v: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Local lifting data for a shared-color vertex: (qubits, edges, P, N)."""
+        qubits = np.asarray(self.vertex_qubits[v])
+        edge_ids = np.flatnonzero(edges[:, 0] == v)
+        M = np.zeros((len(edge_ids), len(qubits)), dtype=np.uint8)
+        for r, e in enumerate(edge_ids):
+            M[r] = np.isin(qubits, self.vertex_qubits[edges[e, 1]])
+        P, N = _gf2_solver(M)
+        return qubits, edge_ids, P, N
+
+    def _vertex_syndromes(self, faces: np.ndarray, parity: int) -> np.ndarray:
+        """Face syndromes extended by the three sides, for a given error weight parity."""
+        lit_by_color = np.stack([faces[:, self.code.face_colors == c].sum(axis=1) for c in range(3)], axis=1)
+        return np.concatenate([faces, (lit_by_color + parity) % 2], axis=1)
+
+    def _restrict_and_lift(self, restriction: Dict, vertices: np.ndarray) -> np.ndarray:
+        """Corrections for vertex syndromes (shots, m + 3) through one shared color."""
+        matched = np.zeros((len(vertices), len(restriction['edges'])), dtype=np.uint8)
+        for u, row in enumerate(vertices):
+            lit = np.flatnonzero(row)
+            for lattice in restriction['lattices']:
+                colors = (restriction['shared'], lattice['color'])
+                defects = lit[np.isin(self.vertex_colors[lit], colors)]
+                if defects.size:
+                    np.add.at(matched[u], self._match(lattice, defects), 1)
+        matched %= 2
+
+        # Local lift around every shared-color vertex, vectorized over the batch
+        corrections = np.zeros((len(vertices), self.n), dtype=np.uint8)
+        for qubits, edge_ids, P, N in restriction['lifts']:
+            local = (matched[:, edge_ids].astype(np.int64) @ P.T.astype(np.int64)) % 2
+            if len(N):
+                options = np.array([(local + np.array(c) @ N) % 2
+                                    for c in product((0, 1), repeat=len(N))])
+                local = options[options.sum(axis=2).argmin(axis=0), np.arange(len(local))]
+            corrections[:, qubits] ^= local.astype(np.uint8)
+        return corrections
+
+    def _descend(self, corrections: np.ndarray) -> np.ndarray:
+        """Apply weight-lowering face moves until none is left; the syndrome is unchanged."""
+        corrections = corrections.astype(np.int64)
+        sizes = self.moves.sum(axis=1)
+        while True:
+            gain = 2 * (corrections @ self.moves.T) - sizes
+            best = gain.argmax(axis=1)
+            rows = np.flatnonzero(gain[np.arange(len(corrections)), best] > 0)
+            if not len(rows):
+                return corrections.astype(np.uint8)
+            corrections[rows] ^= self.moves[best[rows]]
+
+    def _search(self, lit: int, budget: int, chosen: List[int]) -> bool:
+        """
+        Depth-first search for at most budget qubits whose faces XOR to lit.
+
+        Some flipped qubit must lie on the lowest lit face, so branching over
+        that face's qubits misses no solution. A qubit clears at most three
+        lit faces, which bounds the search from below.
+
+        Args:
+            lit: Lit faces as a bitmask
+            budget: Qubits left to flip
+            chosen: Qubits flipped so far, extended in place on success
+
+        Returns:
+            True if a solution was found
+        """
+        if not lit:
+            return True
+        if 3 * budget < bin(lit).count('1'):
+            return False
+        face = (lit & -lit).bit_length() - 1
+        for q in self.code.face_qubits[face]:
+            if q in chosen:
+                continue
+            chosen.append(int(q))
+            if self._search(lit ^ self.qubit_faces[q], budget - 1, chosen):
+                return True
+            chosen.pop()
+        return False
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.asarray(syndromes) % 2
+        unique_rows, inverse = np.unique(syndromes, axis=0, return_inverse=True)
+
+        # Once per distinct syndrome, weight parity and shared color; keep the lightest
+        candidates = np.array([self._descend(self._restrict_and_lift(restriction, vertices))
+                               for vertices in (self._vertex_syndromes(unique_rows, parity) for parity in (0, 1))
+                               for restriction in self.restrictions])
+        lightest = candidates.sum(axis=2).argmin(axis=0)
+        corrections = candidates[lightest, np.arange(len(unique_rows))]
+
+        # Above (d - 1) / 2 a candidate can be in the wrong class; look for a light enough one
+        for row in np.flatnonzero(corrections.sum(axis=1) > self.radius):
+            chosen: List[int] = []
+            lit = sum(1 << int(f) for f in np.flatnonzero(unique_rows[row]))
+            if self._search(lit, self.radius, chosen):
+                corrections[row] = 0
+                corrections[row, chosen] = 1
+        return corrections[inverse.reshape(-1)]
@@ -0,0 +1,327 @@
+"""
+Concatenated codes ("a puzzle within a puzzle") and hierarchical soft decoding.
+
+Level 1 encodes the physical bits in blocks of the innermost code. The
+logical bits of those blocks become the bits of the level-2 code, and so on.
+Checks of every level are lifted to physical qubits by composing sparse
+matrices, so a code such as Steane^3 (343 qubits) never needs a dense check
+matrix.
+
+Decoding runs level by level (the message passing of Poulin, "Optimal and
+efficient decoding of concatenated quantum block codes"):
+
+1. Each block enumerates the error patterns consistent with its syndrome and
+   weighs them with the per-bit flip probabilities coming from below. This
+   gives soft probabilities that each of its logical bits is flipped.
+2. Those probabilities are the priors for the bits of the next level.
+3. The top level picks the most likely logical class. The choice is pushed
+   back down, and each block takes its most likely pattern within the
+   requested class.
+
+Everything is vectorized over shots, and every level's coset tables are
+precomputed once.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..core.code_abstractions import CodeDefinition
+from ..core.code_parameters import code_parameters
+from ..core.decoders import Decoder, pack_bits, unpack_bits
+from ..utils import gf2
+from ..utils.sparse import CSRMatrix
+
+# Largest block length whose 2^n error patterns are enumerated per level
+MAX_BLOCK_BITS = 20
+
+
+def _css_pair(code) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """
+    (Hx, Hz) of a CSS code, or (None, H) of a classical code.
+
+    Accepts CodeDefinitions, objects with 'Hx' and 'Hz' attributes (such as
+    ReedMullerCode), SteaneCode style objects with an 'H' attribute (used for
+    both X and Z checks when that is a valid CSS code), and plain check
+    matrices.
+    """
+    if isinstance(code, CodeDefinition):
+        css = code.get_css_matrices()
+        if css is not None:
+            return np.asarray(css[0]) % 2, np.asarray(css[1]) % 2
+        return None, np.asarray(code.get_stabilizer_matrix()) % 2
+    if hasattr(code, 'Hx') and hasattr(code, 'Hz'):
+        return np.asarray(code.Hx) % 2, np.asarray(code.Hz) % 2
+    if hasattr(code, 'H'):
+        H = np.asarray(code.H) % 2
+        if hasattr(code, 'parameters') and code.parameters()['kind'] == 'css':
+            return H, H
+        return None, H
+    return None, np.asarray(code) % 2
+
+
+class CodeLevel:
+    """One level of a concatenated code with its decoding tables."""
+
+    def __init__(self, code):
+        self.Hx, self.Hz = _css_pair(code)
+        self.n = self.Hz.shape[1]
+        if self.n > MAX_BLOCK_BITS:
+            raise ValueError(f"Blocks of {self.n} bits are too long to enumerate (max {MAX_BLOCK_BITS}).")
+
+        # Z logicals classify X errors; X logicals are paired with them (Lx @ Lz.T = I)
+        within = np.eye(self.n, dtype=np.uint8) if self.Hx is None else gf2.nullspace(self.Hx)
+        self.Lz = gf2.complement_basis(self.Hz, within)
+        self.k = len(self.Lz)
+        if self.k == 0:
+            raise ValueError("A concatenation level must encode at least one logical bit.")
+        if self.Hx is not None:
+            Lx = gf2.complement_basis(self.Hx, gf2.nullspace(self.Hz))
+            gram = (Lx.astype(np.int64) @ self.Lz.T) % 2
+            self.Lx = (gf2.inverse(gram).astype(np.int64) @ Lx) % 2
+        else:
+            self.Lx = None
+        self.params = code_parameters(H=self.Hz) if self.Hx is None else \
+            code_parameters(Hx=self.Hx, Hz=self.Hz)
+        self._build_tables()
+
+    def _build_tables(self):
+        n = self.n
+        self.patterns = unpack_bits(np.arange(1 << n, dtype=np.uint64), n)
+        syndrome_keys = pack_bits((self.patterns.astype(np.int64) @ self.Hz.T) % 2).astype(np.int64)
+        class_keys = pack_bits((self.patterns.astype(np.int64) @ self.Lz.T) % 2).astype(np.int64)
+
+        # cosets[c] lists the patterns with the c-th reachable syndrome; all cosets are equally large
+        order = np.argsort(syndrome_keys, kind='stable')
+        reachable, first = np.unique(syndrome_keys[order], return_index=True)
+        self.cosets = order.reshape(len(reachable), -1)
+        self.coset_of = np.full(1 << self.Hz.shape[0], -1, dtype=np.int64)
+        self.coset_of[reachable] = np.arange(len(reachable))
+
+        # Classes are relative to each coset's lightest pattern
+        weights = self.patterns.sum(axis=1)[self.cosets]
+        self.canonical = self.cosets[np.arange(len(reachable)), weights.argmin(axis=1)]
+        self.relative_class = class_keys[self.cosets] ^ class_keys[self.canonical][:, None]
+        self.relative_bits = unpack_bits(self.relative_class, self.k).astype(np.float64)
+        self.canonical_bits = unpack_bits(class_keys[self.canonical], self.k)
+
+
+class ConcatenatedCode(CodeDefinition):
+    """
+    Concatenation of codes listed from the innermost (physical) level outwards.
+
+    The logical bits of level i, in block order, are the bits of level i+1;
+    the number of blocks per level is the smallest for which they fill whole
+    blocks (e.g. 15 Hamming [7,4] blocks feed 4 blocks of a 15-bit code). The
+    code is CSS when every
+    level is. Otherwise only the bit-flip (Z-check) side is kept and the code is
+    classical.
+    """
+    def __init__(self, codes: Sequence):
+        """
+        :param codes: Innermost code first, e.g. [SteaneCode(), SteaneCode()].
+        """
+        self.levels = [CodeLevel(code) for code in codes]
+        self.blocks = self._block_counts()
+        super().__init__(d=2, L=len(self.levels))
+        self.is_css = all(level.Hx is not None for level in self.levels)
+        self.sparse_Hz, self.level_rows = self._lift('Hz', 'Lz')
+        self.sparse_Hx = self._lift('Hx', 'Lx')[0] if self.is_css else None
+
+    def _block_counts(self) -> List[int]:
+        """
+        Number of blocks per level, using the fewest top blocks for which every
+        level's logical bits fill whole blocks of the level above.
+        """
+        limit = int(np.prod([level.k for level in self.levels]))
+        for top in range(1, limit + 1):
+            blocks = [top]
+            for lower, upper in zip(self.levels[-2::-1], self.levels[:0:-1]):
+                carried = blocks[0] * upper.n
+                if carried % lower.k:
+                    break
+                blocks.insert(0, carried // lower.k)
+            else:
+                return blocks
+        raise ValueError("Level sizes are incompatible.")
+
+    @classmethod
+    def repeated(cls, code, levels: int) -> 'ConcatenatedCode':
+        """Concatenate a code with itself, e.g. ConcatenatedCode.repeated(SteaneCode(), 3)."""
+        return cls([code] * levels)
+
+    def _lift(self, checks: str, logicals: str) -> Tuple[CSRMatrix, List[int]]:
+        """
+        Physical check matrix of one Pauli type, level by level.
+
+        Returns:
+            Tuple of (stacked checks, number of check rows per level)
+        """
+        embedding = CSRMatrix.block_diagonal(np.eye(self.levels[0].n, dtype=np.uint8), self.blocks[0])
+        parts, rows = [], []
+        for level, blocks in zip(self.levels, self.blocks):
+            # embedding maps this level's bits to their physical supports
+            lifted = CSRMatrix.block_diagonal(getattr(level, checks), blocks).matmul(embedding)
+            parts.append(lifted)
+            rows.append(lifted.shape[0])
+            embedding = CSRMatrix.block_diagonal(getattr(level, logicals), blocks).matmul(embedding)
+        return CSRMatrix.vstack(parts), rows
+
+    @property
+    def n_physical(self) -> int:
+        return self.blocks[0] * self.levels[0].n
+
+    @property
+    def k_logical(self) -> int:
+        return self.blocks[-1] * self.levels[-1].k
+
+    @property
+    def distance(self) -> int:
+        # Product of the level distances: a lower bound, tight for the usual constructions
+        product = 1
+        for level in self.levels:
+            product *= level.params['distance_lower'] or 1
+        return product
+
+    def get_sparse_stabilizer_matrix(self) -> CSRMatrix:
+        if self.is_css:
+            return CSRMatrix.vstack([self.sparse_Hx, self.sparse_Hz])
+        return self.sparse_Hz
+
+    def get_stabilizer_matrix(self) -> np.ndarray:
+        return self.get_sparse_stabilizer_matrix().to_dense()
+
+    def get_css_matrices(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if not self.is_css:
+            return None
+        return self.sparse_Hx.to_dense(), self.sparse_Hz.to_dense()
+
+    def get_topology(self) -> str:
+        return "Concatenated (" + " in ".join(str(level.n) for level in self.levels) + " bit blocks)"
+
+    def syndromes(self, errors: np.ndarray) -> np.ndarray:
+        """
+        Syndromes of bit-flip (X) errors under the lifted Z-type checks.
+
+        :param errors: Binary array of shape (n,) or (shots, n).
+        :return: uint8 syndromes with the level-1 rows first.
+        """
+        return self.sparse_Hz.multiply(errors)
+
+
+class HierarchicalDecoder(Decoder):
+    """
+    Soft-decision, level-by-level decoder for ConcatenatedCode bit-flip errors.
+
+    decode_batch takes syndromes from ConcatenatedCode.syndromes (shots, m)
+    and returns corrections (shots, n) that reproduce them exactly.
+    """
+    name = "hierarchical"
+
+    # Cap on shots * blocks * 2^n floats materialized per chunk
+    CHUNK_ELEMENTS = 1 << 22
+
+    def __init__(self, code: ConcatenatedCode, p: float = 0.01):
+        """
+        Args:
+            code: The concatenated code
+            p: Independent bit-flip probability of every physical qubit
+        """
+        super().__init__(code.n_physical, code.sparse_Hz.shape[0])
+        self.code = code
+        self.p = p
+        self._eps = 1e-12
+        self._tabulate_physical_level()
+
+    def _tabulate_physical_level(self):
+        """
+        Physical bits all share the prior p, so every level-1 quantity depends
+        only on the block's coset: the soft output and, for every requested
+        logical class, the most likely pattern are looked up, not computed.
+        """
+        level = self.code.levels[0]
+        q = min(max(self.p, self._eps), 1 - self._eps)
+        log_weights = (np.log(q) - np.log1p(-q)) * level.patterns.sum(axis=1)[level.cosets]
+        weights = np.exp(log_weights - log_weights.max(axis=1, keepdims=True))
+        self._level1_marginals = np.einsum('cj,cjk->ck', weights, level.relative_bits) \
+            / weights.sum(axis=1)[:, None]
+        # Sort every coset by (class, decreasing weight); each class fills an equal run
+        order = np.lexsort((-log_weights, level.relative_class), axis=-1)
+        per_class = level.cosets.shape[1] >> level.k
+        self._level1_best = np.take_along_axis(level.cosets, order, axis=1)[:, ::per_class]
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes)) & 1
+        # Largest per-shot intermediate: pattern weights above level 1, tabulated lookups at it
+        levels, blocks = self.code.levels, self.code.blocks
+        worst = max([blocks[0] * levels[0].n] + [b << level.n for level, b in zip(levels[1:], blocks[1:])])
+        chunk = max(1, self.CHUNK_ELEMENTS // worst)
+        corrections = np.empty((len(syndromes), self.n), dtype=np.uint8)
+        for start in range(0, len(syndromes), chunk):
+            stop = start + chunk
+            corrections[start:stop] = self._decode_chunk(syndromes[start:stop])
+        return corrections
+
+    def soft_output(self, syndromes: np.ndarray) -> np.ndarray:
+        """
+        Probability that each top-level logical bit is flipped relative to the
+        canonical correction (shots, k_logical).
+        """
+        syndromes = np.atleast_2d(np.asarray(syndromes)) & 1
+        return self._upward(syndromes)[-1]['marginals'].reshape(len(syndromes), -1)
+
+    def _upward(self, syndromes: np.ndarray) -> List[Dict]:
+        """Soft pass from the physical level to the top; returns per-level state."""
+        shots = len(syndromes)
+        code = self.code
+        priors = np.full((shots, code.blocks[0], code.levels[0].n), self.p)
+        offsets = np.cumsum([0] + code.level_rows)
+        # offset: how far this level's relative bits are from the true logical bits
+        # of the level below (their canonical corrections, lifted level by level)
+        offset = np.zeros((shots, code.blocks[0], code.levels[0].n), dtype=np.int64)
+        states = []
+        for i, (level, blocks) in enumerate(zip(code.levels, code.blocks)):
+            m = level.Hz.shape[0]
+            measured = syndromes[:, offsets[i]:offsets[i + 1]].reshape(shots, blocks, m)
+            # Syndrome of the relative bits
+            measured = measured ^ ((offset @ level.Hz.T) % 2).astype(measured.dtype)
+            coset = level.coset_of[pack_bits(measured).astype(np.int64)]
+
+            if i == 0:
+                log_weights, marginals = None, self._level1_marginals[coset]
+            else:
+                q = np.clip(priors, self._eps, 1 - self._eps)
+                llr = np.log(q) - np.log1p(-q)
+                # Log-weight of every pattern (up to a per-block constant), then of the coset members
+                log_weights = np.take_along_axis(llr @ level.patterns.T.astype(np.float64),
+                                                 level.cosets[coset], axis=2)
+                weights = np.exp(log_weights - log_weights.max(axis=2, keepdims=True))
+                marginals = np.einsum('sbc,sbck->sbk', weights, level.relative_bits[coset]) \
+                    / weights.sum(axis=2)[..., None]
+            states.append({'coset': coset, 'log_weights': log_weights, 'marginals': marginals})
+
+            if i + 1 < len(code.levels):
+                upper = code.levels[i + 1]
+                offset = (((offset @ level.Lz.T) % 2) ^ level.canonical_bits[coset]).reshape(
+                    shots, code.blocks[i + 1], upper.n)
+                priors = marginals.reshape(shots, code.blocks[i + 1], upper.n)
+        return states
+
+    def _decode_chunk(self, syndromes: np.ndarray) -> np.ndarray:
+        shots = len(syndromes)
+        states = self._upward(syndromes)
+        code = self.code
+        # Most likely class per top block (bitwise), then pushed down level by level
+        wanted = pack_bits((states[-1]['marginals'] > 0.5).astype(np.uint8)).astype(np.int64)
+        for i in range(len(code.levels) - 1, -1, -1):
+            level, state = code.levels[i], states[i]
+            if i == 0:
+                members = self._level1_best[state['coset'], wanted]
+            else:
+                in_class = level.relative_class[state['coset']] == wanted[..., None]
+                choice = np.where(in_class, state['log_weights'], -np.inf).argmax(axis=2)
+                members = np.take_along_axis(level.cosets[state['coset']], choice[..., None], axis=2)[..., 0]
+            bits = level.patterns[members].reshape(shots, -1)
+            if i > 0:
+                below = code.levels[i - 1]
+                wanted = pack_bits(bits.reshape(shots, -1, below.k)).astype(np.int64)
+        return bits
@@ -0,0 +1,289 @@
+"""
+Quantum LDPC code constructions: hypergraph products and bivariate bicycles.
+
+Both families are CSS codes whose check matrices are built directly in sparse
+(CSR) form from index arithmetic on the block structure. No dense Kronecker
+product or circulant block is ever formed, so codes with 10^4-10^5 qubits are
+constructed in a fraction of a second. Dense matrices are only materialized
+when a caller asks for them through the CodeDefinition interface.
+
+Hypergraph product of classical codes H1 (m1 x n1) and H2 (m2 x n2):
+    Hx = [ H1 (x) I_n2 | I_m1 (x) H2^T ]
+    Hz = [ I_n1 (x) H2 | H1^T (x) I_m2 ]
+with n = n1*n2 + m1*m2 qubits.
+
+Bivariate bicycle codes (Bravyi et al., "High-threshold and low-overhead
+fault-tolerant quantum memory") use commuting polynomials A, B in the cyclic
+shifts x = S_l (x) I_m and y = I_l (x) S_m:
+    Hx = [ A | B ],  Hz = [ B^T | A^T ]
+with n = 2*l*m qubits. With m = 1 they are the quasi-cyclic generalized
+bicycle codes.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from ..core.code_abstractions import CodeDefinition
+from ..core.code_parameters import cached_rank, code_parameters
+from ..utils.artifact_cache import ArtifactCache, default_cache
+from ..utils.gf2 import matrix_key
+from ..utils.sparse import CSRMatrix
+
+ClassicalCode = Union[np.ndarray, CSRMatrix, object]
+
+# Monomial x^a y^b is written as the exponent pair (a, b)
+Monomial = Tuple[int, int]
+
+
+def repetition_checks(length: int, cyclic: bool = False) -> np.ndarray:
+    """
+    Parity checks of the repetition code: check i compares bits i and i+1.
+
+    Args:
+        length: Number of bits
+        cyclic: Add the check between the last and first bit
+
+    Returns:
+        Binary matrix of shape (length - 1, length), or (length, length) if cyclic
+    """
+    rows = length if cyclic else length - 1
+    H = np.zeros((rows, length), dtype=np.uint8)
+    H[np.arange(rows), np.arange(rows)] = 1
+    H[np.arange(rows), (np.arange(rows) + 1) % length] = 1
+    return H
+
+
+def classical_checks(code: ClassicalCode) -> CSRMatrix:
+    """
+    Sparse check matrix of a classical code given as a matrix, a CSRMatrix,
+    a code object with an 'H' attribute (SteaneCode, ReedMullerCode, ...) or a
+    CodeDefinition.
+    """
+    if isinstance(code, CSRMatrix):
+        return code
+    if isinstance(code, CodeDefinition):
+        return CSRMatrix.from_dense(code.get_stabilizer_matrix())
+    if hasattr(code, 'H'):
+        return CSRMatrix.from_dense(np.asarray(code.H))
+    return CSRMatrix.from_dense(np.asarray(code))
+
+
+class SparseCSSCode(CodeDefinition):
+    """
+    CSS qubit code defined by sparse Hx and Hz check matrices.
+
+    Subclasses fill self.sparse_Hx and self.sparse_Hz. get_css_matrices() and
+    get_stabilizer_matrix() densify them, which is only sensible for small
+    codes; large codes should use syndromes() and get_sparse_css_matrices().
+    """
+    def __init__(self, Hx: CSRMatrix, Hz: CSRMatrix, L: int = 0):
+        """
+        :param Hx: Sparse X-type check matrix.
+        :param Hz: Sparse Z-type check matrix with the same number of columns.
+        :param L: Size parameter of the family (for display only).
+        """
+        super().__init__(d=2, L=L)
+        self.sparse_Hx = Hx
+        self.sparse_Hz = Hz
+
+    @property
+    def n_physical(self) -> int:
+        return self.sparse_Hx.shape[1]
+
+    @property
+    def k_logical(self) -> int:
+        Hx, Hz = self.get_css_matrices()
+        return self.n_physical - cached_rank(Hx) - cached_rank(Hz)
+
+    @property
+    def distance(self) -> int:
+        # Exact for small codes, otherwise the lightest logical found (an upper bound)
+        params = self.computed_parameters()
+        return params['distance'] if params['distance'] is not None else params['distance_upper']
+
+    def get_sparse_css_matrices(self) -> Tuple[CSRMatrix, CSRMatrix]:
+        return self.sparse_Hx, self.sparse_Hz
+
+    def get_sparse_stabilizer_matrix(self) -> CSRMatrix:
+        return CSRMatrix.vstack([self.sparse_Hx, self.sparse_Hz])
+
+    def get_css_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.sparse_Hx.to_dense(), self.sparse_Hz.to_dense()
+
+    def get_stabilizer_matrix(self) -> np.ndarray:
+        # X-type checks stacked on top of Z-type checks, as in ToricCode
+        return self.get_sparse_stabilizer_matrix().to_dense()
+
+    def syndromes(self, errors: np.ndarray, error_type: str = 'X') -> np.ndarray:
+        """
+        Syndromes of X (detected by Hz) or Z (detected by Hx) errors.
+
+        :param errors: Binary array of shape (n,) or (shots, n).
+        :param error_type: 'X' or 'Z'.
+        :return: uint8 syndromes of shape (m,) or (shots, m).
+        """
+        checks = self.sparse_Hz if error_type == 'X' else self.sparse_Hx
+        return checks.multiply(errors)
+
+    def check_weights(self) -> Dict[str, int]:
+        """Largest row and column weights of Hx and Hz (the LDPC parameters)."""
+        return {
+            'max_row_weight': int(max(self.sparse_Hx.row_weights().max(initial=0),
+                                      self.sparse_Hz.row_weights().max(initial=0))),
+            'max_column_weight': int(max(self.sparse_Hx.column_weights().max(initial=0),
+                                         self.sparse_Hz.column_weights().max(initial=0))),
+        }
+
+
+class HypergraphProductCode(SparseCSSCode):
+    """
+    Tillich-Zemor hypergraph product of two classical codes.
+
+    The product of two repetition codes is the planar surface code (or the
+    toric code for cyclic repetition codes); Hamming, Steane and Reed-Muller
+    checks give denser-encoding LDPC codes.
+    """
+    CACHE_VERSION = 1
+
+    def __init__(self, code_a: ClassicalCode, code_b: Optional[ClassicalCode] = None,
+                 cache: Optional[ArtifactCache] = None):
+        """
+        :param code_a: First classical code (check matrix, CSRMatrix or code object).
+        :param code_b: Second classical code (default: code_a).
+        :param cache: Artifact cache for the sparse checks (default: process-wide cache).
+        """
+        self.H1 = classical_checks(code_a)
+        self.H2 = self.H1 if code_b is None else classical_checks(code_b)
+        cache = default_cache() if cache is None else cache
+        artifacts = cache.get_or_build(
+            'HypergraphProductCode',
+            {'H1': matrix_key(self.H1.indptr, self.H1.indices, np.array(self.H1.shape)),
+             'H2': matrix_key(self.H2.indptr, self.H2.indices, np.array(self.H2.shape))},
+            self._build_sparse_checks, version=self.CACHE_VERSION)
+        super().__init__(CSRMatrix.from_artifacts(artifacts, 'Hx'),
+                         CSRMatrix.from_artifacts(artifacts, 'Hz'),
+                         L=max(self.H1.shape[1], self.H2.shape[1]))
+
+    def _build_sparse_checks(self) -> Dict[str, np.ndarray]:
+        (m1, n1), (m2, n2) = self.H1.shape, self.H2.shape
+        r1, c1 = self.H1.coo()
+        r2, c2 = self.H2.coo()
+        left = n1 * n2
+
+        # Every block entry is an outer sum of the classical nonzeros with an identity index
+        t_n2, t_m2 = np.arange(n2), np.arange(m2)
+        s_m1, s_n1 = np.arange(m1), np.arange(n1)
+        x_rows = np.concatenate([(r1[:, None] * n2 + t_n2).ravel(),          # H1 (x) I_n2
+                                 (s_m1[:, None] * n2 + c2).ravel()])          # I_m1 (x) H2^T
+        x_cols = np.concatenate([(c1[:, None] * n2 + t_n2).ravel(),
+                                 (left + s_m1[:, None] * m2 + r2).ravel()])
+        z_rows = np.concatenate([(s_n1[:, None] * m2 + r2).ravel(),          # I_n1 (x) H2
+                                 (c1[:, None] * m2 + t_m2).ravel()])          # H1^T (x) I_m2
+        z_cols = np.concatenate([(s_n1[:, None] * n2 + c2).ravel(),
+                                 (left + r1[:, None] * m2 + t_m2).ravel()])
+
+        n = left + m1 * m2
+        artifacts = CSRMatrix.from_coo(x_rows, x_cols, (m1 * n2, n)).to_artifacts('Hx')
+        artifacts.update(CSRMatrix.from_coo(z_rows, z_cols, (n1 * m2, n)).to_artifacts('Hz'))
+        return artifacts
+
+    def _classical_parameters(self) -> List[Dict]:
+        """Parameters of H1, H2 and their transposes (the four classical codes)."""
+        return [code_parameters(H=H.to_dense()) for H in (self.H1, self.H2, self.H1.T, self.H2.T)]
+
+    @property
+    def k_logical(self) -> int:
+        # k = k1*k2 + k1^T*k2^T, from the (small) classical ranks only
+        k1, k2, k1t, k2t = (p['k'] for p in self._classical_parameters())
+        return k1 * k2 + k1t * k2t
+
+    @property
+    def distance(self) -> int:
+        # d = min(d1, d2, d1^T, d2^T) over the classical codes with k > 0.
+        # A classical distance that is not known exactly contributes its upper bound.
+        distances = [p['distance'] if p['distance'] is not None else p['distance_upper']
+                     for p in self._classical_parameters() if p['k'] > 0]
+        return min(distances) if distances else 0
+
+    def get_topology(self) -> str:
+        return "Hypergraph Product (Qubit LDPC)"
+
+
+class BivariateBicycleCode(SparseCSSCode):
+    """
+    Bivariate bicycle code defined by two polynomials in the commuting shifts x and y.
+
+    Example, the [[144, 12, 12]] gross code:
+        BivariateBicycleCode(12, 6, a=[(3, 0), (0, 1), (0, 2)], b=[(0, 3), (1, 0), (2, 0)])
+    """
+    CACHE_VERSION = 1
+
+    # Known instances: name -> (l, m, A terms, B terms, distance)
+    PRESETS = {
+        'gross': (12, 6, [(3, 0), (0, 1), (0, 2)], [(0, 3), (1, 0), (2, 0)], 12),
+        '72_12_6': (6, 6, [(3, 0), (0, 1), (0, 2)], [(0, 3), (1, 0), (2, 0)], 6),
+        '90_8_10': (15, 3, [(9, 0), (0, 1), (0, 2)], [(0, 0), (2, 0), (7, 0)], 10),
+        '108_8_10': (9, 6, [(3, 0), (0, 1), (0, 2)], [(0, 3), (1, 0), (2, 0)], 10),
+    }
+
+    def __init__(self, l: int, m: int, a: Sequence[Monomial], b: Sequence[Monomial],
+                 distance: Optional[int] = None, cache: Optional[ArtifactCache] = None):
+        """
+        :param l: Order of the cyclic shift x.
+        :param m: Order of the cyclic shift y (m=1 gives a generalized bicycle code).
+        :param a: Monomials (i, j) = x^i y^j summed into A.
+        :param b: Monomials summed into B.
+        :param distance: Known distance, if any (otherwise computed on demand).
+        :param cache: Artifact cache for the sparse checks (default: process-wide cache).
+        """
+        self.l, self.m = l, m
+        self.a = [(i % l, j % m) for i, j in a]
+        self.b = [(i % l, j % m) for i, j in b]
+        if len(set(self.a)) != len(self.a) or len(set(self.b)) != len(self.b):
+            raise ValueError("Repeated monomials would cancel mod 2; list each term once.")
+        self._distance = distance
+        cache = default_cache() if cache is None else cache
+        artifacts = cache.get_or_build('BivariateBicycleCode',
+                                       {'l': l, 'm': m, 'a': sorted(self.a), 'b': sorted(self.b)},
+                                       self._build_sparse_checks, version=self.CACHE_VERSION)
+        super().__init__(CSRMatrix.from_artifacts(artifacts, 'Hx'),
+                         CSRMatrix.from_artifacts(artifacts, 'Hz'), L=l)
+
+    @classmethod
+    def from_preset(cls, name: str, cache: Optional[ArtifactCache] = None) -> 'BivariateBicycleCode':
+        l, m, a, b, distance = cls.PRESETS[name]
+        return cls(l, m, a, b, distance=distance, cache=cache)
+
+    def _shift(self, monomials: List[Monomial]) -> Tuple[np.ndarray, np.ndarray]:
+        """COO entries of sum_k x^a_k y^b_k: row (i, j) has a one at ((i+a) mod l, (j+b) mod m)."""
+        i, j = np.divmod(np.arange(self.l * self.m), self.m)
+        rows = np.tile(np.arange(self.l * self.m), len(monomials))
+        cols = np.concatenate([((i + a) % self.l) * self.m + (j + b) % self.m for a, b in monomials])
+        return rows, cols
+
+    def _build_sparse_checks(self) -> Dict[str, np.ndarray]:
+        size = self.l * self.m
+        a_rows, a_cols = self._shift(self.a)
+        b_rows, b_cols = self._shift(self.b)
+        Hx = CSRMatrix.from_coo(np.concatenate([a_rows, b_rows]),
+                                np.concatenate([a_cols, b_cols + size]), (size, 2 * size))
+        # Transposes swap the roles of rows and columns
+        Hz = CSRMatrix.from_coo(np.concatenate([b_cols, a_cols]),
+                                np.concatenate([b_rows, a_rows + size]), (size, 2 * size))
+        artifacts = Hx.to_artifacts('Hx')
+        artifacts.update(Hz.to_artifacts('Hz'))
+        return artifacts
+
+    @property
+    def k_logical(self) -> int:
+        # rank(Hx) == rank(Hz) for bivariate bicycle codes, so one elimination suffices
+        return self.n_physical - 2 * cached_rank(self.sparse_Hx.to_dense())
+
+    @property
+    def distance(self) -> int:
+        if self._distance is not None:
+            return self._distance
+        return super().distance
+
+    def get_topology(self) -> str:
+        return f"Bivariate Bicycle on a {self.l} x {self.m} Torus (Qubit LDPC)"
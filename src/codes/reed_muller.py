@@ -1,26 +1,43 @@
 """
-Reed-Muller RM(1,3) Code (Quantum [[15,1,3]] code based on RM code)
+Reed-Muller Codes (Quantum [[15,1,3]] code based on RM codes)
 
-The Reed-Muller RM(1,3) code has a beautiful tetrahedral geometry.
+The quantum Reed-Muller code has a beautiful tetrahedral geometry.
 - 15 physical qubits
 - 1 logical qubit
 - Distance 3
 
-Geometry: The Reed-Muller RM(1,3) code can be visualized using tetrahedral geometry.
-The 15 codewords of minimum weight correspond to:
-- 4 vertices of a 4-dimensional simplex (tetrahedron in 4D)
+Geometry: The 15 qubits are the nonempty subsets of the 4 vertices of a
+tetrahedron:
+- 4 vertices
 - 6 edges connecting the vertices
 - 4 faces (triangular faces)
 - 1 interior (the whole tetrahedron)
 
-For the quantum version, we construct a CSS code from the classical RM(1,3) code.
+Qubit q lies in the X-type check of vertex v when v belongs to q's subset
+(4 checks of weight 8, the punctured RM(1,4) code), and in the Z-type check
+of edge {u, v} when both do (6 more checks of weight 4, together with the
+X-type ones the punctured RM(2,4) code). As a classical code, H is the
+[15, 11, 3] Hamming code: every qubit has a distinct syndrome, namely its
+own set of vertices.
+
+The smaller 8-qubit version uses RM(1,3) on the corners of a cube, which is
+self-dual. Its quantum code is the [[8,3,2]] cube code (one all-ones X check,
+and RM(1,3) as Z checks).
 """
 
 import numpy as np
 from typing import List, Tuple, Dict, Optional
 import random
+from functools import cached_property
 from itertools import combinations
 
+from ..core.code_parameters import code_parameters
+from ..core.weight_enumerators import failure_counts, kernel_enumerator, logical_error_curve
+from ..core.rounds import RoundBatch, answered_batch, guesses_to_masks, locations_to_errors, sample_fixed_weight
+from ..utils.gf2 import nullspace
+from ..utils.instrumentation import timed
+from ..utils.rendering import build_marker_template, fill_marker_template
+
 
 class ReedMullerCode:
     """
@@ -29,8 +46,11 @@ class ReedMullerCode:
     Classical parameters: [15, 11, 3] - encodes 11 bits into 15, distance 3
     Quantum version: [[15, 1, 3]] - uses puncturing and CSS construction
 
-    For simplicity, we work with the first-order Reed-Muller code RM(1,3)
-    which has length 2^3 = 8, but we extend it to demonstrate the geometry.
+    With use_extended=False the first-order Reed-Muller code RM(1,3) of
+    length 2^3 = 8 is used instead: classical [8, 4, 4], quantum [[8, 3, 2]].
+
+    H is the classical parity check matrix played in the game; Hx and Hz are
+    the X- and Z-type checks of the quantum code.
     """
 
     def __init__(self, use_extended: bool = True):
@@ -45,12 +65,8 @@ class ReedMullerCode:
 
         if use_extended:
             self.n = 15  # Extended version
-            self.k = 1   # Quantum version encodes 1 logical qubit
-            self.d = 3   # Code distance
         else:
             self.n = 8   # Standard RM(1,3): length 2^m where m=3
-            self.k = 1
-            self.d = 3
 
         # For RM(1,3), the generator matrix includes:
         # - All-ones row (constant function)
@@ -64,27 +80,62 @@ class ReedMullerCode:
         # Parity check matrix (derived from dual code)
         self.H = self._build_parity_check_matrix()
 
+        # X- and Z-type checks of the quantum code
+        self.Hx, self.Hz = self._build_css_matrices()
+
+        # The tetrahedral geometry (vertices, edges, faces, qubit_to_geometry)
+        # is presentation data; it is built on first access, so headless use
+        # (sweeps, workers, CLI tools that only need G and H) never pays for it.
+        self._visual_template = None
+
+    @cached_property
+    def vertices(self) -> List[Tuple[float, float, float]]:
         # Tetrahedral structure: 4 vertices in 4D space projected to 3D
         # For visualization, we use 4 points forming a regular tetrahedron
-        self.vertices = self._define_tetrahedral_vertices()
-        self.edges = list(combinations(range(4), 2))  # 6 edges
-        self.faces = list(combinations(range(4), 3))  # 4 triangular faces
+        return self._define_tetrahedral_vertices()
+
+    @cached_property
+    def edges(self) -> List[Tuple[int, int]]:
+        return list(combinations(range(4), 2))  # 6 edges
+
+    @cached_property
+    def faces(self) -> List[Tuple[int, int, int]]:
+        return list(combinations(range(4), 3))  # 4 triangular faces
+
+    @cached_property
+    def qubit_to_geometry(self) -> Dict[int, Dict]:
+        """Map from qubit index to its geometric element."""
+        return self._create_geometry_mapping()
+
+    @property
+    def k(self) -> int:
+        """Number of logical qubits, computed from Hx and Hz (1, or 3 for the 8-qubit code)."""
+        return self.parameters()['k']
+
+    @property
+    def d(self) -> Optional[int]:
+        """Code distance, computed from Hx and Hz by logical operator enumeration."""
+        return self.parameters()['distance']
+
+    def parameters(self) -> Dict:
+        """
+        Compute the quantum code parameters from the CSS check matrices.
 
-        # Map qubits to geometric elements
-        self.qubit_to_geometry = self._create_geometry_mapping()
+        Returns:
+            Dictionary from code_parameters (memoized per matrix hash)
+        """
+        return code_parameters(Hx=self.Hx, Hz=self.Hz)
+
+    @staticmethod
+    def _tetrahedral_subsets() -> List[Tuple[int, ...]]:
+        """Vertex subset of each qubit, in qubit order: vertices, edges, faces, interior."""
+        return [subset for size in range(1, 5) for subset in combinations(range(4), size)]
 
     def _build_generator_matrix(self) -> np.ndarray:
-        """Build the generator matrix for RM(1,3)."""
+        """Build the generator matrix for RM(1,3) (or the [15, 11, 3] code)."""
         if self.use_extended:
-            # Simplified: use Reed-Muller construction
-            # For demonstration, we create a representative matrix
-            # Full implementation would use proper RM(1,3) construction
-            G = np.array([
-                [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],  # all-ones
-                [0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0],  # x1
-                [0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1, 1, 0, 0, 1],  # x2
-                [0, 0, 0, 0, 1, 1, 1, 1, 0, 0, 0, 0, 1, 1, 1],  # x3
-            ], dtype=int)
+            # The classical [15, 11, 3] code is the kernel of the tetrahedral H
+            G = nullspace(self._tetrahedral_checks()).astype(int)
         else:
             # Standard RM(1,3): 2^3 = 8 bits
             G = np.array([
@@ -100,25 +151,34 @@ class ReedMullerCode:
         Build parity check matrix from the dual of RM(1,3).
 
         The dual of RM(r, m) is RM(m-r-1, m).
-        For RM(1,3), dual is RM(1,3) itself (self-dual property).
+        For RM(1,3), dual is RM(1,3) itself (self-dual property), so H = G.
+        The extended H is the punctured RM(1,4) code: one check per vertex
+        of the tetrahedron.
         """
         if self.use_extended:
-            # Simplified parity check matrix
-            # In practice, this would be carefully constructed from RM theory
-            n_checks = 4
-            H = np.random.randint(0, 2, size=(n_checks, self.n))
-        else:
-            # For RM(1,3), we have 4 information bits, so 4 parity checks
-            # H is derived to be orthogonal to G
-            n_checks = 4
-            H = np.array([
-                [1, 1, 1, 1, 0, 0, 0, 0],
-                [1, 1, 0, 0, 1, 1, 0, 0],
-                [1, 0, 1, 0, 1, 0, 1, 0],
-                [0, 1, 1, 0, 0, 1, 1, 0],
-            ], dtype=int)
+            return self._tetrahedral_checks()
+        # For RM(1,3), we have 4 information bits, so 4 parity checks
+        return self.G.copy()
+
+    def _tetrahedral_checks(self) -> np.ndarray:
+        """(4, 15) matrix: row v marks the qubits whose subset contains vertex v."""
+        H = np.zeros((4, 15), dtype=int)
+        for qubit, subset in enumerate(self._tetrahedral_subsets()):
+            H[list(subset), qubit] = 1
         return H
 
+    def _build_css_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        X- and Z-type checks of the quantum code.
+
+        [[15,1,3]]: Hx = H (vertex checks), Hz = H plus one check per edge
+        (products of two vertex checks). [[8,3,2]]: Hx = all-ones, Hz = H.
+        """
+        if not self.use_extended:
+            return np.ones((1, self.n), dtype=int), self.H.copy()
+        pairs = [self.H[u] & self.H[v] for u, v in combinations(range(4), 2)]
+        return self.H.copy(), np.vstack([self.H] + pairs)
+
     def _define_tetrahedral_vertices(self) -> List[Tuple[float, float, float]]:
         """
         Define 4 vertices of a regular tetrahedron in 3D space.
@@ -184,6 +244,7 @@ class ReedMullerCode:
 
         return mapping
 
+    @timed('syndrome')
     def compute_syndrome(self, error: np.ndarray) -> np.ndarray:
         """
         Compute syndrome for a given error pattern.
@@ -197,6 +258,7 @@ class ReedMullerCode:
         syndrome = (self.H @ error[:len(self.H[0])]) % 2
         return syndrome
 
+    @timed('sample')
     def apply_random_error(self, num_errors: int = 1) -> Tuple[np.ndarray, List[int]]:
         """
         Generate a random error pattern.
@@ -231,14 +293,26 @@ class ReedMullerCode:
         Returns:
             String representation with geometric context
         """
-        visual = []
-        for i in range(min(self.n, 15)):
-            geo_desc = self.get_geometric_description(i)
-            if i in error_locations:
-                visual.append(f"Q{i:2d}[X] ({geo_desc})")
-            else:
-                visual.append(f"Q{i:2d}[ ] ({geo_desc})")
-        return "\n".join(visual)
+        mask = np.zeros((1, self.n), dtype=bool)
+        mask[0, list(error_locations)] = True
+        return self.visualize_errors(mask)[0]
+
+    def visualize_errors(self, error_masks: np.ndarray) -> List[str]:
+        """
+        Render many error patterns at once from a precomputed template.
+
+        Args:
+            error_masks: Boolean array of shape (shots, n)
+
+        Returns:
+            List of string representations, one per row
+        """
+        if self._visual_template is None:
+            qubits = range(min(self.n, 15))
+            self._visual_template = build_marker_template(
+                [f"Q{i:2d}[" for i in qubits],
+                [f"] ({self.get_geometric_description(i)})" for i in qubits], "\n")
+        return fill_marker_template(*self._visual_template, error_masks)
 
     def describe_geometry(self) -> str:
         """Return a description of the tetrahedral geometry."""
@@ -265,6 +339,18 @@ class ReedMullerCode:
             desc += f"8 Qubits (2^3 structure):\n"
             desc += "Each qubit corresponds to a vertex of a 3D cube\n"
 
+        params = self.parameters()
+        desc += f"\nCODE PARAMETERS: [[{params['n']},{params['k']},{params['distance']}]]\n"
+
+        # Exact numbers for this H, from the weight enumerator (no sampling)
+        counts = kernel_enumerator(self.H)
+        desc += "\nWEIGHT DISTRIBUTION (bit patterns with zero syndrome):\n"
+        desc += "  " + ", ".join(f"A_{w} = {a}" for w, a in enumerate(counts) if a) + "\n"
+        failures = failure_counts(self.H)
+        desc += "\nEXACT LOOKUP-DECODER FAILURE RATE:\n"
+        for p in (1e-2, 1e-3, 1e-4):
+            desc += f"  p = {p:.0e}: P_fail = {logical_error_curve(failures, p):.3e}\n"
+
         return desc
 
     def get_tetrahedral_structure(self) -> Dict:
@@ -287,7 +373,9 @@ class ReedMullerGame:
         self.code = ReedMullerCode(use_extended=use_extended)
         self.score = 0
         self.rounds_played = 0
+        self.last_batch: Optional[RoundBatch] = None
 
+    @timed('round')
     def play_round(self, num_errors: int = 1) -> Dict:
         """
         Play one round of the syndrome decoding game.
@@ -321,6 +409,31 @@ class ReedMullerGame:
         self.rounds_played += 1
         return round_info
 
+    @timed('round')
+    def play_rounds(self, count: int, num_errors: int = 1,
+                    seed: Optional[int] = None) -> RoundBatch:
+        """
+        Play many rounds at once with vectorized sampling.
+
+        Args:
+            count: Number of rounds
+            num_errors: Number of errors per round
+            seed: Optional seed for the batch's random generator
+
+        Returns:
+            RoundBatch with errors, syndromes, locations and syndrome_decimal
+        """
+        rng = np.random.default_rng(seed)
+        locations = sample_fixed_weight(rng, count, self.code.n, num_errors)
+        errors = locations_to_errors(locations, self.code.n)
+        H = self.code.H.astype(np.uint8)
+        syndromes = (errors[:, :H.shape[1]] @ H.T) % 2
+        batch = RoundBatch(errors, syndromes, locations)
+        self.rounds_played += count
+        self.last_batch = batch
+        return batch
+
+    @timed('verify')
     def check_answer(self, guesses: List[int], true_locations: List[int]) -> bool:
         """
         Check if the player's guesses are correct.
@@ -337,6 +450,29 @@ class ReedMullerGame:
             self.score += 1
         return correct
 
+    @timed('verify')
+    def check_answers(self, guesses, batch: Optional[RoundBatch] = None) -> np.ndarray:
+        """
+        Score a whole batch of guesses at once.
+
+        Args:
+            guesses: One guessed location per round, shape (shots,), or several
+                     per round, shape (shots, k) padded with -1
+            batch: Rounds being answered (default: the last play_rounds batch)
+
+        Returns:
+            Boolean array of shape (shots,), True where the guessed set of
+            locations equals the true one
+
+        Raises:
+            ValueError: If no batch is given and play_rounds was never called
+        """
+        batch = answered_batch(batch, self.last_batch)
+        masks = guesses_to_masks(guesses, self.code.n)
+        correct = (masks == batch.errors.astype(bool)).all(axis=1)
+        self.score += int(correct.sum())
+        return correct
+
     def get_stats(self) -> Dict:
         """Get game statistics."""
         return {
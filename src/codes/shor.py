@@ -0,0 +1,230 @@
+"""
+Shor's [[9,1,3]] code and its staged (bit-flip, then phase-flip) decoder.
+
+The nine qubits form three blocks of three. Inside each block, two ZZ checks
+make a 3-qubit repetition code against bit flips (X errors). Two X-type
+checks on six qubits compare the blocks' phases and make the outer
+repetition code against phase flips (Z errors). Diagnosis is therefore
+sequential, as in the roadmap's section 3.1: first find the flipped qubit
+inside each block, then the block whose phase is flipped.
+
+The code is exposed twice:
+
+- ShorCode is a CodeDefinition for the matrix tools (CSS pair, symplectic
+  [X | Z] stabilizer matrix, computed parameters).
+- ShorEngineCode is a QuantumCode whose string stabilizers drive the
+  QECGameEngine.
+
+In both, the six Z-type checks come first and the two X-type checks follow.
+The engine's syndrome string is then directly a ShorDecoder input.
+"""
+
+import time
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from ..core.code_abstractions import CodeDefinition
+from ..core.decoders import Decoder, pack_bits
+from ..core.qec_framework import QuantumCode
+from ..utils.instrumentation import INSTRUMENTS
+
+BLOCK = 3
+N_BLOCKS = 3
+
+# Repetition-code checks of one block: Z1Z2 and Z2Z3 (and the same shape across blocks)
+REPETITION_CHECKS = np.array([[1, 1, 0],
+                              [0, 1, 1]], dtype=np.uint8)
+
+
+def shor_check_matrices() -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns:
+        (Hx, Hz): Hx (2, 9) holds the X-type block-phase checks, Hz (6, 9) the
+        Z-type checks inside each block
+    """
+    Hz = np.kron(np.eye(N_BLOCKS, dtype=np.uint8), REPETITION_CHECKS)
+    Hx = np.kron(REPETITION_CHECKS, np.ones((1, BLOCK), dtype=np.uint8))
+    return Hx, Hz
+
+
+def _single_flip_table(H: np.ndarray) -> np.ndarray:
+    """
+    Lookup table from packed syndrome (bit i -> 2**i) to the single-position
+    correction producing it; the all-zero syndrome maps to no correction.
+    """
+    m, n = H.shape
+    table = np.zeros((1 << m, n), dtype=np.uint8)
+    table[pack_bits(H.T).astype(np.intp), np.arange(n)] = 1
+    return table
+
+
+class ShorCode(CodeDefinition):
+    """
+    Shor's nine-qubit code on qubits (d=2) for the matrix path.
+
+    Attributes:
+        Hx: X-type checks (2, 9), detecting phase flips
+        Hz: Z-type checks (6, 9), detecting bit flips
+    """
+    def __init__(self):
+        super().__init__(d=2, L=BLOCK)
+        self.Hx, self.Hz = shor_check_matrices()
+
+    @property
+    def n_physical(self) -> int:
+        return BLOCK * N_BLOCKS
+
+    @property
+    def k_logical(self) -> int:
+        return 1
+
+    @property
+    def distance(self) -> int:
+        return 3
+
+    def get_stabilizer_matrix(self) -> np.ndarray:
+        # Z-type (bit-flip) checks on top of the X-type (phase-flip) checks:
+        # the order in which the staged diagnosis reads them.
+        return np.vstack([self.Hz, self.Hx])
+
+    def get_css_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.Hx, self.Hz
+
+    def get_symplectic_matrix(self) -> np.ndarray:
+        """
+        Stabilizers as rows [x | z] of shape (8, 18), in get_stabilizer_matrix order.
+        A row with z-part set is a Z-type check; it anticommutes with X errors.
+        """
+        n = self.n_physical
+        zeros_z = np.zeros((self.Hz.shape[0], n), dtype=np.uint8)
+        zeros_x = np.zeros((self.Hx.shape[0], n), dtype=np.uint8)
+        return np.vstack([np.hstack([zeros_z, self.Hz]), np.hstack([self.Hx, zeros_x])])
+
+    def syndromes(self, x_errors: np.ndarray, z_errors: np.ndarray) -> np.ndarray:
+        """
+        Syndromes of a batch of Pauli errors given by their X and Z parts.
+
+        :param x_errors: Binary array of shape (n,) or (shots, n); Y counts in both parts.
+        :param z_errors: Binary array of the same shape.
+        :return: uint8 syndromes, the six bit-flip checks first.
+        """
+        return np.concatenate([(np.asarray(x_errors) @ self.Hz.T) % 2,
+                               (np.asarray(z_errors) @ self.Hx.T) % 2], axis=-1).astype(np.uint8)
+
+    def get_topology(self) -> str:
+        return "Concatenated 3x3 Repetition (Qubit)"
+
+
+class ShorEngineCode(QuantumCode):
+    """Shor's code as string stabilizers for the QECGameEngine."""
+
+    @property
+    def N(self): return BLOCK * N_BLOCKS
+    @property
+    def K(self): return 1
+
+    @property
+    def stabilizer_definitions(self) -> List[Tuple[str, str]]:
+        # The six ZZ checks inside the blocks, then the two six-qubit X checks
+        Hx, Hz = shor_check_matrices()
+        to_string = lambda row, pauli: "".join(pauli if bit else "I" for bit in row)
+        return [(to_string(row, "Z"), "Z") for row in Hz] + [(to_string(row, "X"), "X") for row in Hx]
+
+    def encode(self, logical_state: np.ndarray) -> np.ndarray:
+        """
+        Encode a single-qubit state (alpha, beta) as alpha|0_L> + beta|1_L>, with
+        |0_L>, |1_L> = ((|000> +- |111>) / sqrt(2))^(x3).
+        """
+        alpha, beta = np.asarray(logical_state, dtype=complex)
+        block_plus = np.zeros(2 ** BLOCK, dtype=complex)
+        block_plus[[0, -1]] = 1 / np.sqrt(2)
+        block_minus = block_plus.copy()
+        block_minus[-1] *= -1
+        zero, one = np.ones(1, dtype=complex), np.ones(1, dtype=complex)
+        for _ in range(N_BLOCKS):
+            zero, one = np.kron(zero, block_plus), np.kron(one, block_minus)
+        return alpha * zero + beta * one
+
+
+class ShorDecoder(Decoder):
+    """
+    Two-stage table decoder for Shor's code.
+
+    Stage 1 (bit flip) looks up each block's two ZZ checks in a 4-entry table,
+    for all blocks and shots at once. Stage 2 (phase flip) looks up the two
+    X-type checks and applies Z to the first qubit of the flagged block (any
+    qubit of the block is equivalent up to a ZZ stabilizer).
+
+    decode_batch takes syndromes (shots, 8) in ShorCode.get_stabilizer_matrix
+    order and returns symplectic corrections (shots, 18) laid out [x | z].
+    The wall time of each stage of the latest call is kept in last_timings
+    and, when instrumentation is enabled, recorded as stages
+    'decode.shor.bit_flip' and 'decode.shor.phase_flip'.
+    """
+    name = "shor_staged"
+
+    STAGES = ('bit_flip', 'phase_flip')
+
+    def __init__(self, code: Optional[ShorCode] = None):
+        code = ShorCode() if code is None else code
+        self.code = code
+        self.n_qubits = code.n_physical
+        super().__init__(2 * self.n_qubits, code.Hz.shape[0] + code.Hx.shape[0])
+        self.m_bit_flip = code.Hz.shape[0]
+        self.bit_flip_table = _single_flip_table(REPETITION_CHECKS)
+        # Phase flips are located per block; Z on the block's first qubit corrects them
+        block_table = _single_flip_table(REPETITION_CHECKS)
+        self.phase_flip_table = np.zeros((len(block_table), self.n_qubits), dtype=np.uint8)
+        self.phase_flip_table[:, ::BLOCK] = block_table
+        self.last_timings: Dict[str, float] = {stage: 0.0 for stage in self.STAGES}
+
+    def _record(self, stage: str, start_ns: int) -> int:
+        now = time.perf_counter_ns()
+        self.last_timings[stage] = (now - start_ns) * 1e-9
+        if INSTRUMENTS.enabled:
+            INSTRUMENTS.record(f'decode.shor.{stage}', now - start_ns)
+        return now
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes)) & 1
+        shots = len(syndromes)
+        start = time.perf_counter_ns()
+
+        blocks = syndromes[:, :self.m_bit_flip].reshape(shots, N_BLOCKS, REPETITION_CHECKS.shape[0])
+        x_part = self.bit_flip_table[pack_bits(blocks).astype(np.intp)].reshape(shots, self.n_qubits)
+        start = self._record('bit_flip', start)
+
+        z_part = self.phase_flip_table[pack_bits(syndromes[:, self.m_bit_flip:]).astype(np.intp)]
+        self._record('phase_flip', start)
+        return np.concatenate([x_part, z_part], axis=1)
+
+    def diagnose(self, syndrome) -> List[Dict]:
+        """
+        Stage-by-stage explanation of one syndrome for the game.
+
+        :param syndrome: Binary vector of length 8, or the engine's syndrome string.
+        :return: One dictionary per stage with 'stage', the checks it read,
+                 the qubits it corrects with 'pauli', and its 'seconds'.
+        """
+        if isinstance(syndrome, str):
+            syndrome = [int(c) for c in syndrome]
+        syndrome = np.asarray(syndrome, dtype=np.uint8)
+        correction = self.decode(syndrome)
+        x_part, z_part = correction[:self.n_qubits], correction[self.n_qubits:]
+        return [
+            {'stage': 'bit_flip', 'pauli': 'X', 'checks': syndrome[:self.m_bit_flip].tolist(),
+             'qubits': np.flatnonzero(x_part).tolist(),
+             'blocks': sorted({int(q) // BLOCK for q in np.flatnonzero(x_part)}),
+             'seconds': self.last_timings['bit_flip']},
+            {'stage': 'phase_flip', 'pauli': 'Z', 'checks': syndrome[self.m_bit_flip:].tolist(),
+             'qubits': np.flatnonzero(z_part).tolist(),
+             'blocks': [int(q) // BLOCK for q in np.flatnonzero(z_part)],
+             'seconds': self.last_timings['phase_flip']},
+        ]
+
+    def correction_strings(self, corrections: np.ndarray) -> List[str]:
+        """Render symplectic corrections (shots, 18) as Pauli strings for QECGameEngine."""
+        corrections = np.atleast_2d(corrections)
+        x_part, z_part = corrections[:, :self.n_qubits], corrections[:, self.n_qubits:]
+        symbols = np.array(list('IXZY'))[x_part + 2 * z_part]
+        return ["".join(row) for row in symbols]
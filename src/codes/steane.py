@@ -9,9 +9,14 @@ The 7 physical qubits correspond to the 7 points of the Fano plane.
 """
 
 import numpy as np
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 import random
 
+from ..core.code_parameters import code_parameters
+from ..core.rounds import RoundBatch, answered_batch, guesses_to_masks, locations_to_errors, sample_fixed_weight
+from ..utils.instrumentation import timed
+from ..utils.rendering import build_marker_template, fill_marker_template
+
 
 class SteaneCode:
     """
@@ -23,8 +28,6 @@ class SteaneCode:
 
     def __init__(self):
         self.n = 7  # Number of physical qubits
-        self.k = 1  # Number of logical qubits
-        self.d = 3  # Code distance
 
         # Fano plane structure: 7 points, 7 lines
         # Points labeled 1-7 (binary: 001, 010, 011, 100, 101, 110, 111)
@@ -49,6 +52,10 @@ class SteaneCode:
             [0, 5, 6],  # Line through points 1,6,7 (001, 110, 111)
             [1, 3, 4],  # Line through points 2,4,5 (010, 100, 101)
         ]
+        # Lines as 7-bit masks (bit i = qubit i); a complement is the inverted mask
+        self.fano_line_masks = [sum(1 << q for q in line) for line in self.fano_lines]
+        self.fano_complements = [[q for q in range(self.n) if not (mask >> q) & 1]
+                                 for mask in self.fano_line_masks]
 
         # For Steane code: stabilizers are complements of Fano lines (4-qubit checks)
         # X-type stabilizers (bit-flip detection)
@@ -56,9 +63,36 @@ class SteaneCode:
         # Z-type stabilizers (phase-flip detection) - same structure
         self.stabilizers_Z = self._compute_stabilizers()
 
+        # Stabilizer supports as 0/1 matrices for batched parity measurements
+        self.stabilizer_matrices = {
+            stype: self._support_matrix(stabs)
+            for stype, stabs in self.get_all_stabilizers().items()
+        }
+
         # Pauli operators
         self.pauli_types = ['I', 'X', 'Y', 'Z']
 
+        self._visual_template = None
+
+    @property
+    def k(self) -> int:
+        """Number of logical qubits, computed from H (CSS code with Hx = Hz = H)."""
+        return self.parameters()['k']
+
+    @property
+    def d(self) -> int:
+        """Code distance, computed from H by logical operator enumeration."""
+        return self.parameters()['distance']
+
+    def parameters(self) -> Dict:
+        """
+        Compute the code parameters from the parity check matrix.
+
+        Returns:
+            Dictionary from code_parameters (memoized per matrix hash)
+        """
+        return code_parameters(Hx=self.H, Hz=self.H)
+
     def _compute_stabilizers(self) -> List[List[int]]:
         """
         Compute 6 stabilizer generators from the Hamming parity check matrix.
@@ -76,6 +110,13 @@ class SteaneCode:
             stabilizers.append(stabilizer_qubits)
         return stabilizers
 
+    def _support_matrix(self, stabilizers: List[List[int]]) -> np.ndarray:
+        """Convert stabilizer qubit lists into a (num_stabilizers, 7) 0/1 matrix."""
+        matrix = np.zeros((len(stabilizers), self.n), dtype=np.uint8)
+        for row, qubits in enumerate(stabilizers):
+            matrix[row, qubits] = 1
+        return matrix
+
     def get_all_stabilizers(self) -> Dict[str, List[List[int]]]:
         """Get all stabilizer generators with their types."""
         return {
@@ -83,6 +124,7 @@ class SteaneCode:
             'Z': self.stabilizers_Z
         }
 
+    @timed('syndrome')
     def compute_syndrome(self, error: np.ndarray, error_type: str = 'X') -> np.ndarray:
         """
         Compute the syndrome for a given error pattern.
@@ -98,6 +140,7 @@ class SteaneCode:
         syndrome = (self.H @ error) % 2
         return syndrome
 
+    @timed('decode')
     def syndrome_to_error_location(self, syndrome: np.ndarray) -> Optional[int]:
         """
         Decode syndrome to find error location.
@@ -121,6 +164,7 @@ class SteaneCode:
         # We return 0-indexed
         return syndrome_value - 1
 
+    @timed('sample')
     def apply_random_error(self, error_type: str = 'X',
                           num_errors: int = 1) -> Tuple[np.ndarray, List[int]]:
         """
@@ -141,6 +185,24 @@ class SteaneCode:
 
         return error_vector, error_locations
 
+    def apply_random_erasure(self, num_erasures: int = 1) -> Tuple[np.ndarray, List[int]]:
+        """
+        Generate a random erasure: known locations, each flipped with probability 1/2.
+
+        Args:
+            num_erasures: Number of erased qubits (1-7)
+
+        Returns:
+            Tuple of (error_vector, erased_locations)
+        """
+        error_vector = np.zeros(7, dtype=int)
+        erased_locations = random.sample(range(7), num_erasures)
+
+        for loc in erased_locations:
+            error_vector[loc] = random.randint(0, 1)
+
+        return error_vector, erased_locations
+
     def get_fano_line_complement(self, line_idx: int) -> List[int]:
         """
         Get the complement of a Fano line (forms a 4-qubit stabilizer).
@@ -151,9 +213,7 @@ class SteaneCode:
         Returns:
             List of qubit indices in the complement
         """
-        line = self.fano_lines[line_idx]
-        complement = [i for i in range(7) if i not in line]
-        return complement
+        return list(self.fano_complements[line_idx])
 
     def visualize_error(self, error_locations: List[int]) -> str:
         """
@@ -165,34 +225,47 @@ class SteaneCode:
         Returns:
             String representation
         """
-        visual = []
-        for i in range(7):
-            if i in error_locations:
-                visual.append(f"Q{i}[X]")
-            else:
-                visual.append(f"Q{i}[ ]")
-        return " ".join(visual)
+        mask = np.zeros((1, self.n), dtype=bool)
+        mask[0, list(error_locations)] = True
+        return self.visualize_errors(mask)[0]
+
+    def visualize_errors(self, error_masks: np.ndarray) -> List[str]:
+        """
+        Render many error patterns at once.
+
+        The rendering is a fixed byte template ("Q0[ ] Q1[ ] ...") whose marker
+        slots are filled from the boolean mask in one vectorized assignment.
+
+        Args:
+            error_masks: Boolean array of shape (shots, 7)
+
+        Returns:
+            List of string representations, one per row
+        """
+        if self._visual_template is None:
+            self._visual_template = build_marker_template(
+                [f"Q{i}[" for i in range(self.n)], ["]"] * self.n, " ")
+        return fill_marker_template(*self._visual_template, error_masks)
 
     def get_stabilizer_measurement(self, error: np.ndarray,
-                                   stabilizer_type: str = 'X') -> List[int]:
+                                   stabilizer_type: str = 'X') -> Union[List[int], np.ndarray]:
         """
         Measure all stabilizers and return their outcomes.
 
         Args:
-            error: Error vector
+            error: Error vector of length 7, or a batch of shape (shots, 7)
             stabilizer_type: 'X' or 'Z'
 
         Returns:
             List of stabilizer measurement outcomes (0 or 1 for each stabilizer)
+            for a single error, or an array of shape (shots, 3) for a batch
         """
-        stabilizers = self.stabilizers_X if stabilizer_type == 'X' else self.stabilizers_Z
-        measurements = []
-
-        for stabilizer_qubits in stabilizers:
-            # Measure parity of error on stabilizer qubits
-            parity = sum(error[q] for q in stabilizer_qubits) % 2
-            measurements.append(parity)
-
+        matrix = self.stabilizer_matrices['X' if stabilizer_type == 'X' else 'Z']
+        error = np.asarray(error)
+        # Parity of the error on each stabilizer's support, as one matrix product
+        measurements = (error @ matrix.T) % 2
+        if error.ndim == 1:
+            return measurements.tolist()
         return measurements
 
     def describe_geometry(self) -> str:
@@ -222,7 +295,9 @@ class SteaneGame:
         self.code = SteaneCode()
         self.score = 0
         self.rounds_played = 0
+        self.last_batch: Optional[RoundBatch] = None
 
+    @timed('round')
     def play_round(self, num_errors: int = 1) -> Dict:
         """
         Play one round of the syndrome decoding game.
@@ -257,6 +332,33 @@ class SteaneGame:
         self.rounds_played += 1
         return round_info
 
+    @timed('round')
+    def play_rounds(self, count: int, num_errors: int = 1,
+                    seed: Optional[int] = None) -> RoundBatch:
+        """
+        Play many rounds at once with vectorized sampling.
+
+        Args:
+            count: Number of rounds
+            num_errors: Number of errors per round
+            seed: Optional seed for the batch's random generator
+
+        Returns:
+            RoundBatch with errors, syndromes, locations and syndrome_decimal,
+            plus 'stabilizer_measurements' of shape (count, 3)
+        """
+        rng = np.random.default_rng(seed)
+        locations = sample_fixed_weight(rng, count, self.code.n, num_errors)
+        errors = locations_to_errors(locations, self.code.n)
+        syndromes = (errors @ self.code.H.T.astype(np.uint8)) % 2
+        batch = RoundBatch(errors, syndromes, locations, {
+            'stabilizer_measurements': self.code.get_stabilizer_measurement(errors),
+        })
+        self.rounds_played += count
+        self.last_batch = batch
+        return batch
+
+    @timed('verify')
     def check_answer(self, guess: int, true_location: int) -> bool:
         """
         Check if the player's guess is correct.
@@ -273,6 +375,29 @@ class SteaneGame:
             self.score += 1
         return correct
 
+    @timed('verify')
+    def check_answers(self, guesses, batch: Optional[RoundBatch] = None) -> np.ndarray:
+        """
+        Score a whole batch of guesses at once.
+
+        Args:
+            guesses: One guessed location per round, shape (shots,), or several
+                     per round, shape (shots, k) padded with -1
+            batch: Rounds being answered (default: the last play_rounds batch)
+
+        Returns:
+            Boolean array of shape (shots,), True where the guessed set of
+            locations equals the true one
+
+        Raises:
+            ValueError: If no batch is given and play_rounds was never called
+        """
+        batch = answered_batch(batch, self.last_batch)
+        masks = guesses_to_masks(guesses, self.code.n)
+        correct = (masks == batch.errors.astype(bool)).all(axis=1)
+        self.score += int(correct.sum())
+        return correct
+
     def get_stats(self) -> Dict:
         """Get game statistics."""
         return {
@@ -2,7 +2,38 @@
 Core QEC framework and abstractions.
 """
 
-from .code_abstractions import CodeDefinition
-from .qec_framework import QubitRegister
+from ..utils.lazy import lazy_exports
 
-__all__ = ['CodeDefinition', 'QubitRegister']
+# Exported name -> defining submodule, imported on first access (PEP 562)
+_EXPORTS = {
+    'CodeDefinition': '.code_abstractions',
+    'QubitRegister': '.qec_framework',
+    'Decoder': '.decoders',
+    'LookupTableDecoder': '.decoders',
+    'SyndromeFunctionDecoder': '.decoders',
+    'MemoizedDecoder': '.decoders',
+    'default_decoders': '.decoders',
+    'QuditClusterDecoder': '.qudit_decoders',
+    'RoundBatch': '.rounds',
+    'stratified_failure_rate': '.rare_events',
+    'splitting_failure_rate': '.rare_events',
+    'weight_enumerator': '.weight_enumerators',
+    'macwilliams_transform': '.weight_enumerators',
+    'failure_counts': '.weight_enumerators',
+    'logical_error_curve': '.weight_enumerators',
+    'SweepTask': '.sweeps',
+    'make_sweep': '.sweeps',
+    'merge_results': '.sweeps',
+    'run_sweep': '.sweeps',
+    'write_syndrome_dataset': '.datasets',
+    'SyndromeDataset': '.datasets',
+    'NeuralDecoder': '.neural_decoder',
+    'evaluate_decoder': '.neural_decoder',
+    'ErasureDecoder': '.erasure',
+    'UnionFindDecoder': '.erasure',
+    'sample_erasure_errors': '.erasure',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
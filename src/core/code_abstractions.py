@@ -1,6 +1,11 @@
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+from ..utils.artifact_cache import ArtifactCache, default_cache
+from ..utils.sparse import CSRMatrix
+from ..utils.instrumentation import timed
 
 # --- Module 1: Code Abstraction (CodeDefinition Class) ---
 # This abstract base class ensures all new codes (Qudit, Toric, Color, etc.)
@@ -51,15 +56,80 @@ class CodeDefinition(ABC):
         """Describes the geometric support of the code (e.g., 'Planar', 'Toroidal')."""
         pass
 
+    def get_css_matrices(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns (Hx, Hz) for CSS qubit codes, or None if the code only defines
+        a single (classical / qudit) check matrix.
+        """
+        return None
+
+    def computed_parameters(self) -> dict:
+        """
+        Derives n, k and distance bounds from the actual check matrices
+        (GF(2) ranks for qubit codes, Z_d kernel sizes for qudit codes).
+        Results are memoized per matrix hash.
+
+        :return: Dictionary from code_parameters ('n', 'k', 'distance', 'distance_lower', ...).
+        """
+        from .code_parameters import code_parameters
+        css = self.get_css_matrices()
+        if css is not None:
+            return code_parameters(Hx=css[0], Hz=css[1])
+        return code_parameters(H=self.get_stabilizer_matrix(), modulus=self.d)
+
+    def verify_distance(self, **bound_kwargs) -> str:
+        """
+        Checks the declared 'distance' against lower and upper distance bounds.
+
+        For CSS codes both X and Z logicals are bounded (distance_bounds); qubit
+        codes without CSS matrices and qudit codes treat the kernel of
+        get_stabilizer_matrix() as a classical code (over Z_d for d > 2). Small
+        codes are bounded exactly. For large ones the randomized search only
+        gives an upper bound and enumeration a lower one, so a declared value
+        between the two can be neither confirmed nor refuted.
+
+        :param bound_kwargs: Forwarded to distance_bounds (iterations, seed, enumeration_budget)
+                             or, for qudit codes, distance_bounds_mod (enumeration_budget).
+        :return: 'confirmed' if lower == declared == upper, 'refuted' if the declared
+                 value is outside [lower, upper], otherwise 'inconclusive'.
+        """
+        from .code_parameters import distance_bounds, distance_bounds_mod
+        css = self.get_css_matrices()
+        if self.d != 2:
+            lower, upper = distance_bounds_mod(self.get_stabilizer_matrix(), self.d, **bound_kwargs)
+        elif css is None:
+            lower, upper = distance_bounds(self.get_stabilizer_matrix(), **bound_kwargs)
+        else:
+            Hx, Hz = css
+            x_lower, x_upper = distance_bounds(Hz, Hx, **bound_kwargs)
+            z_lower, z_upper = distance_bounds(Hx, Hz, **bound_kwargs)
+            lower, upper = min(x_lower, z_lower), min(x_upper, z_upper)
+        if self.distance < lower or (upper is not None and self.distance > upper):
+            return 'refuted'
+        if lower == upper == self.distance:
+            return 'confirmed'
+        return 'inconclusive'
+
 
 # --- Example Implementation: The Original Qudit Surface Code (d > 2) ---
 class QuditSurfaceCode(CodeDefinition):
     """
     Implementation of the original Decodoku-style Qudit Code (additive checks mod d).
-    Placeholder implementation for demonstration.
+
+    Qudits live on the edges of an L x L grid of vertices. Every vertex (i, j) owns
+    a 'right' edge (index i*L + j) and a 'down' edge (index L^2 + i*L + j); edges
+    leaving the last column/row end on the boundary. An error of value x on an edge
+    u -> w adds +x to the charge at u and -x at w (mod d), so charges are created in
+    neutral pairs and can be absorbed by the right/bottom boundary, as in Decodoku.
+
+    The charge checks are kept as their 3n nonzero entries (charge_entries);
+    charges() applies them without a matrix, and the dense H is only built
+    when it is asked for.
     """
     def __init__(self, d=10, L=3):
         super().__init__(d, L)
+        self.edge_endpoints = self._build_edges()
+        self.charge_entries = self._build_charge_checks()
 
     @property
     def n_physical(self) -> int:
@@ -67,24 +137,94 @@ class QuditSurfaceCode(CodeDefinition):
 
     @property
     def k_logical(self) -> int:
+        """
+        Nominal Decodoku value, not derived from H.
+
+        H holds only the vertex charge checks. Its kernel over Z_d (what
+        computed_parameters() and verify_distance() see) therefore counts
+        every charge-neutral loop as a codeword, including the two edges
+        leaving the corner vertex, so it reports k = L^2 and distance 2. The
+        plaquette operators that make those loops trivial are not part of
+        the game model, so the encoded k and distance cannot be computed
+        from it.
+        """
         return 1
 
     @property
     def distance(self) -> int:
+        """Nominal Decodoku value, not derived from H (see k_logical)."""
         return self.L
 
+    def _build_edges(self) -> np.ndarray:
+        """(n, 2) array of (tail, head) vertex indices; head is -1 on the boundary."""
+        L = self.L
+        i, j = np.divmod(np.arange(L * L), L)
+        vertex = i * L + j
+        right = np.where(j + 1 < L, vertex + 1, -1)
+        down = np.where(i + 1 < L, vertex + L, -1)
+        return np.vstack([np.column_stack([vertex, right]),
+                          np.column_stack([vertex, down])])
+
+    def _build_charge_checks(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, columns, values) of the nonzero entries of H."""
+        edges = np.arange(self.n_physical)
+        tail, head = self.edge_endpoints[:, 0], self.edge_endpoints[:, 1]
+        inner = head >= 0
+        rows = np.concatenate([tail, head[inner]])
+        cols = np.concatenate([edges, edges[inner]])
+        values = np.concatenate([np.ones(len(edges), dtype=np.int64),
+                                 np.full(int(inner.sum()), self.d - 1, dtype=np.int64)])
+        return rows, cols, values
+
+    @cached_property
+    def H(self) -> np.ndarray:
+        """Dense (L^2, 2L^2) charge check matrix, built on first access."""
+        H = np.zeros((self.L**2, self.n_physical), dtype=np.int64)
+        rows, cols, values = self.charge_entries
+        H[rows, cols] = values
+        return H
+
     def get_stabilizer_matrix(self) -> np.ndarray:
-        # In the original Decodoku, this matrix represents the local qudit indices
-        # involved in the modular sum check for each plaquette.
-        # Placeholder: 8 checks acting on 18 qudits for L=3 surface code geometry.
-        return np.random.randint(0, self.d, size=(8, self.n_physical))
+        # Row v is the modular charge check at vertex v: outgoing edges count +1,
+        # incoming edges count -1 (= d-1).
+        return self.H
+
+    def charges(self, errors: np.ndarray) -> np.ndarray:
+        """
+        Vertex charges H @ e mod d, from the nonzero entries of H only.
+
+        :param errors: Integer array of shape (n_physical,) or (shots, n_physical).
+        :return: Array of shape (L^2,) or (shots, L^2) with values in Z_d.
+        """
+        errors = np.asarray(errors, dtype=np.int64)
+        single = errors.ndim == 1
+        errors = np.atleast_2d(errors)
+        rows, cols, values = self.charge_entries
+        charges = np.zeros((self.L**2, len(errors)), dtype=np.int64)
+        np.add.at(charges, rows, (errors[:, cols] * values).T)
+        charges = np.mod(charges.T, self.d)
+        return charges[0] if single else charges
 
     def get_topology(self) -> str:
         return "Planar Grid (Qudit)"
 
+    @timed('sample')
+    def sample_errors(self, p: float, shots: int, seed: Optional[int] = None) -> np.ndarray:
+        """
+        Independent qudit errors: each edge is hit with probability p by a uniformly
+        random nonzero value in Z_d.
+
+        :return: Integer array of shape (shots, n_physical).
+        """
+        rng = np.random.default_rng(seed)
+        hit = rng.random((shots, self.n_physical)) < p
+        values = rng.integers(1, self.d, size=(shots, self.n_physical))
+        return np.where(hit, values, 0)
+
 
 # --- Module 2: Generalized Stabilizer Check Logic ---
 # This module handles the field-specific syndrome calculation.
+@timed('syndrome')
 def calculate_syndrome(code: CodeDefinition, error_vector: np.ndarray) -> np.ndarray:
     """
     Calculates the syndrome vector (s) based on the code's definition and an applied error vector (e).
@@ -96,6 +236,11 @@ def calculate_syndrome(code: CodeDefinition, error_vector: np.ndarray) -> np.nda
     :param error_vector: A 1D numpy array representing the error (e).
     :return: The syndrome vector (s).
     """
+    sparse = getattr(code, 'get_sparse_stabilizer_matrix', None)
+    if sparse is not None and code.d == 2:
+        # Sparse LDPC codes (src.codes.qldpc) never densify their checks
+        return sparse().multiply(np.asarray(error_vector).T).T
+
     H = code.get_stabilizer_matrix()
 
     # The core operation: Syndrome = H * Error (performed over the specific field F_d)
@@ -123,10 +268,19 @@ class ToricCode(CodeDefinition):
     Implementation of the Toric Code (Z2 qubit stabilizer code) defined on a torus.
     This demonstrates the Z2 functionality required for expansion.
     """
-    def __init__(self, L=3):
+    CACHE_VERSION = 1
+
+    def __init__(self, L=3, cache: Optional[ArtifactCache] = None):
         # Toric Code uses qubits (d=2) and encodes k=2 logical qubits.
         super().__init__(d=2, L=L)
-        # Note: A proper implementation would define Hx and Hz matrices.
+        # Check matrices are stored sparsely (CSR) in the artifact cache and keyed by L.
+        # They stay sparse (views onto memory-mapped artifacts with a disk cache);
+        # get_css_matrices() densifies on request.
+        cache = default_cache() if cache is None else cache
+        artifacts = cache.get_or_build('ToricCode', {'L': L}, self._build_sparse_checks,
+                                       version=self.CACHE_VERSION)
+        self.Hx = CSRMatrix.from_artifacts(artifacts, 'Hx')
+        self.Hz = CSRMatrix.from_artifacts(artifacts, 'Hz')
 
     @property
     def n_physical(self) -> int:
@@ -143,12 +297,40 @@ class ToricCode(CodeDefinition):
         # Distance is L.[1]
         return self.L
 
+    def _build_sparse_checks(self) -> dict:
+        """
+        Builds vertex (X) and plaquette (Z) checks on the L x L torus as CSR artifacts.
+        Qubit index i*L + j is the horizontal edge leaving vertex (i, j) to the right,
+        L^2 + i*L + j is the vertical edge leaving it downwards.
+        """
+        L = self.L
+        i, j = np.divmod(np.arange(L * L), L)
+        horizontal = lambda r, c: (r % L) * L + (c % L)
+        vertical = lambda r, c: L * L + (r % L) * L + (c % L)
+        rows = np.tile(np.arange(L * L), 4)
+        shape = (L * L, self.n_physical)
+
+        Hx = CSRMatrix.from_coo(rows, np.concatenate(
+            [horizontal(i, j), horizontal(i, j - 1), vertical(i, j), vertical(i - 1, j)]), shape)
+        Hz = CSRMatrix.from_coo(rows, np.concatenate(
+            [horizontal(i, j), horizontal(i + 1, j), vertical(i, j), vertical(i, j + 1)]), shape)
+        artifacts = Hx.to_artifacts('Hx')
+        artifacts.update(Hz.to_artifacts('Hz'))
+        return artifacts
+
+    def get_sparse_css_matrices(self) -> Tuple[CSRMatrix, CSRMatrix]:
+        return self.Hx, self.Hz
+
+    def get_sparse_stabilizer_matrix(self) -> CSRMatrix:
+        return CSRMatrix.vstack([self.Hx, self.Hz])
+
     def get_stabilizer_matrix(self) -> np.ndarray:
-        # This function would construct the 2D lattice graph and generate the
-        # stabilizer matrix (Hx and Hz combined) based on vertex and plaquette checks.[2]
-        # Placeholder for demonstration of the required interface:
-        n_checks = 2 * (self.L**2 - 1)  # Simplified: (L^2 X-checks + L^2 Z-checks) - 2
-        return np.random.randint(0, 2, size=(n_checks, self.n_physical))
+        # Vertex (X-type) checks stacked on top of plaquette (Z-type) checks.
+        # Two rows are redundant: the product of all vertices (or plaquettes) is the identity.
+        return self.get_sparse_stabilizer_matrix().to_dense()
+
+    def get_css_matrices(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.Hx.to_dense(), self.Hz.to_dense()
 
     def get_topology(self) -> str:
         return "Toroidal Grid (Qubit)"
\ No newline at end of file
@@ -0,0 +1,179 @@
+"""
+Code parameters [[n, k, d]] computed from check matrices instead of hard-coded.
+
+k comes from ranks over GF(2) (bit-packed elimination), GF(p) or Z_d; the
+distance comes from exhaustive enumeration where affordable and otherwise
+from a lower bound (all lighter patterns ruled out) and an upper bound (the
+lightest logical found by the information-set search). Every result is
+memoized per matrix hash, so validating many generated codes only pays for
+each distinct matrix once.
+"""
+
+import numpy as np
+from itertools import combinations, product
+from math import comb
+from typing import Callable, Dict, Optional, Tuple
+
+from ..utils import gf2
+from ..utils.modular import kernel_dimension_mod, rank_mod_p, is_prime
+from .logical_operators import logical_tester, find_min_weight_logical
+
+_parameter_cache: Dict[str, object] = {}
+
+
+def _memoized(key: str, compute: Callable[[], object]):
+    if key not in _parameter_cache:
+        _parameter_cache[key] = compute()
+    return _parameter_cache[key]
+
+
+def clear_parameter_cache():
+    """Forget all memoized ranks, bounds and parameters."""
+    _parameter_cache.clear()
+
+
+def cached_rank(matrix: np.ndarray, modulus: int = 2) -> int:
+    """
+    Rank of a check matrix over GF(2) or GF(p), memoized per matrix hash.
+
+    Args:
+        matrix: Integer matrix of shape (m, n)
+        modulus: Field size (a prime)
+
+    Returns:
+        The rank
+    """
+    matrix = np.asarray(matrix)
+    key = f"rank:{modulus}:" + gf2.matrix_key(matrix)
+    if modulus == 2:
+        return _memoized(key, lambda: gf2.rank(matrix % 2))
+    return _memoized(key, lambda: rank_mod_p(matrix, modulus))
+
+
+def css_logical_count(Hx: np.ndarray, Hz: np.ndarray) -> int:
+    """Number of logical qubits of a CSS code: k = n - rank(Hx) - rank(Hz)."""
+    return np.asarray(Hx).shape[1] - cached_rank(Hx) - cached_rank(Hz)
+
+
+def distance_bounds(H_detect: np.ndarray, H_stab: Optional[np.ndarray] = None,
+                    enumeration_budget: int = 200_000, iterations: int = 100,
+                    seed: Optional[int] = None) -> Tuple[int, int]:
+    """
+    Lower and upper bounds on the weight of the lightest nontrivial logical.
+
+    The information-set search provides the upper bound (exact for small kernels).
+    Error weights are then enumerated in increasing order while C(n, w) stays
+    within enumeration_budget; if none of them is a logical, the lower bound is
+    the next weight.
+
+    Args:
+        H_detect: Binary check matrix (Hz for X logicals, H for classical codes)
+        H_stab: Stabilizers modulo which operators are trivial (None if classical)
+        enumeration_budget: Largest number of supports enumerated for one weight
+        iterations: Information sets tried by the randomized search
+        seed: Random seed for the randomized search
+
+    Returns:
+        Tuple (lower, upper); lower == upper when the distance is known exactly
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    key = (f"bounds:{enumeration_budget}:{iterations}:{seed}:"
+           + gf2.matrix_key(H_detect, H_stab))
+
+    def compute():
+        search = find_min_weight_logical(H_detect, H_stab, iterations=iterations, seed=seed)
+        if search.exact:
+            return search.weight, search.weight
+        n = H_detect.shape[1]
+        columns = gf2.pack_rows(H_detect.T)
+        is_logical = logical_tester(H_stab, H_detect, n)
+        lower = 1
+        for weight in range(1, search.weight):
+            if comb(n, weight) > enumeration_budget:
+                break
+            supports = np.array(list(combinations(range(n), weight)), dtype=np.intp)
+            silent = supports[~np.bitwise_xor.reduce(columns[supports], axis=1).any(axis=1)]
+            if len(silent):
+                errors = np.zeros((len(silent), n), dtype=np.uint8)
+                errors[np.arange(len(silent))[:, None], silent] = 1
+                if is_logical(gf2.pack_rows(errors)).any():
+                    return weight, weight
+            lower = weight + 1
+        return lower, search.weight
+
+    return _memoized(key, compute)
+
+
+def distance_bounds_mod(H: np.ndarray, d: int,
+                        enumeration_budget: int = 200_000) -> Tuple[int, Optional[int]]:
+    """
+    Distance bounds for a classical code over Z_d by enumerating weighted supports.
+
+    Returns:
+        Tuple (lower, upper); upper is None if no codeword was reached within budget
+    """
+    H = np.mod(np.asarray(H, dtype=np.int64), d)
+    key = f"bounds_mod:{d}:{enumeration_budget}:" + gf2.matrix_key(H)
+
+    def compute():
+        n = H.shape[1]
+        for weight in range(1, n + 1):
+            if comb(n, weight) * (d - 1) ** weight > enumeration_budget:
+                return weight, None
+            supports = np.array(list(combinations(range(n), weight)), dtype=np.intp)
+            values = np.array(list(product(range(1, d), repeat=weight)), dtype=np.int64)
+            # syndromes[s, v] = sum_j H[:, supports[s, j]] * values[v, j]
+            syndromes = np.einsum('msj,vj->svm', H[:, supports], values) % d
+            if (~syndromes.any(axis=2)).any():
+                return weight, weight
+        return n + 1, None
+
+    return _memoized(key, compute)
+
+
+def code_parameters(H: Optional[np.ndarray] = None, Hx: Optional[np.ndarray] = None,
+                    Hz: Optional[np.ndarray] = None, modulus: int = 2) -> Dict:
+    """
+    Compute [[n, k, d]] (or [n, k, d] for classical codes) from check matrices.
+
+    Pass Hx and Hz for a CSS code, or H for a classical code over Z_modulus.
+    A CSS pair whose checks do not commute (Hx @ Hz.T != 0) is not a stabilizer
+    code; it is then reported through the classical code of Hz.
+
+    Returns:
+        Dictionary with 'kind', 'n', 'k', 'distance' (None unless exact),
+        'distance_lower' and 'distance_upper'
+    """
+    if Hx is not None and Hz is not None:
+        Hx = np.asarray(Hx, dtype=np.uint8) % 2
+        Hz = np.asarray(Hz, dtype=np.uint8) % 2
+        if not ((Hx.astype(np.int64) @ Hz.T.astype(np.int64)) % 2).any():
+            n = Hx.shape[1]
+            k = css_logical_count(Hx, Hz)
+            if k == 0:
+                return {'kind': 'css', 'n': n, 'k': 0, 'distance': None,
+                        'distance_lower': None, 'distance_upper': None}
+            x_lower, x_upper = distance_bounds(Hz, Hx)
+            z_lower, z_upper = distance_bounds(Hx, Hz)
+            lower, upper = min(x_lower, z_lower), min(x_upper, z_upper)
+            return {'kind': 'css', 'n': n, 'k': k,
+                    'distance': upper if lower == upper else None,
+                    'distance_lower': lower, 'distance_upper': upper}
+        H = Hz
+
+    H = np.asarray(H)
+    n = H.shape[1]
+    if modulus == 2:
+        H = H.astype(np.uint8) % 2
+        k = n - cached_rank(H)
+        lower, upper = distance_bounds(H) if k > 0 else (None, None)
+    else:
+        if is_prime(modulus):
+            k = n - cached_rank(H, modulus)
+        else:
+            k = _memoized(f"kernel_mod:{modulus}:" + gf2.matrix_key(H),
+                          lambda: kernel_dimension_mod(H, modulus))
+        lower, upper = distance_bounds_mod(H, modulus) if k > 0 else (None, None)
+    return {'kind': 'classical', 'n': n, 'k': k,
+            'distance': upper if upper is not None and lower == upper else None,
+            'distance_lower': lower, 'distance_upper': upper}
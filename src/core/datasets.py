@@ -0,0 +1,285 @@
+"""
+Sharded, memory-mapped syndrome datasets for training and evaluating learned decoders.
+
+write_syndrome_dataset() samples errors from a noise model in chunks and
+writes fixed-size shards, each column in its own .npy file:
+
+    path/meta.json                        code, noise, sizes, shard list, version
+    path/matrices.npz                     H_detect and the observable matrix
+    path/shard-00000.syndromes.npy        (rows, ceil(m / 8)) uint8
+    path/shard-00000.errors.npy           (rows, ceil(n / 8)) uint8
+    path/shard-00000.observables.npy      (rows, ceil(k / 8)) uint8
+
+Bits are packed little-endian within each byte (bit i of a row is byte
+i // 8, bit i % 8), the same order as gf2.pack_rows. Shards are filled
+through np.lib.format.open_memmap, so writing 10^8 samples takes about
+one chunk of memory rather than Python lists of every sample.
+
+SyndromeDataset memory-maps the shards, which the OS pages in on demand.
+batches() streams shuffled minibatches. Shards are visited in a random
+order, a few at a time, with their rows interleaved in random order. Only
+the indices of the shards in flight and a few prefetched batches are held
+in memory. A background thread gathers (and optionally unpacks) the next
+batches while the consumer trains on the current one.
+
+Labels follow sweeps.check_matrices: X errors detected by Hz (or H).
+'observables' are the flips of a basis of conjugate logical operators,
+i.e. the logical class a decoder has to predict.
+"""
+
+import json
+import os
+import queue
+import threading
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ..utils import gf2
+from ..utils.sparse import CSRMatrix
+from .sweeps import check_matrices
+
+DATASET_VERSION = 1
+
+COLUMNS = ('syndromes', 'errors', 'observables')
+
+# Errors sampled and packed per generation step
+CHUNK_SHOTS = 1 << 16
+
+# noise(rng, shots, n) -> binary errors of shape (shots, n)
+NoiseModel = Callable[[np.random.Generator, int, int], np.ndarray]
+
+
+def bit_flip_noise(p: float) -> NoiseModel:
+    """Independent X flips with probability p on every qubit."""
+    return lambda rng, shots, n: (rng.random((shots, n)) < p).astype(np.uint8)
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    return np.packbits(bits.astype(np.uint8), axis=1, bitorder='little')
+
+
+def unpack(packed: np.ndarray, bits: int) -> np.ndarray:
+    """Unpack (rows, bytes) little-endian packed rows into (rows, bits) uint8."""
+    return np.unpackbits(packed, axis=1, count=bits, bitorder='little')
+
+
+def observable_matrix(H_detect: np.ndarray, H_stab: Optional[np.ndarray]) -> np.ndarray:
+    """Basis of the conjugate logical operators whose parities label an error's logical class."""
+    n = H_detect.shape[1]
+    if H_stab is None or np.asarray(H_stab).size == 0:
+        return np.zeros((0, n), dtype=np.uint8)
+    return gf2.complement_basis(H_detect, gf2.nullspace(H_stab, n)).astype(np.uint8)
+
+
+def write_syndrome_dataset(code, path: str, samples: int, p: Optional[float] = None,
+                           noise: Optional[NoiseModel] = None, shard_size: int = 1 << 20,
+                           seed: Optional[int] = None, description: str = '') -> Dict:
+    """
+    Sample a labelled dataset and write it as memory-mappable shards.
+
+    Args:
+        code: Code with get_css_matrices() (or H)
+        path: Output directory (created; existing shards are overwritten)
+        samples: Number of samples
+        p: Bit-flip rate, shorthand for noise=bit_flip_noise(p)
+        noise: Noise model noise(rng, shots, n) -> (shots, n) binary errors
+        shard_size: Samples per shard (the last shard may be shorter)
+        seed: Random seed
+        description: Free-form text stored in the metadata (e.g. the noise model)
+
+    Returns:
+        The metadata written to meta.json
+    """
+    if (p is None) == (noise is None):
+        raise ValueError("Give exactly one of p and noise.")
+    noise = bit_flip_noise(p) if noise is None else noise
+    H_detect, H_stab = check_matrices(code)
+    observables = observable_matrix(H_detect, H_stab)
+    checks = CSRMatrix.from_dense(H_detect)
+    logicals = CSRMatrix.from_dense(observables)
+    (m, n), k = H_detect.shape, len(observables)
+    bits = {'syndromes': m, 'errors': n, 'observables': k}
+
+    os.makedirs(path, exist_ok=True)
+    np.savez(os.path.join(path, 'matrices.npz'), H_detect=H_detect, observables=observables)
+    rng = np.random.default_rng(seed)
+    shards: List[Dict] = []
+    for index, start in enumerate(range(0, samples, shard_size)):
+        rows = min(shard_size, samples - start)
+        name = f"shard-{index:05d}"
+        outputs = {column: np.lib.format.open_memmap(
+                       os.path.join(path, f"{name}.{column}.npy"), mode='w+', dtype=np.uint8,
+                       shape=(rows, -(-bits[column] // 8)))
+                   for column in COLUMNS}
+        for offset in range(0, rows, CHUNK_SHOTS):
+            shots = min(CHUNK_SHOTS, rows - offset)
+            errors = np.asarray(noise(rng, shots, n), dtype=np.uint8) & 1
+            chunk = {'syndromes': checks.multiply(errors), 'errors': errors,
+                     'observables': logicals.multiply(errors) if k else np.zeros((shots, 0), np.uint8)}
+            for column in COLUMNS:
+                outputs[column][offset:offset + shots] = _pack(chunk[column])
+        for output in outputs.values():
+            output.flush()
+        del outputs
+        shards.append({'name': name, 'rows': rows})
+
+    meta = {
+        'version': DATASET_VERSION,
+        'code': type(code).__name__,
+        'code_key': gf2.matrix_key(H_detect, observables),
+        'p': p,
+        'description': description,
+        'seed': seed,
+        'samples': samples,
+        'shard_size': shard_size,
+        'bits': bits,
+        'shards': shards,
+    }
+    with open(os.path.join(path, 'meta.json'), 'w') as handle:
+        json.dump(meta, handle, indent=2)
+    return meta
+
+
+class SyndromeDataset:
+    """
+    Read-only view of a dataset written by write_syndrome_dataset.
+
+    Attributes:
+        meta: Contents of meta.json
+        bits: Unpacked width of every column
+        H_detect, observables: The matrices the labels were computed with
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, 'meta.json')) as handle:
+            self.meta = json.load(handle)
+        if self.meta.get('version') != DATASET_VERSION:
+            raise ValueError(f"{path} holds dataset version {self.meta.get('version')}, expected {DATASET_VERSION}.")
+        self.path = path
+        self.bits = self.meta['bits']
+        with np.load(os.path.join(path, 'matrices.npz')) as matrices:
+            self.H_detect = matrices['H_detect']
+            self.observables = matrices['observables']
+        self._shards = [{column: np.load(os.path.join(path, f"{shard['name']}.{column}.npy"), mmap_mode='r')
+                         for column in COLUMNS} for shard in self.meta['shards']]
+        self._starts = np.cumsum([0] + [shard['rows'] for shard in self.meta['shards']])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._shards)
+
+    def shard(self, index: int) -> Dict[str, np.ndarray]:
+        """Memory-mapped packed columns of one shard."""
+        return self._shards[index]
+
+    def _gather(self, shard: int, rows: np.ndarray, unpacked: bool) -> Dict[str, np.ndarray]:
+        rows = np.sort(rows)  # ascending reads keep page access sequential
+        batch = {column: np.asarray(self._shards[shard][column][rows]) for column in COLUMNS}
+        if unpacked:
+            batch = {column: unpack(values, self.bits[column]) for column, values in batch.items()}
+        return batch
+
+    def read(self, start: int, stop: int, unpacked: bool = False) -> Dict[str, np.ndarray]:
+        """Samples start..stop-1 in file order (may span shards)."""
+        parts = []
+        for shard in range(self.num_shards):
+            lo, hi = max(start, self._starts[shard]), min(stop, self._starts[shard + 1])
+            if lo < hi:
+                parts.append(self._gather(shard, np.arange(lo, hi) - self._starts[shard], unpacked))
+        if not parts:
+            width = lambda column: self.bits[column] if unpacked else -(-self.bits[column] // 8)
+            return {column: np.zeros((0, width(column)), dtype=np.uint8) for column in COLUMNS}
+        return {column: np.concatenate([part[column] for part in parts]) for column in COLUMNS}
+
+    def _batch_plan(self, batch_size: int, rng: np.random.Generator, shuffle: bool,
+                    mix: int, drop_last: bool) -> Iterator[List[tuple]]:
+        """Yield batches as lists of (shard, rows) pieces."""
+        order = rng.permutation(self.num_shards) if shuffle else np.arange(self.num_shards)
+        pending: List[tuple] = []
+        pending_rows = 0
+        for group_start in range(0, len(order), mix):
+            group = order[group_start:group_start + mix]
+            # Interleave the rows of the shards in flight
+            sources = np.concatenate([np.full(self.meta['shards'][s]['rows'], s) for s in group])
+            rows = np.concatenate([np.arange(self.meta['shards'][s]['rows']) for s in group])
+            if shuffle:
+                permutation = rng.permutation(len(rows))
+                sources, rows = sources[permutation], rows[permutation]
+            position = 0
+            while position < len(rows):
+                take = min(batch_size - pending_rows, len(rows) - position)
+                window_sources = sources[position:position + take]
+                window_rows = rows[position:position + take]
+                for s in np.unique(window_sources):
+                    pending.append((int(s), window_rows[window_sources == s]))
+                pending_rows += take
+                position += take
+                if pending_rows == batch_size:
+                    yield pending
+                    pending, pending_rows = [], 0
+        if pending and not drop_last:
+            yield pending
+
+    def batches(self, batch_size: int, shuffle: bool = True, seed: Optional[int] = None,
+                unpacked: bool = False, prefetch: int = 4, mix: int = 2,
+                drop_last: bool = False) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream one epoch of minibatches, prefetched on a background thread.
+
+        Args:
+            batch_size: Samples per batch
+            shuffle: Visit shards and rows in random order
+            seed: Seed of the shuffle (one epoch per call; vary it per epoch)
+            unpacked: Yield (batch, bits) uint8 arrays instead of packed bytes
+            prefetch: Batches gathered ahead of the consumer
+            mix: Shards interleaved at a time; more mixes better but holds more indices
+            drop_last: Skip the final short batch
+
+        Yields:
+            Dictionaries with 'syndromes', 'errors' and 'observables'
+        """
+        plan = self._batch_plan(batch_size, np.random.default_rng(seed), shuffle, max(1, mix), drop_last)
+        ready: queue.Queue = queue.Queue(maxsize=max(1, prefetch))
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce():
+            try:
+                for pieces in plan:
+                    parts = [self._gather(shard, rows, unpacked) for shard, rows in pieces]
+                    if not put({column: np.concatenate([part[column] for part in parts])
+                                for column in COLUMNS}):
+                        return
+                put(done)
+            except BaseException as error:  # surfaced in the consumer
+                put(error)
+
+        worker = threading.Thread(target=produce, daemon=True)
+        worker.start()
+        try:
+            while True:
+                item = ready.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            worker.join()
+
+    def __repr__(self):
+        return (f"{type(self).__name__}({self.path!r}, {len(self)} samples, {self.num_shards} shards, "
+                f"bits={self.bits})")
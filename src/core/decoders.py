@@ -0,0 +1,302 @@
+"""
+Syndrome decoders shared by the games, analytics and simulation tools.
+
+Every decoder maps a batch of binary syndromes, shape (shots, m), to a batch
+of binary corrections, shape (shots, n). When a bit vector is packed into an
+integer, bit i carries weight 2**i; this matches the 'syndrome_decimal'
+convention used by SteaneGame (s0 + 2*s1 + 4*s2).
+"""
+
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import combinations
+from typing import Callable, Dict, Optional, Sequence, Union
+
+from ..utils.artifact_cache import ArtifactCache, default_cache
+from ..utils.gf2 import matrix_key
+from ..utils.instrumentation import INSTRUMENTS, timed
+
+
+def pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack rows of a binary array into unsigned integers (bit i -> 2**i).
+
+    Args:
+        bits: Binary array of shape (..., width) with width <= 64
+
+    Returns:
+        uint64 array of shape (...)
+    """
+    bits = np.asarray(bits)
+    width = bits.shape[-1]
+    if width > 64:
+        raise ValueError(f"Cannot pack {width} bits into a 64-bit integer.")
+    weights = np.left_shift(np.uint64(1), np.arange(width, dtype=np.uint64))
+    return ((bits.astype(np.uint64) & np.uint64(1)) * weights).sum(axis=-1, dtype=np.uint64)
+
+
+def unpack_bits(keys: np.ndarray, width: int) -> np.ndarray:
+    """
+    Inverse of pack_bits.
+
+    Args:
+        keys: Integer array of packed bit vectors
+        width: Number of bits per vector
+
+    Returns:
+        uint8 array of shape keys.shape + (width,)
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    shifts = np.arange(width, dtype=np.uint64)
+    return ((keys[..., None] >> shifts) & np.uint64(1)).astype(np.uint8)
+
+
+class Decoder(ABC):
+    """
+    Abstract base class for batch syndrome decoders.
+
+    Subclasses implement decode_batch; single-shot decoding is a batch of one.
+    """
+    name = "decoder"
+
+    def __init_subclass__(cls, **kwargs):
+        # Every concrete decode_batch is timed as stage 'decode.<ClassName>'
+        super().__init_subclass__(**kwargs)
+        if 'decode_batch' in cls.__dict__:
+            cls.decode_batch = timed(f'decode.{cls.__name__}')(cls.decode_batch)
+
+    def __init__(self, n: int, m: int):
+        """
+        Args:
+            n: Number of physical qubits (length of a correction)
+            m: Number of checks (length of a syndrome)
+        """
+        self.n = n
+        self.m = m
+
+    @abstractmethod
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        """
+        Decode a batch of syndromes.
+
+        Args:
+            syndromes: Binary array of shape (shots, m)
+
+        Returns:
+            Binary uint8 array of shape (shots, n) with the proposed corrections
+        """
+        pass
+
+    def decode(self, syndrome: np.ndarray) -> np.ndarray:
+        """Decode a single syndrome vector of length m."""
+        return self.decode_batch(np.asarray(syndrome)[None, :])[0]
+
+
+class LookupTableDecoder(Decoder):
+    """
+    Minimum-weight lookup table decoder for small parity check matrices.
+
+    The table is filled by enumerating error patterns in order of increasing
+    weight, so each syndrome maps to a lowest-weight error that produces it.
+    """
+    name = "lookup"
+    CACHE_VERSION = 1
+
+    def __init__(self, H: np.ndarray, max_weight: Optional[int] = None,
+                 cache: Optional[ArtifactCache] = None):
+        """
+        Args:
+            H: Binary parity check matrix of shape (m, n), m <= 24
+            max_weight: Largest error weight to enumerate (default: until the
+                        table is full or every weight has been tried)
+            cache: Artifact cache for the table (default: the process-wide cache)
+        """
+        H = np.asarray(H, dtype=np.uint8) % 2
+        m, n = H.shape
+        super().__init__(n, m)
+        if m > 24:
+            raise ValueError(f"Lookup table for {m} checks would need 2^{m} entries.")
+        self.H = H
+        self.max_weight = max_weight
+
+        cache = default_cache() if cache is None else cache
+        artifacts = cache.get_or_build(
+            'LookupTableDecoder', {'H': matrix_key(H), 'max_weight': max_weight},
+            self._build_table, version=self.CACHE_VERSION)
+        self.table = artifacts['table']
+        self.filled = artifacts['filled']
+
+    def _build_table(self) -> Dict[str, np.ndarray]:
+        """Enumerate errors by increasing weight, keeping the first hit per syndrome."""
+        m, n = self.m, self.n
+        size = 1 << m
+        table = np.zeros((size, n), dtype=np.uint8)
+        filled = np.zeros(size, dtype=bool)
+        filled[0] = True
+
+        column_keys = pack_bits(self.H.T)
+        limit = n if self.max_weight is None else min(self.max_weight, n)
+        for weight in range(1, limit + 1):
+            if filled.all():
+                break
+            supports = np.array(list(combinations(range(n), weight)), dtype=np.intp)
+            keys = np.bitwise_xor.reduce(column_keys[supports], axis=1)
+            unique_keys, first = np.unique(keys, return_index=True)
+            new = ~filled[unique_keys]
+            rows = unique_keys[new].astype(np.intp)
+            table[rows[:, None], supports[first[new]]] = 1
+            filled[rows] = True
+        return {'table': table, 'filled': filled}
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        keys = pack_bits(np.asarray(syndromes)).astype(np.intp)
+        return self.table[keys]
+
+
+class SyndromeFunctionDecoder(Decoder):
+    """
+    Adapts a single-syndrome rule (such as SteaneCode.syndrome_to_error_location)
+    to the batch interface.
+
+    The rule is evaluated once per distinct syndrome in the batch and may return
+    None (no correction), a qubit index, or a sequence of qubit indices.
+    """
+    name = "rule"
+
+    def __init__(self, rule: Callable[[np.ndarray], Union[None, int, Sequence[int]]],
+                 n: int, m: int, name: Optional[str] = None):
+        super().__init__(n, m)
+        self.rule = rule
+        if name is not None:
+            self.name = name
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.asarray(syndromes)
+        unique_rows, inverse = np.unique(syndromes, axis=0, return_inverse=True)
+        corrections = np.zeros((len(unique_rows), self.n), dtype=np.uint8)
+        for i, row in enumerate(unique_rows):
+            result = self.rule(row)
+            if result is None:
+                continue
+            locations = [result] if np.isscalar(result) else list(result)
+            corrections[i, locations] = 1
+        return corrections[inverse.reshape(-1)]
+
+
+class MemoizedDecoder(Decoder):
+    """
+    Wraps any decoder with a bounded, thread-safe LRU of syndrome -> correction.
+
+    At low error rates a handful of syndromes make up almost every shot, so
+    each distinct syndrome in a batch is looked up by its packed bytes and
+    only the unseen ones are passed to the wrapped decoder (as one batch).
+    The wrapped decoder must be deterministic in the syndrome.
+
+    Counters: 'hits' are shots answered without decoding, 'misses' distinct
+    syndromes that were decoded, 'evictions' entries dropped by the LRU.
+    With instrumentation enabled they are also counted as
+    'decoder_cache.hits' / '.misses' / '.evictions'.
+    """
+    name = "memoized"
+
+    def __init__(self, decoder: Decoder, max_entries: int = 100_000,
+                 max_bytes: int = 256 << 20):
+        """
+        Args:
+            decoder: The decoder whose corrections are cached
+            max_entries: Most syndromes kept
+            max_bytes: Most bytes of keys plus corrections kept
+        """
+        super().__init__(decoder.n, decoder.m)
+        self.decoder = decoder
+        self.name = f"memoized_{decoder.name}"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes)).astype(np.uint8) & 1
+        packed = np.ascontiguousarray(np.packbits(syndromes, axis=1))
+        keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        corrections = np.empty((len(unique_keys), self.n), dtype=np.uint8)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(unique_keys):
+                cached = self._entries.get(key.tobytes())
+                if cached is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key.tobytes())
+                    corrections[i] = cached
+
+        if missing:
+            decoded = np.asarray(self.decoder.decode_batch(syndromes[first[missing]]), dtype=np.uint8)
+            corrections[missing] = decoded
+            self._store([unique_keys[i].tobytes() for i in missing], decoded)
+
+        with self._lock:
+            self.hits += len(syndromes) - len(missing)
+            self.misses += len(missing)
+        INSTRUMENTS.count('decoder_cache.hits', len(syndromes) - len(missing))
+        INSTRUMENTS.count('decoder_cache.misses', len(missing))
+        return corrections[inverse.reshape(-1)]
+
+    def _store(self, keys, corrections: np.ndarray):
+        evicted = 0
+        with self._lock:
+            for key, correction in zip(keys, corrections):
+                if key in self._entries:
+                    continue
+                self._entries[key] = correction.copy()
+                self.nbytes += len(key) + correction.nbytes
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self.nbytes > self.max_bytes):
+                key, correction = self._entries.popitem(last=False)
+                self.nbytes -= len(key) + correction.nbytes
+                evicted += 1
+            self.evictions += evicted
+        INSTRUMENTS.count('decoder_cache.evictions', evicted)
+
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        """Drop every cached correction (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'bytes': self.nbytes,
+                    'hit_rate': self.hit_rate()}
+
+
+def default_decoders(code) -> Dict[str, Decoder]:
+    """
+    Build every decoder available for a code exposing a parity check matrix H.
+
+    Args:
+        code: SteaneCode, ReedMullerCode or any object with an 'H' attribute
+
+    Returns:
+        Dictionary mapping decoder name to decoder instance
+    """
+    H = np.asarray(code.H)
+    m, n = H.shape
+    decoders: Dict[str, Decoder] = {'lookup': LookupTableDecoder(H)}
+    if hasattr(code, 'syndrome_to_error_location'):
+        decoders['syndrome_rule'] = SyndromeFunctionDecoder(
+            code.syndrome_to_error_location, n, m, name='syndrome_rule')
+    return decoders
@@ -0,0 +1,339 @@
+"""
+Erasure decoding: errors at known positions, alone or mixed with Pauli errors.
+
+Leaked or lost qubits are detected and reset to a maximally mixed state. The
+decoder then knows where they are, and each erased qubit carries a flip
+with probability 1/2. Given the erased set E, any correction supported on E
+that reproduces the syndrome is optimal, since all of them differ by
+stabilizers or logicals that are equally likely. No weights need comparing.
+
+ErasureDecoder finds such a correction:
+
+- graph-like check matrices (every qubit in at most two checks, such as
+  ToricCode, surface and repetition codes) are peeled. Over a spanning
+  forest of the erased edges, leaves are stripped one by one, each flipping
+  its edge when its vertex is lit (Delfosse and Zemor, "Linear-time maximum
+  likelihood decoding of surface codes over the quantum erasure channel").
+  Cost is O(|E|) per shot;
+- other codes solve H_E x = s over the erased columns only, with an XOR
+  basis of the erased columns.
+
+Shots whose syndrome the erasures cannot explain (Pauli errors outside E)
+go to an optional fallback decoder.
+
+UnionFindDecoder is the combined mode for graph-like codes. It is the
+union-find decoder of Delfosse and Nickerson, with erased edges counted as
+already fully grown, i.e. at zero cost. Clusters grow from the remaining
+defects until each is even or reaches the boundary, and the grown edges are
+peeled. With no Pauli errors nothing grows, and the decoder reduces to the
+erasure peeler.
+"""
+
+import threading
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .decoders import Decoder
+
+
+def sample_erasure_errors(rng: np.random.Generator, shots: int, n: int, p_erasure: float,
+                          p_flip: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Erasures plus independent flips.
+
+    Every qubit is erased with probability p_erasure, and an erased qubit
+    is flipped with probability 1/2. Other qubits flip with probability p_flip.
+
+    Returns:
+        (errors, erasures), uint8 and bool arrays of shape (shots, n)
+    """
+    erasures = rng.random((shots, n)) < p_erasure
+    coin = rng.random((shots, n))
+    errors = np.where(erasures, coin < 0.5, coin < p_flip).astype(np.uint8)
+    return errors, erasures
+
+
+def _graph(H: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Edge endpoints of a check matrix read as a graph, or None if some qubit
+    is in more than two checks. Vertex m is the boundary, the second endpoint
+    of qubits in a single check. Qubits in no check get (-1, -1).
+    """
+    m, n = H.shape
+    weights = H.sum(axis=0)
+    if (weights > 2).any():
+        return None
+    u = np.full(n, -1, dtype=np.int64)
+    v = np.full(n, -1, dtype=np.int64)
+    rows, cols = np.nonzero(H.T)  # rows = qubits, in order
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    u[rows[first]] = cols[first]
+    v[rows[~first]] = cols[~first]
+    v[(weights == 1)] = m
+    return u, v
+
+
+def _peel(edges: Sequence[int], lit: Sequence[int], u: Sequence[int], v: Sequence[int],
+          boundary: int) -> Tuple[List[int], bool]:
+    """
+    Peel a syndrome over a set of edges.
+
+    Args:
+        edges: Edge (qubit) ids the correction may use
+        lit: Lit vertices (checks)
+        u, v: Edge endpoints
+        boundary: The boundary vertex, which absorbs any parity
+
+    Returns:
+        (edges to flip, True if every lit vertex was explained)
+    """
+    adjacency: Dict[int, List[Tuple[int, int]]] = {}
+    for e in edges:
+        a, b = u[e], v[e]
+        if a < 0 or a == b:
+            continue
+        adjacency.setdefault(a, []).append((b, e))
+        adjacency.setdefault(b, []).append((a, e))
+    parity = set(lit)
+    visited = set()
+    parent: Dict[int, Tuple[int, int]] = {}
+    flips: List[int] = []
+    # Components touching the boundary are rooted there, so it absorbs their leftover parity
+    roots = ([boundary] if boundary in adjacency else []) + list(adjacency)
+    for root in roots:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack, discovered = [root], []
+        while stack:
+            x = stack.pop()
+            for y, e in adjacency[x]:
+                if y not in visited:
+                    visited.add(y)
+                    parent[y] = (x, e)
+                    discovered.append(y)
+                    stack.append(y)
+        # Reverse discovery order strips every vertex before its parent
+        for y in reversed(discovered):
+            if y in parity:
+                x, e = parent[y]
+                flips.append(e)
+                parity.discard(y)
+                parity.symmetric_difference_update((x,))
+    parity.discard(boundary)
+    return flips, not parity
+
+
+class ErasureDecoder(Decoder):
+    """
+    Corrections supported on the erased qubits, by peeling or a restricted GF(2) solve.
+
+    decode_batch(syndromes, erasures) returns (shots, n) corrections. Shots the
+    erasures cannot explain are decoded by the fallback (zeros without one).
+    """
+    name = "erasure"
+
+    def __init__(self, H: np.ndarray, fallback: Optional[Decoder] = None):
+        """
+        Args:
+            H: Binary check matrix (m, n)
+            fallback: Decoder for shots with errors outside the erasures
+        """
+        H = np.asarray(H, dtype=np.uint8) % 2
+        m, n = H.shape
+        super().__init__(n, m)
+        self.H = H
+        self.fallback = fallback
+        graph = _graph(H)
+        self.method = 'peel' if graph is not None else 'solve'
+        if graph is not None:
+            self._u, self._v = (endpoints.tolist() for endpoints in graph)
+        # Columns as Python integers (bit j = check j) for the restricted solve
+        self._columns = [int.from_bytes(np.packbits(column, bitorder='little').tobytes(), 'little')
+                         for column in H.T]
+
+    def _solve(self, lit: np.ndarray, erased: np.ndarray) -> Tuple[List[int], bool]:
+        """Solve H_E x = s with an XOR basis of the erased columns (pivot = top bit)."""
+        basis: Dict[int, Tuple[int, int]] = {}
+        for index, q in enumerate(erased):
+            vector, combo = self._columns[q], 1 << index
+            while vector:
+                top = vector.bit_length() - 1
+                if top not in basis:
+                    basis[top] = (vector, combo)
+                    break
+                vector ^= basis[top][0]
+                combo ^= basis[top][1]
+        target = sum(1 << int(j) for j in lit)
+        combo = 0
+        while target:
+            top = target.bit_length() - 1
+            if top not in basis:
+                return [], False
+            target ^= basis[top][0]
+            combo ^= basis[top][1]
+        return [int(erased[i]) for i in range(len(erased)) if (combo >> i) & 1], True
+
+    def solve(self, syndromes: np.ndarray, erasures: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Erasure-only corrections.
+
+        Args:
+            syndromes: Binary array (shots, m)
+            erasures: Boolean array (shots, n) of erased qubits
+
+        Returns:
+            (corrections, solved): (shots, n) uint8 and (shots,) bool, False where
+            the syndrome is not reproducible on the erased qubits
+        """
+        syndromes = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8)) & 1
+        erasures = np.atleast_2d(np.asarray(erasures, dtype=bool))
+        corrections = np.zeros((len(syndromes), self.n), dtype=np.uint8)
+        solved = np.ones(len(syndromes), dtype=bool)
+        for shot in range(len(syndromes)):
+            lit = np.flatnonzero(syndromes[shot])
+            erased = np.flatnonzero(erasures[shot])
+            if not len(lit):
+                continue
+            if self.method == 'peel':
+                flips, solved[shot] = _peel(erased.tolist(), lit.tolist(), self._u, self._v, self.m)
+            else:
+                flips, solved[shot] = self._solve(lit, erased)
+            if solved[shot]:
+                np.bitwise_xor.at(corrections[shot], flips, 1)
+        return corrections, solved
+
+    def decode_batch(self, syndromes: np.ndarray, erasures: Optional[np.ndarray] = None) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8)) & 1
+        if erasures is None:
+            erasures = np.zeros((len(syndromes), self.n), dtype=bool)
+        corrections, solved = self.solve(syndromes, erasures)
+        if self.fallback is not None and not solved.all():
+            corrections[~solved] = self.fallback.decode_batch(syndromes[~solved])
+        return corrections
+
+
+class UnionFindDecoder(Decoder):
+    """
+    Union-find decoder for graph-like check matrices, with zero-cost erasures.
+
+    decode_batch(syndromes, erasures=None) returns (shots, n) corrections that
+    always reproduce the syndrome.
+    """
+    name = "union_find"
+
+    def __init__(self, H: np.ndarray):
+        """
+        Args:
+            H: Binary check matrix (m, n) with at most two checks per qubit
+
+        Raises:
+            ValueError: If some qubit is in more than two checks
+        """
+        H = np.asarray(H, dtype=np.uint8) % 2
+        m, n = H.shape
+        super().__init__(n, m)
+        graph = _graph(H)
+        if graph is None:
+            raise ValueError("Union-find decoding needs every qubit in at most two checks.")
+        self.H = H
+        self._u, self._v = (endpoints.tolist() for endpoints in graph)
+        self._incident: List[List[int]] = [[] for _ in range(m + 1)]
+        for e, (a, b) in enumerate(zip(self._u, self._v)):
+            if a >= 0 and a != b:
+                self._incident[a].append(e)
+                self._incident[b].append(e)
+        self._local = threading.local()
+
+    def _state(self) -> Tuple[list, list, list, list, list]:
+        """This thread's cluster arrays, allocated once and reset after each shot."""
+        state = getattr(self._local, 'state', None)
+        if state is None:
+            m = self.m
+            state = (list(range(m + 1)), [0] * (m + 1), [False] * m + [True], [None] * (m + 1), [0] * self.n)
+            self._local.state = state
+        return state
+
+    def _decode(self, lit: List[int], erased: List[int]) -> List[int]:
+        m, u, v = self.m, self._u, self._v
+        # Members are listed only once a vertex joins a cluster (None = itself alone)
+        parent, parity, on_boundary, members, support = self._state()
+        touched, grown_edges = list(lit), []
+        for x in lit:
+            parity[x] = 1
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(a: int, b: int):
+            touched.append(a)
+            touched.append(b)
+            a, b = find(a), find(b)
+            if a == b:
+                return
+            size_a = 1 if members[a] is None else len(members[a])
+            size_b = 1 if members[b] is None else len(members[b])
+            if size_a < size_b:
+                a, b = b, a
+            parent[b] = a
+            if members[a] is None:
+                members[a] = [a]
+            members[a].extend([b] if members[b] is None else members[b])
+            members[b] = []
+            parity[a] ^= parity[b]
+            on_boundary[a] = on_boundary[a] or on_boundary[b]
+
+        try:
+            grown = []
+            for e in erased:
+                if u[e] >= 0:
+                    support[e] = 2
+                    grown_edges.append(e)
+                    grown.append(e)
+                    union(u[e], v[e])
+
+            active = {r for r in map(find, lit) if parity[r] and not on_boundary[r]}
+            while active:
+                # Every odd cluster grows all of its boundary edges by half an edge
+                fusion = []
+                for root in active:
+                    for x in members[root] or (root,):
+                        for e in self._incident[x]:
+                            if support[e] < 2:
+                                if not support[e]:
+                                    grown_edges.append(e)
+                                support[e] += 1
+                                if support[e] == 2:
+                                    fusion.append(e)
+                for e in fusion:
+                    grown.append(e)
+                    union(u[e], v[e])
+                active = {r for r in map(find, active) if parity[r] and not on_boundary[r]}
+
+            flips, _ = _peel(grown, lit, u, v, m)
+            return flips
+        finally:
+            # Only the entries this shot touched are reset, so a shot never costs O(m)
+            for x in touched:
+                parent[x] = x
+                parity[x] = 0
+                on_boundary[x] = x == m
+                members[x] = None
+            for e in grown_edges:
+                support[e] = 0
+
+    def decode_batch(self, syndromes: np.ndarray, erasures: Optional[np.ndarray] = None) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8)) & 1
+        corrections = np.zeros((len(syndromes), self.n), dtype=np.uint8)
+        for shot in range(len(syndromes)):
+            lit = np.flatnonzero(syndromes[shot]).tolist()
+            if not lit:
+                continue
+            erased = [] if erasures is None else np.flatnonzero(erasures[shot]).tolist()
+            np.bitwise_xor.at(corrections[shot], self._decode(lit, erased), 1)
+        return corrections
@@ -0,0 +1,254 @@
+"""
+Minimum-weight logical operator search and decoder failure search.
+
+These routines back the adversarial "Player vs. Decoder" mode (roadmap
+section 4.2) and let code distances be verified instead of hard-coded.
+
+Conventions (CSS, bit-flip component):
+    H_detect: checks that detect the errors being searched (Hz for X errors)
+    H_stab:   stabilizers that act trivially (Hx for X errors), or None for a
+              classical code, where every nonzero codeword is a logical
+
+An error pattern is undetectable if H_detect @ e = 0, and it is a nontrivial
+logical operator if it is also outside the row space of H_stab.
+"""
+
+import numpy as np
+from itertools import combinations
+from math import comb
+from typing import Callable, Dict, Optional
+
+from ..utils import gf2
+from .decoders import Decoder
+
+# Exhaustive enumeration is used while 2^dim(kernel) * words stays below this
+EXHAUSTIVE_BUDGET = 1 << 22
+
+_logical_cache: Dict[str, 'LogicalSearchResult'] = {}
+
+
+class LogicalSearchResult:
+    """Outcome of a minimum-weight logical operator search."""
+
+    def __init__(self, weight: int, operator: np.ndarray, exact: bool,
+                 undetectable: np.ndarray, iterations: int):
+        """
+        Args:
+            weight: Lowest logical operator weight found (upper bound on distance)
+            operator: A logical operator of that weight (uint8 vector)
+            exact: True if the search was exhaustive, so weight is the distance
+            undetectable: Distinct minimum-weight logical operators found, one per row
+            iterations: Number of information sets tried (0 when exhaustive)
+        """
+        self.weight = weight
+        self.operator = operator
+        self.exact = exact
+        self.undetectable = undetectable
+        self.iterations = iterations
+
+    def __repr__(self):
+        kind = "exact" if self.exact else "upper bound"
+        return f"LogicalSearchResult(weight={self.weight} ({kind}), found={len(self.undetectable)})"
+
+
+def logical_tester(H_stab: Optional[np.ndarray], H_detect: np.ndarray, n: int) -> Callable:
+    """
+    Return a function flagging which packed kernel vectors are nontrivial logicals.
+
+    Args:
+        H_stab: Stabilizer matrix (None for classical codes)
+        H_detect: Binary check matrix (m, n)
+        n: Number of bits
+
+    Returns:
+        is_logical(packed) -> bool array, for rows packed with gf2.pack_rows
+    """
+    if H_stab is None or np.asarray(H_stab).size == 0:
+        return lambda packed: gf2.popcount_rows(packed) > 0
+    # x in ker(H_detect) is trivial iff it commutes with every conjugate logical
+    conjugate = gf2.complement_basis(H_detect, gf2.nullspace(H_stab, n))
+    packed_conjugate = gf2.pack_rows(conjugate)
+    return lambda packed: gf2.parity_products(packed, packed_conjugate).any(axis=1)
+
+
+def _collect_minimum(candidates: np.ndarray, is_logical, best_weight: int):
+    """Return (weight, rows) of the lightest nontrivial logicals among candidates."""
+    weights = gf2.popcount_rows(candidates)
+    keep = (weights > 0) & (weights <= best_weight)
+    if not keep.any():
+        return best_weight, None
+    candidates, weights = candidates[keep], weights[keep]
+    for w in np.unique(weights):
+        rows = candidates[weights == w]
+        logical = rows[is_logical(rows)]
+        if len(logical):
+            return int(w), logical
+    return best_weight, None
+
+
+def find_min_weight_logical(H_detect: np.ndarray, H_stab: Optional[np.ndarray] = None,
+                            iterations: int = 100, p: Optional[int] = None,
+                            seed: Optional[int] = None,
+                            use_cache: bool = True) -> LogicalSearchResult:
+    """
+    Find a minimum-weight logical operator / undetectable error pattern.
+
+    Small kernels are enumerated exhaustively (exact result). Otherwise a
+    randomized information-set search (Lee-Brickell with p <= 2) runs on the
+    packed generator matrix of ker(H_detect) and returns an upper bound.
+
+    Args:
+        H_detect: Binary check matrix (m, n) that must not detect the operator
+        H_stab: Stabilizer matrix modulo which operators are trivial (None for classical codes)
+        iterations: Number of random information sets to try
+        p: Lee-Brickell parameter (1 or 2); default picks 2 when affordable
+        seed: Random seed for the information-set permutations
+        use_cache: Memoize the result per (H_detect, H_stab) hash
+
+    Returns:
+        LogicalSearchResult
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    n = H_detect.shape[1]
+    key = gf2.matrix_key(H_detect, H_stab) + f":{iterations}:{p}:{seed}"
+    if use_cache and key in _logical_cache:
+        return _logical_cache[key]
+
+    generators = gf2.nullspace(H_detect, n)
+    r = len(generators)
+    if r == 0:
+        raise ValueError("The check matrix has a trivial kernel: no logical operators exist.")
+    packed = gf2.pack_rows(generators)
+    words = packed.shape[1]
+    is_logical = logical_tester(H_stab, H_detect, n)
+
+    best_weight, best_rows = n + 1, None
+    if (1 << r) * words <= EXHAUSTIVE_BUDGET:
+        # Build every kernel vector by doubling: span(g_0..g_i) = S ∪ (S ^ g_i)
+        span = np.zeros((1, words), dtype=np.uint64)
+        for row in packed:
+            span = np.vstack([span, span ^ row])
+        best_weight, best_rows = _collect_minimum(span, is_logical, best_weight)
+        exact, tried = True, 0
+    else:
+        rng = np.random.default_rng(seed)
+        p = (2 if r <= 1024 else 1) if p is None else p
+        pairs = np.array(list(combinations(range(r), 2)), dtype=np.intp) if p >= 2 else None
+        found = []
+        for _ in range(iterations):
+            reduced, _ = gf2.row_reduce(packed, n, columns=rng.permutation(n))
+            candidates = reduced
+            if pairs is not None:
+                candidates = np.vstack([reduced, reduced[pairs[:, 0]] ^ reduced[pairs[:, 1]]])
+            weight, rows = _collect_minimum(candidates, is_logical, best_weight)
+            if rows is None:
+                continue
+            if weight < best_weight:
+                best_weight, found = weight, [rows]
+            else:
+                found.append(rows)
+        best_rows = np.unique(np.vstack(found), axis=0) if found else None
+        exact, tried = False, iterations
+
+    if best_rows is None:
+        raise ValueError("No nontrivial logical operator found; the code encodes no qubits.")
+    undetectable = gf2.unpack_rows(best_rows, n)
+    result = LogicalSearchResult(best_weight, undetectable[0], exact, undetectable, tried)
+    if use_cache:
+        _logical_cache[key] = result
+    return result
+
+
+def decoder_fails(decoder: Decoder, H_detect: np.ndarray, errors: np.ndarray,
+                  H_stab: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Check which error patterns a decoder fails to correct.
+
+    A decoder fails when the residual (error + correction) still has a nonzero
+    syndrome or is a nontrivial logical operator.
+
+    Args:
+        decoder: Batch decoder for H_detect
+        H_detect: Binary check matrix (m, n)
+        errors: Binary array of shape (shots, n)
+        H_stab: Stabilizer matrix (None for classical codes)
+
+    Returns:
+        Boolean array of shape (shots,)
+    """
+    return failure_checker(decoder, H_detect, H_stab)(np.asarray(errors, dtype=np.uint8))
+
+
+def failure_checker(decoder: Decoder, H_detect: np.ndarray,
+                    H_stab: Optional[np.ndarray] = None) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    decoder_fails with the logical test built once, for repeated batches.
+
+    Args:
+        decoder: Batch decoder for H_detect
+        H_detect: Binary check matrix (m, n)
+        H_stab: Stabilizer matrix (None for classical codes)
+
+    Returns:
+        fails(errors) -> boolean array of shape (shots,), for errors of shape (shots, n)
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    is_logical = logical_tester(H_stab, H_detect, H_detect.shape[1])
+    return lambda errors: _decoder_fails(decoder, H_detect, errors, is_logical)
+
+
+def _decoder_fails(decoder: Decoder, H_detect: np.ndarray, errors: np.ndarray,
+                   is_logical) -> np.ndarray:
+    syndromes = (errors @ H_detect.T) % 2
+    residual = errors ^ decoder.decode_batch(syndromes)
+    detected = ((residual @ H_detect.T) % 2).any(axis=1)
+    return detected | is_logical(gf2.pack_rows(residual))
+
+
+def find_decoder_failure(decoder: Decoder, H_detect: np.ndarray,
+                         H_stab: Optional[np.ndarray] = None,
+                         max_weight: Optional[int] = None,
+                         exhaustive_limit: int = 200_000,
+                         samples: int = 20_000,
+                         seed: Optional[int] = None) -> Optional[Dict]:
+    """
+    Find the cheapest error pattern that fools a decoder.
+
+    Weights are tried in increasing order. A weight is enumerated exhaustively
+    when it has at most exhaustive_limit patterns; otherwise subsets of the
+    minimum-weight logical operators (the usual failure mechanism) and random
+    patterns are sampled.
+
+    Returns:
+        Dictionary with 'error', 'weight' and 'exact' (True if every lighter
+        pattern was ruled out), or None if no failure was found
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    n = H_detect.shape[1]
+    rng = np.random.default_rng(seed)
+    max_weight = n if max_weight is None else min(max_weight, n)
+    is_logical = logical_tester(H_stab, H_detect, n)
+    logicals = None
+    exact = True
+
+    for weight in range(1, max_weight + 1):
+        if comb(n, weight) <= exhaustive_limit:
+            supports = np.array(list(combinations(range(n), weight)), dtype=np.intp)
+        else:
+            exact = False
+            if logicals is None:
+                logicals = find_min_weight_logical(H_detect, H_stab, seed=seed).undetectable
+            pool = []
+            for logical in logicals:
+                support = np.flatnonzero(logical)
+                if len(support) >= weight:
+                    picks = np.argsort(rng.random((max(1, samples // len(logicals)), len(support))), axis=1)
+                    pool.append(support[picks[:, :weight]])
+            pool.append(np.argsort(rng.random((samples, n)), axis=1)[:, :weight])
+            supports = np.vstack(pool)
+        errors = np.zeros((len(supports), n), dtype=np.uint8)
+        errors[np.arange(len(supports))[:, None], supports] = 1
+        failed = np.flatnonzero(_decoder_fails(decoder, H_detect, errors, is_logical))
+        if failed.size:
+            return {'error': errors[failed[0]], 'weight': weight, 'exact': exact}
+    return None
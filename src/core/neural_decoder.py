@@ -0,0 +1,349 @@
+"""
+Feed-forward neural decoder trained and served with NumPy on the CPU.
+
+Lookup tables need 2^m entries, and matching slows down as defects
+multiply. A small multilayer perceptron decodes at a fixed cost per shot
+instead: a few dense matrix multiplies, whatever the syndrome.
+
+The network does not output a correction bit by bit. It predicts the
+logical class of the error, i.e. the flips y = O e of a basis O of
+conjugate logical operators (2^k classes, softmax). The correction is then
+assembled exactly:
+
+    c = pure(s) + rep(y + O pure(s))
+
+pure(s) is a fixed linear solution of H c = s (a GF(2) right inverse of
+the detecting checks), and rep(.) adds the logical representative of the
+remaining class. Every correction reproduces its syndrome. Only the
+logical class is learned, which is what decides success.
+
+Training uses Adam on minibatches streamed from a SyndromeDataset
+(core.datasets). save() writes every weight as its own .npy file, and
+load() memory-maps them, so that many worker processes share one copy.
+Inference runs in fixed-size blocks through preallocated per-thread
+activation buffers.
+
+Usage (train on a color code, compare with the table and matching decoders):
+    python -m src.core.neural_decoder --distance 5
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from ..utils import gf2
+from .datasets import SyndromeDataset, observable_matrix
+from .decoders import Decoder
+
+# Logical classes are enumerated explicitly (softmax over 2^k outputs)
+MAX_LOGICAL_BITS = 8
+
+# Rows pushed through the network per block (bounds the activation buffers)
+INFERENCE_BLOCK = 4096
+
+WEIGHTS_VERSION = 1
+
+
+def _pure_error_matrix(H: np.ndarray) -> np.ndarray:
+    """R (n, m) with H (R s) = s for every syndrome s in the column space of H."""
+    m, n = H.shape
+    R = np.zeros((n, m), dtype=np.uint8)
+    if not H.any():
+        return R
+    _, rows = gf2.row_reduce(gf2.pack_rows(H.T), m)  # independent checks
+    _, cols = gf2.row_reduce(gf2.pack_rows(H[rows]), n)  # pivot qubits
+    R[np.ix_(cols, rows)] = gf2.inverse(H[np.ix_(rows, cols)])
+    return R
+
+
+def _class_corrections(H_detect: np.ndarray, H_stab: Optional[np.ndarray],
+                       observables: np.ndarray) -> np.ndarray:
+    """(2^k, n) undetectable corrections whose observable flips are the bits of their index."""
+    k, n = observables.shape
+    table = np.zeros((1 << k, n), dtype=np.uint8)
+    if k == 0:
+        return table
+    logicals = gf2.complement_basis(H_stab, gf2.nullspace(H_detect, n))
+    overlap = (observables.astype(np.int64) @ logicals.T.astype(np.int64)) % 2
+    reps = (gf2.inverse(overlap).T.astype(np.int64) @ logicals.astype(np.int64)) % 2
+    for c in range(1, 1 << k):
+        low = (c & -c).bit_length() - 1
+        table[c] = table[c & (c - 1)] ^ reps[low]
+    return table
+
+
+class NeuralDecoder(Decoder):
+    """
+    MLP logical-class decoder with an exact syndrome-matching correction.
+
+    Attributes:
+        hidden: Widths of the hidden ReLU layers
+        weights, biases: float32 parameters, input layer first
+        observables: (k, n) observable matrix the classes refer to
+    """
+    name = "neural"
+
+    def __init__(self, H_detect: np.ndarray, H_stab: Optional[np.ndarray] = None,
+                 hidden: Sequence[int] = (128, 128), seed: Optional[int] = None,
+                 observables: Optional[np.ndarray] = None):
+        """
+        Args:
+            H_detect: Binary check matrix (m, n) producing the syndromes
+            H_stab: Stabilizer matrix (None for classical codes)
+            hidden: Hidden layer widths
+            seed: Seed of the weight initialization
+            observables: Observable matrix (default: observable_matrix(H_detect, H_stab),
+                         the one used by write_syndrome_dataset)
+        """
+        H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+        m, n = H_detect.shape
+        super().__init__(n, m)
+        self.H_detect = H_detect
+        self.H_stab = None if H_stab is None else np.asarray(H_stab, dtype=np.uint8) % 2
+        self.observables = (observable_matrix(H_detect, self.H_stab) if observables is None
+                            else np.asarray(observables, dtype=np.uint8) % 2)
+        k = len(self.observables)
+        if k > MAX_LOGICAL_BITS:
+            raise ValueError(f"{k} logical bits means 2^{k} classes; the limit is {MAX_LOGICAL_BITS}.")
+        self.k = k
+        self.hidden = [int(width) for width in hidden]
+        self.pure = _pure_error_matrix(H_detect)
+        self.class_corrections = _class_corrections(H_detect, self.H_stab, self.observables)
+        # Observable flips caused by the pure error of each syndrome bit, (m, k)
+        self._pure_flips = ((self.observables.astype(np.int64) @ self.pure.astype(np.int64)) % 2
+                            ).T.astype(np.int32)
+        self._bit_values = 1 << np.arange(k)
+
+        rng = np.random.default_rng(seed)
+        sizes = [m] + self.hidden + [1 << k]
+        # He initialization for the ReLU layers
+        self.weights = [(rng.standard_normal((a, b)) * np.sqrt(2.0 / a)).astype(np.float32)
+                        for a, b in zip(sizes[:-1], sizes[1:])]
+        self.biases = [np.zeros(b, dtype=np.float32) for b in sizes[1:]]
+        self._local = threading.local()
+
+    @classmethod
+    def for_code(cls, code, **kwargs) -> 'NeuralDecoder':
+        """Decoder for X errors on a code, with the check matrices of core.sweeps."""
+        from .sweeps import check_matrices
+        H_detect, H_stab = check_matrices(code)
+        return cls(H_detect, H_stab, **kwargs)
+
+    # --- Inference ---
+
+    def _buffers(self, rows: int) -> List[np.ndarray]:
+        """Per-thread layer outputs for rows syndromes, grown only when a larger batch arrives."""
+        buffers = getattr(self._local, 'buffers', None)
+        if buffers is None or buffers[0].shape[0] < rows:
+            buffers = [np.empty((rows, w.shape[1]), dtype=np.float32) for w in self.weights]
+            self._local.buffers = buffers
+        return [buffer[:rows] for buffer in buffers]
+
+    def predict_classes(self, syndromes: np.ndarray) -> np.ndarray:
+        """Most likely logical class (bit j = flip of observable j) of every syndrome."""
+        syndromes = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8))
+        classes = np.empty(len(syndromes), dtype=np.int64)
+        for start in range(0, len(syndromes), INFERENCE_BLOCK):
+            block = syndromes[start:start + INFERENCE_BLOCK]
+            buffers = self._buffers(min(INFERENCE_BLOCK, len(syndromes)))
+            activation = block.astype(np.float32)
+            for layer, (W, b) in enumerate(zip(self.weights, self.biases)):
+                out = buffers[layer][:len(block)]
+                np.matmul(activation, W, out=out)
+                out += b
+                if layer < len(self.weights) - 1:
+                    np.maximum(out, 0.0, out=out)
+                activation = out
+            classes[start:start + len(block)] = activation.argmax(axis=1)
+        return classes
+
+    def decode_batch(self, syndromes: np.ndarray) -> np.ndarray:
+        syndromes = np.atleast_2d(np.asarray(syndromes, dtype=np.uint8)) & 1
+        classes = self.predict_classes(syndromes)
+        pure = (syndromes.astype(np.int32) @ self.pure.T.astype(np.int32)) & 1
+        pure_classes = ((syndromes.astype(np.int32) @ self._pure_flips) & 1) @ self._bit_values
+        return pure.astype(np.uint8) ^ self.class_corrections[classes ^ pure_classes]
+
+    # --- Training ---
+
+    def _forward(self, x: np.ndarray):
+        activations = [x]
+        for layer, (W, b) in enumerate(zip(self.weights, self.biases)):
+            z = activations[-1] @ W + b
+            activations.append(np.maximum(z, 0.0) if layer < len(self.weights) - 1 else z)
+        return activations
+
+    def fit(self, dataset: SyndromeDataset, epochs: int = 5, batch_size: int = 512,
+            learning_rate: float = 1e-3, weight_decay: float = 0.0,
+            seed: Optional[int] = None, verbose: bool = False) -> List[Dict]:
+        """
+        Train on a dataset written by write_syndrome_dataset (for the same code).
+
+        Args:
+            dataset: Syndromes with their observable labels
+            epochs: Passes over the dataset (reshuffled every epoch)
+            batch_size: Minibatch size
+            learning_rate: Adam step size
+            weight_decay: L2 penalty on the weights
+            seed: Shuffle seed
+            verbose: Print the loss and accuracy of every epoch
+
+        Returns:
+            Per epoch: 'epoch', 'loss' and 'accuracy' (of the class prediction)
+
+        Raises:
+            ValueError: If the dataset was generated for another check matrix
+        """
+        if not np.array_equal(dataset.H_detect, self.H_detect) or \
+                not np.array_equal(dataset.observables, self.observables):
+            raise ValueError("Dataset was generated for a different code or observable basis.")
+        params = self.weights + self.biases
+        moments = [np.zeros_like(p) for p in params]
+        squares = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        step = 0
+        history = []
+        seeds = np.random.SeedSequence(seed).generate_state(epochs)
+        for epoch in range(epochs):
+            total_loss, correct, seen = 0.0, 0, 0
+            for batch in dataset.batches(batch_size, seed=int(seeds[epoch]), unpacked=True):
+                x = batch['syndromes'].astype(np.float32)
+                labels = batch['observables'].astype(np.int64) @ self._bit_values
+                activations = self._forward(x)
+                logits = activations[-1]
+                logits = logits - logits.max(axis=1, keepdims=True)
+                probabilities = np.exp(logits)
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+                rows = np.arange(len(x))
+                total_loss += float(-np.log(probabilities[rows, labels] + 1e-12).sum())
+                correct += int((probabilities.argmax(axis=1) == labels).sum())
+                seen += len(x)
+
+                # Backpropagation of the mean cross-entropy
+                delta = probabilities
+                delta[rows, labels] -= 1.0
+                delta /= len(x)
+                grads_W, grads_b = [None] * len(self.weights), [None] * len(self.weights)
+                for layer in range(len(self.weights) - 1, -1, -1):
+                    grads_W[layer] = activations[layer].T @ delta + weight_decay * self.weights[layer]
+                    grads_b[layer] = delta.sum(axis=0)
+                    if layer:
+                        delta = (delta @ self.weights[layer].T) * (activations[layer] > 0)
+
+                step += 1
+                correction = np.sqrt(1 - beta2 ** step) / (1 - beta1 ** step)
+                for p, g, mom, sq in zip(params, grads_W + grads_b, moments, squares):
+                    mom *= beta1
+                    mom += (1 - beta1) * g
+                    sq *= beta2
+                    sq += (1 - beta2) * g * g
+                    p -= (learning_rate * correction * mom / (np.sqrt(sq) + eps)).astype(np.float32)
+            history.append({'epoch': epoch, 'loss': total_loss / max(seen, 1),
+                            'accuracy': correct / max(seen, 1)})
+            if verbose:
+                print(f"epoch {epoch}: loss {history[-1]['loss']:.4f}  accuracy {history[-1]['accuracy']:.4f}")
+        return history
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """Write the parameters (one .npy per array) and the code matrices to a directory."""
+        os.makedirs(path, exist_ok=True)
+        arrays = {f'W{i}': W for i, W in enumerate(self.weights)}
+        arrays.update({f'b{i}': b for i, b in enumerate(self.biases)})
+        arrays['H_detect'] = self.H_detect
+        arrays['observables'] = self.observables
+        if self.H_stab is not None:
+            arrays['H_stab'] = self.H_stab
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f'{name}.npy'), np.ascontiguousarray(array))
+        with open(os.path.join(path, 'model.json'), 'w') as handle:
+            json.dump({'version': WEIGHTS_VERSION, 'hidden': self.hidden, 'arrays': sorted(arrays),
+                       'code_key': gf2.matrix_key(self.H_detect, self.observables)}, handle, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'NeuralDecoder':
+        """
+        Load a saved decoder; with mmap the weights are read-only views of the files.
+
+        Raises:
+            ValueError: If the files were written by another WEIGHTS_VERSION
+        """
+        with open(os.path.join(path, 'model.json')) as handle:
+            meta = json.load(handle)
+        if meta.get('version') != WEIGHTS_VERSION:
+            raise ValueError(f"{path} holds weights version {meta.get('version')}, expected {WEIGHTS_VERSION}.")
+        read = lambda name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+        H_stab = read('H_stab') if 'H_stab' in meta['arrays'] else None
+        decoder = cls(np.asarray(read('H_detect')), None if H_stab is None else np.asarray(H_stab),
+                      hidden=meta['hidden'], observables=np.asarray(read('observables')))
+        layers = len(meta['hidden']) + 1
+        decoder.weights = [read(f'W{i}') for i in range(layers)]
+        decoder.biases = [read(f'b{i}') for i in range(layers)]
+        return decoder
+
+
+def evaluate_decoder(decoder: Decoder, dataset: SyndromeDataset, batch_size: int = 1 << 16,
+                     limit: Optional[int] = None) -> Dict:
+    """
+    Logical error rate of any decoder on a labelled dataset.
+
+    A shot fails when the correction leaves a syndrome or flips an observable
+    relative to the error, the same criterion as logical_operators.decoder_fails.
+
+    Returns:
+        Dictionary with 'shots', 'failures' and 'rate'
+    """
+    O = dataset.observables.T.astype(np.int32)
+    H = dataset.H_detect.T.astype(np.int32)
+    shots = len(dataset) if limit is None else min(limit, len(dataset))
+    failures = 0
+    for start in range(0, shots, batch_size):
+        batch = dataset.read(start, min(shots, start + batch_size), unpacked=True)
+        residual = batch['errors'] ^ decoder.decode_batch(batch['syndromes'])
+        failures += int((((residual @ H) & 1).any(axis=1) | ((residual @ O) & 1).any(axis=1)).sum())
+    return {'shots': shots, 'failures': failures, 'rate': failures / max(shots, 1)}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ..codes.color import ColorCodeRestrictionDecoder, TriangularColorCode
+    from .datasets import write_syndrome_dataset
+    from .decoders import LookupTableDecoder
+    parser = argparse.ArgumentParser(description="Train a neural decoder on a color code and compare it.")
+    parser.add_argument('--distance', type=int, default=5)
+    parser.add_argument('--p', type=float, default=0.05)
+    parser.add_argument('--train', type=int, default=400_000)
+    parser.add_argument('--test', type=int, default=100_000)
+    parser.add_argument('--epochs', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    code = TriangularColorCode(args.distance)
+    with tempfile.TemporaryDirectory() as train_dir, tempfile.TemporaryDirectory() as test_dir:
+        write_syndrome_dataset(code, train_dir, args.train, p=args.p, seed=1)
+        write_syndrome_dataset(code, test_dir, args.test, p=args.p, seed=2)
+        neural = NeuralDecoder.for_code(code, hidden=(256, 256), seed=0)
+        start = time.perf_counter()
+        neural.fit(SyndromeDataset(train_dir), epochs=args.epochs, verbose=True)
+        print(f"trained in {time.perf_counter() - start:.1f} s\n")
+
+        test = SyndromeDataset(test_dir)
+        decoders = {'neural': neural, 'matching': ColorCodeRestrictionDecoder(code)}
+        if neural.m <= 20:
+            decoders['lookup'] = LookupTableDecoder(neural.H_detect)
+        syndromes = test.read(0, len(test), unpacked=True)['syndromes']
+        for name, decoder in decoders.items():
+            start = time.perf_counter()
+            decoder.decode_batch(syndromes)
+            rate = len(syndromes) / (time.perf_counter() - start)
+            result = evaluate_decoder(decoder, test)
+            print(f"{name:10s} logical error rate {result['rate']:.5f}   {rate:12.0f} shots/s")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,7 +1,10 @@
 import numpy as np
 from abc import ABC, abstractmethod
 import random
-from typing import List, Dict, Tuple
+from collections import deque
+from typing import Callable, List, Dict, Tuple
+
+from ..utils.instrumentation import INSTRUMENTS, timed
 
 # Constants for QEC Operations (reused)
 PAULI_I = np.array([[1, 0], [0, 1]], dtype=complex)
@@ -95,6 +98,22 @@ class QECGameEngine:
         
         self.probed_stabilizer_index = -1 # Tracks which stabilizer is currently being probed
 
+        # Structured events for the UI (replaces print side effects)
+        self.events: deque = deque(maxlen=1000)
+        self.listeners: List[Callable[[Dict], None]] = []
+
+    def add_listener(self, listener: Callable[[Dict], None]):
+        """Registers a callback that receives every engine event dictionary."""
+        self.listeners.append(listener)
+
+    def _emit(self, event_type: str, **fields):
+        event = {'event': event_type, **fields}
+        self.events.append(event)
+        for listener in self.listeners:
+            listener(event)
+        INSTRUMENTS.event(event)
+
+    @timed('sample')
     def introduce_error(self) -> str:
         # Clears previous error, applies new single Pauli error, and updates qubit object.
         for q in self.qubits: q.current_error_pauli = 'I'
@@ -103,6 +122,7 @@ class QECGameEngine:
         self.qubits[qubit_index].apply_pauli(error_type)
         return self.get_qubit_error_string()
 
+    @timed('syndrome')
     def get_current_syndrome_string(self) -> str:
         # Measures all stabilizers and returns their values as a single syndrome string.
         syndrome_values = []
@@ -127,7 +147,8 @@ class QECGameEngine:
         This method dictates what the UI should highlight.
         """
         if not (0 <= stab_index < len(self.stabilizers)):
-            print(f"Error: Stabilizer index {stab_index} is out of bounds.")
+            self._emit('probe_out_of_bounds', stabilizer=stab_index,
+                       n_stabilizers=len(self.stabilizers))
             self.probed_stabilizer_index = -1
             for q in self.qubits: q.is_probed = False
             return
@@ -136,9 +157,8 @@ class QECGameEngine:
         probed_stab = self.stabilizers[stab_index]
         qubits_involved = probed_stab.get_qubit_indices()
 
-        print(f"--- Probing Stabilizer S{stab_index} ({probed_stab.stype} type) ---")
-        print(f"Qubits involved (indices): {qubits_involved}")
-        print(f"Current measurement value: {'+1 (Satisfied)' if probed_stab.measured_value == 1 else '-1 (Violated)'}")
+        self._emit('probe', stabilizer=stab_index, stype=probed_stab.stype,
+                   qubits=qubits_involved, measured_value=probed_stab.measured_value)
         
         # Update the is_probed flag for visualization
         for i, q in enumerate(self.qubits):
@@ -164,10 +184,20 @@ class SteaneCode(QuantumCode):
         return np.zeros(2**7)
 
 # --- Example Game Play ---
+def print_event(event: Dict):
+    """Console renderer for engine events (what the UI would draw)."""
+    if event['event'] == 'probe_out_of_bounds':
+        print(f"Error: Stabilizer index {event['stabilizer']} is out of bounds.")
+    elif event['event'] == 'probe':
+        print(f"--- Probing Stabilizer S{event['stabilizer']} ({event['stype']} type) ---")
+        print(f"Qubits involved (indices): {event['qubits']}")
+        print(f"Current measurement value: {'+1 (Satisfied)' if event['measured_value'] == 1 else '-1 (Violated)'}")
+
 def run_steane_game_example_with_classes():
     print("--- QEC Engine: Steane Code Demonstration (Probing) ---")
     
     engine = QECGameEngine(SteaneCode())
+    engine.add_listener(print_event)
     
     # 1. Setup an error
     engine.introduce_error()
@@ -0,0 +1,238 @@
+"""
+Logical error rates far below what direct Monte Carlo can reach.
+
+Direct sampling at physical error rate p needs about 100 / P_L shots to see
+100 failures, i.e. 10^11 shots for P_L = 1e-9. Two estimators avoid that:
+
+Weight stratification
+    P_L(p) = sum_w C(n, w) p^w (1 - p)^(n - w) f_w, where f_w is the failure
+    probability of the decoder given an error of exactly weight w. Each f_w
+    is estimated once (exactly, by enumeration, when C(n, w) is small) and
+    reused for every p. Strata are independent and are sampled in parallel.
+    At low p only the first few weights matter, so about 10^5 shots per
+    weight reach 1e-9 and below.
+
+Multilevel splitting
+    Starting from a rate p_0 where direct sampling sees failures, P_L is
+    carried down a ladder p_0 > p_1 > ... > p_t with ratio estimates
+    P_L(p_{j+1}) / P_L(p_j) = E[(p_{j+1}/p_j)^|E| ((1-p_{j+1})/(1-p_j))^(n-|E|)],
+    the expectation taken over failing errors at p_j. Those are sampled by
+    Metropolis chains that are restricted to the failure set (Bravyi and
+    Vargo, "Simulation of rare events in quantum error correction"). This
+    also works for codes too large to stratify.
+
+Failures follow logical_operators.decoder_fails: the residual either has a
+nonzero syndrome or is a nontrivial logical operator.
+"""
+
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from math import comb, lgamma, log
+from typing import Dict, Optional, Sequence, Union
+
+from .decoders import Decoder
+from .logical_operators import failure_checker
+from .rounds import locations_to_errors, sample_fixed_weight
+
+# Error patterns decoded per call, bounding memory for large strata
+CHUNK_SHOTS = 1 << 16
+
+
+def binomial_weights(n: int, p: Union[float, Sequence[float]], max_weight: int) -> np.ndarray:
+    """
+    Probabilities C(n, w) p^w (1 - p)^(n - w) for w = 0..max_weight, computed in
+    log space so that tiny p and large n do not underflow.
+
+    Returns:
+        Array of shape (len(p), max_weight + 1), or (max_weight + 1,) for scalar p
+    """
+    scalar = np.ndim(p) == 0
+    p = np.atleast_1d(np.asarray(p, dtype=np.float64))
+    w = np.arange(max_weight + 1)
+    log_comb = np.array([lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1) for k in w])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_terms = log_comb + np.outer(np.log(p), w) + np.outer(np.log1p(-p), n - w)
+    weights = np.exp(np.nan_to_num(log_terms, nan=-np.inf))
+    return weights[0] if scalar else weights
+
+
+def _stratum(fails, n: int, weight: int, shots: int, seed: np.random.SeedSequence) -> Dict:
+    """Failure count of one weight stratum, enumerated exactly when it is small enough."""
+    if comb(n, weight) <= shots:
+        locations = np.array(list(combinations(range(n), weight)), dtype=np.intp).reshape(comb(n, weight), weight)
+        failures = int(fails(locations_to_errors(locations, n)).sum())
+        return {'weight': weight, 'shots': len(locations), 'failures': failures, 'exact': True}
+    rng = np.random.default_rng(seed)
+    failures = 0
+    for start in range(0, shots, CHUNK_SHOTS):
+        batch = min(CHUNK_SHOTS, shots - start)
+        locations = sample_fixed_weight(rng, batch, n, weight)
+        failures += int(fails(locations_to_errors(locations, n)).sum())
+    return {'weight': weight, 'shots': shots, 'failures': failures, 'exact': False}
+
+
+def stratified_failure_rate(decoder: Decoder, H_detect: np.ndarray,
+                            p: Union[float, Sequence[float]],
+                            H_stab: Optional[np.ndarray] = None,
+                            shots_per_weight: int = 100_000,
+                            max_weight: Optional[int] = None,
+                            tail_tolerance: float = 1e-3,
+                            workers: int = 4,
+                            seed: Optional[int] = None) -> Dict:
+    """
+    Logical error rate by weight stratification.
+
+    Args:
+        decoder: Batch decoder for H_detect
+        H_detect: Binary check matrix (m, n) detecting the sampled errors
+        p: Physical error rate(s); the strata are shared by all of them
+        H_stab: Stabilizer matrix (None for classical codes)
+        shots_per_weight: Samples per stratum; strata with at most this many
+                          patterns are enumerated exactly
+        max_weight: Largest stratum (default: stop once the mass of the
+                    remaining weights is below tail_tolerance times the
+                    estimate at every p)
+        tail_tolerance: Relative size of the neglected tail for the default max_weight
+        workers: Threads sampling strata concurrently (1 runs them inline)
+        seed: Seed; each stratum gets an independent child stream, so the result
+              does not depend on workers
+
+    Returns:
+        Dictionary with 'p', 'rate' (estimate per p), 'std_error', 'tail' (mass of
+        the weights above max_weight, an upper bound on their contribution),
+        'strata' (per-weight 'weight', 'shots', 'failures', 'exact', 'f') and
+        'total_shots'
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    n = H_detect.shape[1]
+    fails = failure_checker(decoder, H_detect, H_stab)
+    p_values = np.atleast_1d(np.asarray(p, dtype=np.float64))
+
+    limit = n if max_weight is None else min(max_weight, n)
+    full = binomial_weights(n, p_values, n)
+    tails = np.cumsum(full[:, ::-1], axis=1)[:, ::-1]
+
+    # Strata are sampled in waves of 'workers' weights. Without an explicit
+    # max_weight, sampling stops once the untouched tail is negligible next
+    # to the estimate at every p.
+    seeds = np.random.SeedSequence(seed).spawn(limit + 1)
+    run = lambda w: _stratum(fails, n, w, shots_per_weight, seeds[w])
+    strata = []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        while len(strata) <= limit:
+            wave = range(len(strata), min(limit, len(strata) + max(1, workers) - 1) + 1)
+            strata.extend(pool.map(run, wave) if workers > 1 else map(run, wave))
+            if max_weight is None and len(strata) <= n:
+                f = np.array([s['failures'] / s['shots'] for s in strata])
+                estimate = full[:, :len(strata)] @ f
+                if (estimate > 0).all() and (tails[:, len(strata)] <= tail_tolerance * estimate).all():
+                    break
+    max_weight = len(strata) - 1
+
+    f = np.array([s['failures'] / s['shots'] for s in strata])
+    variance = np.array([0.0 if s['exact'] else fw * (1 - fw) / s['shots'] for s, fw in zip(strata, f)])
+    for s, fw in zip(strata, f):
+        s['f'] = float(fw)
+    b = full[:, :max_weight + 1]
+    rate = b @ f
+    result = {
+        'p': p_values,
+        'rate': rate,
+        'std_error': np.sqrt((b ** 2) @ variance),
+        'tail': tails[:, max_weight + 1] if max_weight < n else np.zeros(len(p_values)),
+        'strata': strata,
+        'total_shots': int(sum(s['shots'] for s in strata)),
+    }
+    if np.ndim(p) == 0:
+        for key in ('p', 'rate', 'std_error', 'tail'):
+            result[key] = float(result[key][0])
+    return result
+
+
+def splitting_failure_rate(decoder: Decoder, H_detect: np.ndarray, p: float,
+                           H_stab: Optional[np.ndarray] = None,
+                           p_start: float = 0.1,
+                           step: float = 2.0,
+                           start_shots: int = 100_000,
+                           chains: int = 1000,
+                           steps: int = 200,
+                           burn_in: int = 50,
+                           seed: Optional[int] = None) -> Dict:
+    """
+    Logical error rate by multilevel splitting down a ladder of error rates.
+
+    Args:
+        decoder: Batch decoder for H_detect
+        H_detect: Binary check matrix (m, n) detecting the sampled errors
+        p: Target physical error rate (below p_start)
+        H_stab: Stabilizer matrix (None for classical codes)
+        p_start: Rate of the first level, estimated by direct sampling
+        step: Largest ratio between consecutive rates of the ladder
+        start_shots: Direct samples at p_start
+        chains: Metropolis chains run in parallel (vectorized) per level
+        steps: Recorded Metropolis sweeps per level
+        burn_in: Sweeps discarded after moving the chains to a new level
+        seed: Random seed
+
+    Returns:
+        Dictionary with 'p', 'rate', 'ladder' (the rates), 'rates' (estimate
+        at every rung), 'ratios' and 'start_failures'
+
+    Raises:
+        ValueError: If direct sampling at p_start finds no failure
+    """
+    H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+    n = H_detect.shape[1]
+    fails = failure_checker(decoder, H_detect, H_stab)
+    rng = np.random.default_rng(seed)
+    p_start = max(p_start, p)
+
+    failing = []
+    for start in range(0, start_shots, CHUNK_SHOTS):
+        errors = (rng.random((min(CHUNK_SHOTS, start_shots - start), n)) < p_start).astype(np.uint8)
+        failing.append(errors[fails(errors)])
+    failing = np.vstack(failing)
+    if not len(failing):
+        raise ValueError(f"No failures in {start_shots} shots at p_start={p_start}; raise p_start.")
+    rate = len(failing) / start_shots
+
+    levels = max(1, int(np.ceil(log(p_start / p) / log(step)))) if p < p_start else 0
+    ladder = p_start * (p / p_start) ** (np.arange(levels + 1) / max(levels, 1))
+    state = failing[rng.integers(0, len(failing), chains)]
+    rows = np.arange(chains)
+    rates, ratios = [rate], []
+
+    for current, lower in zip(ladder[:-1], ladder[1:]):
+        # Metropolis on the failure set with target (p/(1-p))^|E|. Half of the
+        # proposals flip one bit; the other half move one error to an empty
+        # position, which keeps the weight and lets chains leave failures that
+        # have no lighter failing neighbour.
+        odds = current / (1 - current)
+        weight_log = []
+        for sweep in range(burn_in + steps):
+            flips = rng.integers(0, n, chains)
+            keys = rng.random((chains, n))
+            occupied = np.where(state == 1, keys, -1).argmax(axis=1)
+            empty = np.where(state == 0, keys, -1).argmax(axis=1)
+            swap = (rng.random(chains) < 0.5) & (state[rows, occupied] == 1) & (state[rows, empty] == 0)
+            proposal = state.copy()
+            proposal[rows, np.where(swap, occupied, flips)] ^= 1
+            proposal[rows[swap], empty[swap]] ^= 1
+            # Adding a bit costs a factor odds, removing one gains 1/odds, a move is free
+            accept_prob = np.where(proposal[rows, flips] == 1, min(1.0, odds), min(1.0, 1 / odds))
+            accept = rng.random(chains) < np.where(swap, 1.0, accept_prob)
+            if accept.any():
+                accept[accept] = fails(proposal[accept])
+                state[accept] = proposal[accept]
+            if sweep >= burn_in:
+                weight_log.append(state.sum(axis=1))
+        weights = np.concatenate(weight_log).astype(np.float64)
+        ratio = float(np.mean(np.exp(weights * np.log(lower / current)
+                                     + (n - weights) * np.log1p(-lower) - (n - weights) * np.log1p(-current))))
+        ratios.append(ratio)
+        rate *= ratio
+        rates.append(rate)
+
+    return {'p': float(p), 'rate': rate, 'ladder': ladder, 'rates': np.array(rates),
+            'ratios': np.array(ratios), 'start_failures': len(failing)}
@@ -0,0 +1,117 @@
+"""
+Structure-of-arrays batches of game rounds.
+
+play_round() in the games returns one dictionary of small arrays per round.
+Bots and calibration runs play millions of rounds, so the games also expose
+play_rounds(count), which samples every round at once and returns a single
+RoundBatch of stacked arrays.
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+from .decoders import pack_bits
+
+
+class RoundBatch:
+    """A batch of game rounds stored as parallel arrays (row i is round i)."""
+
+    def __init__(self, errors: np.ndarray, syndromes: np.ndarray, locations: np.ndarray,
+                 extras: Optional[Dict[str, np.ndarray]] = None):
+        """
+        Args:
+            errors: uint8 array of shape (shots, n), the applied error patterns
+            syndromes: uint8 array of shape (shots, m)
+            locations: intp array of shape (shots, weight) with the error positions
+            extras: Optional game-specific arrays with a leading shots axis
+        """
+        self.errors = errors
+        self.syndromes = syndromes
+        self.locations = locations
+        # Packed syndromes, bit i -> 2**i (SteaneGame's 'syndrome_decimal')
+        self.syndrome_decimal = pack_bits(syndromes).astype(np.int64)
+        self.extras = extras or {}
+
+    def __len__(self) -> int:
+        return len(self.errors)
+
+    def __getitem__(self, index) -> 'RoundBatch':
+        """Slice or fancy-index the batch, keeping every array aligned."""
+        return RoundBatch(self.errors[index], self.syndromes[index], self.locations[index],
+                          {name: array[index] for name, array in self.extras.items()})
+
+    def round(self, i: int) -> Dict:
+        """Return round i in the single-round dictionary layout of play_round()."""
+        info = {
+            'error_vector': self.errors[i],
+            'true_locations': self.locations[i].tolist(),
+            'syndrome': self.syndromes[i],
+            'syndrome_decimal': int(self.syndrome_decimal[i]),
+        }
+        info.update({name: array[i] for name, array in self.extras.items()})
+        return info
+
+    def __repr__(self):
+        return (f"RoundBatch(shots={len(self)}, n={self.errors.shape[1]}, "
+                f"m={self.syndromes.shape[1]}, weight={self.locations.shape[1]})")
+
+
+def answered_batch(batch: Optional[RoundBatch], last_batch: Optional[RoundBatch]) -> RoundBatch:
+    """
+    The batch check_answers() scores: the one given, else the game's last batch.
+
+    Raises:
+        ValueError: If neither exists, i.e. play_rounds() was never called
+    """
+    batch = last_batch if batch is None else batch
+    if batch is None:
+        raise ValueError("No batch to check; call play_rounds first")
+    return batch
+
+
+def sample_fixed_weight(rng: np.random.Generator, shots: int, n: int,
+                        weight: int) -> np.ndarray:
+    """
+    Draw 'weight' distinct positions out of n for every shot.
+
+    Args:
+        rng: Random generator
+        shots: Number of rows
+        n: Number of positions
+        weight: Distinct positions per row (clipped to n)
+
+    Returns:
+        intp array of shape (shots, weight), each row in random order
+    """
+    weight = min(weight, n)
+    # The positions of the 'weight' smallest of n uniform keys form a uniform subset
+    order = np.argsort(rng.random((shots, n)), axis=1)
+    return order[:, :weight].astype(np.intp)
+
+
+def locations_to_errors(locations: np.ndarray, n: int) -> np.ndarray:
+    """Scatter (shots, weight) positions into a (shots, n) uint8 error array."""
+    errors = np.zeros((len(locations), n), dtype=np.uint8)
+    errors[np.arange(len(locations))[:, None], locations] = 1
+    return errors
+
+
+def guesses_to_masks(guesses, n: int) -> np.ndarray:
+    """
+    Convert a batch of guesses to boolean masks.
+
+    Args:
+        guesses: Array of shape (shots,) with one location per round, or
+                 (shots, k) with several; negative entries are padding
+        n: Number of positions
+
+    Returns:
+        Boolean array of shape (shots, n)
+    """
+    guesses = np.asarray(guesses, dtype=np.intp)
+    if guesses.ndim == 1:
+        guesses = guesses[:, None]
+    masks = np.zeros((len(guesses), n + 1), dtype=bool)
+    # Padding entries land in the spare last column, which is dropped
+    masks[np.arange(len(guesses))[:, None], np.where(guesses < 0, n, guesses)] = True
+    return masks[:, :n]
@@ -0,0 +1,249 @@
+"""
+Logical error rate sweeps over physical error rates, run locally or across nodes.
+
+A sweep is a list of SweepTask: one code, one decoder, one error rate and a
+chunk of shots with its own seed. The same tasks run under either backend:
+
+- 'local': a ProcessPoolExecutor on this machine;
+- 'directory': a DirectoryQueue in a shared directory, served by any number
+  of worker processes on any nodes that mount it:
+
+      python -m src.core.sweeps worker /shared/sweep-001
+
+So scaling out is the backend argument, not a rewrite. Tasks only carry
+import paths and JSON arguments, so workers rebuild the code and decoder
+themselves, once per process. Shot chunks of one error rate are merged
+into a single estimate at the end.
+
+Errors are i.i.d. X flips with probability p, detected by Hz and judged
+against Hx (see logical_operators.decoder_fails); codes without CSS
+matrices use H for both.
+"""
+
+import argparse
+import importlib
+import inspect
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+from ..utils.work_queue import DirectoryQueue
+from .logical_operators import failure_checker
+
+# Error patterns decoded per call inside a task
+CHUNK_SHOTS = 1 << 16
+
+# Per-process cache of built codes and decoders, keyed by their specs
+_built: Dict[str, object] = {}
+
+
+class SweepTask(NamedTuple):
+    """One chunk of shots at one error rate; JSON-serializable via _asdict()."""
+    task_id: str
+    code: str                # 'module:Class' (or factory)
+    code_args: Dict
+    decoder: str             # 'module:Class'; built from H_detect if its first parameter is H, else from the code
+    decoder_args: Dict
+    p: float
+    shots: int
+    seed: int
+
+
+def _import_path(target) -> str:
+    if isinstance(target, str):
+        return target
+    return f"{target.__module__}:{target.__qualname__}"
+
+
+def _resolve(path: str):
+    module, _, name = path.partition(':')
+    value = importlib.import_module(module)
+    for part in name.split('.'):
+        value = getattr(value, part)
+    return value
+
+
+def check_matrices(code):
+    """(H_detect, H_stab) for X errors: (Hz, Hx) of a CSS code, else (H, H)."""
+    css = code.get_css_matrices() if hasattr(code, 'get_css_matrices') else None
+    if css is not None:
+        Hx, Hz = css
+        return np.asarray(Hz, dtype=np.uint8) % 2, np.asarray(Hx, dtype=np.uint8) % 2
+    H = np.asarray(code.H, dtype=np.uint8) % 2
+    return H, H
+
+
+def _build(task: SweepTask):
+    """The task's code, check matrices and decoder, built once per process."""
+    key = repr((task.code, sorted(task.code_args.items()), task.decoder, sorted(task.decoder_args.items())))
+    if key not in _built:
+        code = _resolve(task.code)(**task.code_args)
+        H_detect, H_stab = check_matrices(code)
+        factory = _resolve(task.decoder)
+        first = next(iter(inspect.signature(factory).parameters), None)
+        decoder = factory(H_detect if first == 'H' else code, **task.decoder_args)
+        _built[key] = (H_detect, H_stab, decoder, failure_checker(decoder, H_detect, H_stab))
+    return _built[key]
+
+
+def run_task(task: Union[SweepTask, Dict]) -> Dict:
+    """
+    Sample and decode one task's shots.
+
+    Returns:
+        Dictionary with 'task_id', 'p', 'shots', 'failures' and 'seconds'
+    """
+    task = SweepTask(**task) if isinstance(task, dict) else task
+    start = time.perf_counter()
+    H_detect, _, _, fails = _build(task)
+    n = H_detect.shape[1]
+    rng = np.random.default_rng(task.seed)
+    failures = 0
+    for offset in range(0, task.shots, CHUNK_SHOTS):
+        errors = (rng.random((min(CHUNK_SHOTS, task.shots - offset), n)) < task.p).astype(np.uint8)
+        failures += int(fails(errors).sum())
+    return {'task_id': task.task_id, 'p': task.p, 'shots': task.shots, 'failures': failures,
+            'seconds': time.perf_counter() - start}
+
+
+def make_sweep(code, decoder, p_values: Sequence[float], shots: int,
+               code_args: Optional[Dict] = None, decoder_args: Optional[Dict] = None,
+               chunks: int = 1, seed: Optional[int] = None) -> List[SweepTask]:
+    """
+    Split a sweep into tasks.
+
+    Args:
+        code: Code class or factory, or its 'module:Class' path
+        decoder: Decoder class, or its 'module:Class' path
+        p_values: Physical error rates
+        shots: Shots per error rate
+        code_args: Keyword arguments of the code
+        decoder_args: Keyword arguments of the decoder (after the code or H)
+        chunks: Tasks per error rate, so that one rate can use several workers
+        seed: Seed; every task gets an independent child seed
+
+    Returns:
+        List of SweepTask
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(p_values) * chunks)
+    tasks = []
+    for i, p in enumerate(p_values):
+        for c in range(chunks):
+            chunk_shots = shots // chunks + (c < shots % chunks)
+            tasks.append(SweepTask(
+                task_id=f"p{i:03d}-c{c:04d}", code=_import_path(code), code_args=dict(code_args or {}),
+                decoder=_import_path(decoder), decoder_args=dict(decoder_args or {}),
+                p=float(p), shots=int(chunk_shots),
+                seed=int(seeds[i * chunks + c].generate_state(1, np.uint64)[0])))
+    return tasks
+
+
+def merge_results(results: Sequence[Dict]) -> Dict:
+    """
+    Merge per-task results into one estimate per error rate.
+
+    Returns:
+        Dictionary with arrays 'p', 'shots', 'failures', 'rate', 'std_error'
+        (sorted by p) and 'seconds' (total compute time of all tasks)
+    """
+    totals: Dict[float, List[int]] = {}
+    for result in results:
+        entry = totals.setdefault(float(result['p']), [0, 0])
+        entry[0] += int(result['shots'])
+        entry[1] += int(result['failures'])
+    p = np.array(sorted(totals))
+    shots = np.array([totals[x][0] for x in p], dtype=np.int64)
+    failures = np.array([totals[x][1] for x in p], dtype=np.int64)
+    rate = failures / np.maximum(shots, 1)
+    return {'p': p, 'shots': shots, 'failures': failures, 'rate': rate,
+            'std_error': np.sqrt(rate * (1 - rate) / np.maximum(shots, 1)),
+            'seconds': float(sum(result.get('seconds', 0.0) for result in results))}
+
+
+def run_worker(queue_dir: str, poll: float = 1.0, lease_timeout: float = 60.0,
+               heartbeat: float = 10.0) -> int:
+    """Serve a directory queue until its sweep is finished; returns tasks completed."""
+    queue = DirectoryQueue(queue_dir, lease_timeout=lease_timeout, heartbeat=heartbeat)
+    return queue.work(run_task, poll=poll)
+
+
+def run_sweep(tasks: Sequence[SweepTask], backend: str = 'local', workers: int = 4,
+              queue_dir: Optional[str] = None, poll: float = 1.0,
+              lease_timeout: float = 60.0, heartbeat: float = 10.0,
+              timeout: Optional[float] = None) -> Dict:
+    """
+    Run a sweep and merge its results.
+
+    Args:
+        tasks: Tasks from make_sweep
+        backend: 'local' (process pool) or 'directory' (shared-directory queue)
+        workers: Local worker processes; with 'directory' they join whatever
+                 workers other nodes run against queue_dir (0 only waits)
+        queue_dir: Shared directory for the 'directory' backend. Already
+                   finished tasks there are not rerun, so an interrupted sweep
+                   resumes
+        poll: Seconds between queue checks
+        lease_timeout: Seconds without a heartbeat before a task is reclaimed
+        heartbeat: Seconds between lease refreshes
+        timeout: Give up waiting for the directory queue after this many seconds
+
+    Returns:
+        merge_results() of all tasks, plus 'failed_tasks' (ids that kept raising)
+
+    Raises:
+        RuntimeError: If a local 'directory' worker process died before the queue finished
+    """
+    if backend == 'local':
+        with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(run_task, tasks))
+        return dict(merge_results(results), failed_tasks=[])
+    if backend != 'directory':
+        raise ValueError(f"Unknown backend {backend!r}; use 'local' or 'directory'.")
+    if queue_dir is None:
+        raise ValueError("The 'directory' backend needs a queue_dir.")
+
+    queue = DirectoryQueue(queue_dir, lease_timeout=lease_timeout, heartbeat=heartbeat)
+    queue.submit({task.task_id: task._asdict() for task in tasks})
+    if workers > 0:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_worker, queue_dir, poll, lease_timeout, heartbeat)
+                       for _ in range(workers)]
+
+            def check_workers():
+                for future in futures:
+                    if future.done() and future.exception() is not None:
+                        raise RuntimeError("A local sweep worker died; its leases expire after "
+                                           f"{lease_timeout} s.") from future.exception()
+
+            shards = queue.wait(poll, timeout, check=check_workers)
+    else:
+        shards = queue.wait(poll, timeout)
+    wanted = {task.task_id for task in tasks}
+    results = [shard for task_id, shard in shards.items() if task_id in wanted]
+    failed = sorted(wanted - {result['task_id'] for result in results})
+    return dict(merge_results(results), failed_tasks=failed)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a shared-directory sweep queue.")
+    sub = parser.add_subparsers(dest='command', required=True)
+    worker = sub.add_parser('worker', help='Run tasks from a queue directory until it is finished')
+    worker.add_argument('queue_dir')
+    worker.add_argument('--poll', type=float, default=1.0)
+    worker.add_argument('--lease-timeout', type=float, default=60.0)
+    worker.add_argument('--heartbeat', type=float, default=10.0)
+    status = sub.add_parser('status', help='Print task counts of a queue directory')
+    status.add_argument('queue_dir')
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        done = run_worker(args.queue_dir, args.poll, args.lease_timeout, args.heartbeat)
+        print(f"Completed {done} tasks.")
+    else:
+        print(DirectoryQueue(args.queue_dir).status())
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+"""
+Exact weight enumerators, MacWilliams transforms and analytic logical error
+curves for small codes.
+
+The weight distribution A_0..A_n of a binary linear code is counted by
+walking its 2^k codewords in Gray-code order: a table of the span of the
+first few basis rows is XORed with one running codeword, which changes by a
+single basis row per step. When the dual code is smaller, the dual is
+enumerated instead, and the MacWilliams identity
+B_j = (1 / |C|) sum_i A_i K_j(i), with K_j the Krawtchouk polynomials,
+recovers the code's distribution exactly.
+
+For a CSS code the X-type stabilizers form rowspace(Hx) and the undetectable
+X errors form ker(Hz). Their difference counts the logical operators of
+every weight. For any syndrome decoder (a lookup table by default), the
+errors it corrects are the cosets c + rowspace(H_stab) of its corrections c.
+Counting their weights gives the exact number F_w of failing weight-w errors.
+P_L(p) = sum_w F_w p^w (1 - p)^(n - w) then needs no simulation. These
+curves are the reference for the samplers in rare_events.
+
+Every enumerator is memoized per matrix hash.
+"""
+
+import numpy as np
+from math import comb
+from typing import Dict, Optional, Sequence, Union
+
+from ..utils import gf2
+from ..utils.kernels import gray_code_weights
+from .decoders import Decoder, LookupTableDecoder
+
+# Largest code dimension whose codewords are enumerated (2^k popcounts)
+MAX_ENUMERATION_DIM = 28
+
+# Basis rows expanded into the in-memory table; the rest are walked in Gray-code order
+TABLE_DIM = 16
+
+_enumerator_cache: Dict[str, object] = {}
+
+
+def clear_enumerator_cache():
+    """Forget all memoized weight enumerators and failure counts."""
+    _enumerator_cache.clear()
+
+
+def _as_counts(values) -> np.ndarray:
+    """Integer counts as int64 when they fit, else as exact Python integers."""
+    values = [int(v) for v in values]
+    if max(values, default=0) < 2 ** 62:
+        return np.array(values, dtype=np.int64)
+    return np.array(values, dtype=object)
+
+
+def _span_table(basis: np.ndarray) -> np.ndarray:
+    """All 2^len(basis) XOR combinations of packed rows (index bit i -> basis row i)."""
+    table = np.zeros((1, basis.shape[1]), dtype=np.uint64)
+    for row in basis:
+        table = np.concatenate([table, table ^ row])
+    return table
+
+
+def _basis(matrix: np.ndarray, n: int) -> np.ndarray:
+    """Packed basis of the row space of a binary matrix."""
+    matrix = np.atleast_2d(np.asarray(matrix)).astype(np.uint8) & 1
+    if matrix.size == 0:
+        return np.zeros((0, gf2.n_words(n)), dtype=np.uint64)
+    return gf2.row_reduce(gf2.pack_rows(matrix), n)[0]
+
+
+def _enumerate(basis: np.ndarray, n: int) -> np.ndarray:
+    """Weight distribution of the span of a packed basis, by Gray-code enumeration."""
+    k = len(basis)
+    if k > MAX_ENUMERATION_DIM:
+        raise ValueError(f"Enumerating 2^{k} codewords exceeds the limit of 2^{MAX_ENUMERATION_DIM}.")
+    return gray_code_weights(_span_table(basis[:TABLE_DIM]), np.ascontiguousarray(basis[TABLE_DIM:]), n)
+
+
+def macwilliams_transform(A: Sequence[int], n: Optional[int] = None) -> np.ndarray:
+    """
+    Weight distribution of the dual code from that of the code.
+
+    Args:
+        A: Weight distribution A_0..A_n of a binary linear code
+        n: Code length (default len(A) - 1)
+
+    Returns:
+        Exact weight distribution B_0..B_n of the dual code
+    """
+    A = [int(a) for a in A]
+    n = len(A) - 1 if n is None else n
+    size = sum(A)
+    B = []
+    for j in range(n + 1):
+        # Krawtchouk polynomial K_j(i) = sum_s (-1)^s C(i, s) C(n - i, j - s)
+        total = sum(a * sum((-1) ** s * comb(i, s) * comb(n - i, j - s) for s in range(j + 1))
+                    for i, a in enumerate(A) if a)
+        if total % size:
+            raise ValueError("Input is not the weight distribution of a linear code.")
+        B.append(total // size)
+    return _as_counts(B)
+
+
+def weight_enumerator(G: np.ndarray, n: Optional[int] = None) -> np.ndarray:
+    """
+    Weight distribution of the code spanned by the rows of G.
+
+    The code or its dual, whichever has the smaller dimension, is enumerated;
+    the dual's distribution is mapped back with the MacWilliams transform.
+
+    Args:
+        G: Binary matrix whose rows span the code (need not be independent)
+        n: Code length (default G.shape[1]; required when G has no rows)
+
+    Returns:
+        Counts A_0..A_n of codewords of every weight
+    """
+    G = np.atleast_2d(np.asarray(G)).astype(np.uint8) & 1
+    n = G.shape[1] if n is None else n
+    key = 'span:' + gf2.matrix_key(G.reshape(-1, n))
+    if key in _enumerator_cache:
+        return _enumerator_cache[key]
+    basis = _basis(G, n)
+    k = len(basis)
+    if k > n - k:
+        dual = gf2.nullspace(gf2.unpack_rows(basis, n), n)
+        result = macwilliams_transform(_enumerate(_basis(dual, n), n), n)
+    else:
+        result = _as_counts(_enumerate(basis, n))
+    _enumerator_cache[key] = result
+    return result
+
+
+def kernel_enumerator(H: np.ndarray) -> np.ndarray:
+    """Weight distribution of ker(H), the code with parity check matrix H."""
+    H = np.atleast_2d(np.asarray(H)).astype(np.uint8) & 1
+    return macwilliams_transform(weight_enumerator(H), H.shape[1])
+
+
+def css_enumerators(Hx: np.ndarray, Hz: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Stabilizer, normalizer and logical weight enumerators of a CSS code.
+
+    Returns:
+        Dictionary with, for X-type operators, 'stabilizer_x' (rowspace Hx),
+        'normalizer_x' (ker Hz) and 'logical_x' (their difference), the same
+        three for Z, and 'distance' (lightest logical of either type, or None)
+    """
+    Hx = np.atleast_2d(np.asarray(Hx)).astype(np.uint8) & 1
+    Hz = np.atleast_2d(np.asarray(Hz)).astype(np.uint8) & 1
+    result = {}
+    for kind, H_stab, H_detect in (('x', Hx, Hz), ('z', Hz, Hx)):
+        stabilizer = weight_enumerator(H_stab)
+        normalizer = kernel_enumerator(H_detect)
+        result[f'stabilizer_{kind}'] = stabilizer
+        result[f'normalizer_{kind}'] = normalizer
+        result[f'logical_{kind}'] = normalizer - stabilizer
+    weights = [w for kind in 'xz' for w in np.flatnonzero(result[f'logical_{kind}'])]
+    result['distance'] = int(min(weights)) if weights else None
+    return result
+
+
+def failure_counts(H_detect: np.ndarray, H_stab: Optional[np.ndarray] = None,
+                   decoder: Optional[Decoder] = None) -> np.ndarray:
+    """
+    Exact number of error patterns of every weight that a decoder fails on.
+
+    An error e is corrected when e + decoder(H e) lies in rowspace(H_stab)
+    (for classical codes: is zero). The corrected errors are thus the cosets
+    c + rowspace(H_stab) of the corrections c of all reachable syndromes.
+
+    Args:
+        H_detect: Binary check matrix (m, n) detecting the errors
+        H_stab: Stabilizer matrix (None for classical codes)
+        decoder: Any syndrome decoder for H_detect (default: LookupTableDecoder)
+
+    Returns:
+        Counts F_0..F_n of failing errors by weight
+    """
+    H_detect = np.atleast_2d(np.asarray(H_detect)).astype(np.uint8) & 1
+    n = H_detect.shape[1]
+    key = None
+    if decoder is None:
+        key = 'failures:' + gf2.matrix_key(H_detect, H_stab)
+        if key in _enumerator_cache:
+            return _enumerator_cache[key]
+        decoder = LookupTableDecoder(H_detect)
+
+    m = H_detect.shape[0]
+    syndrome_basis = _basis(H_detect.T, m)
+    stabilizers = _span_table(_basis(H_stab, n)) if H_stab is not None else np.zeros((1, gf2.n_words(n)), dtype=np.uint64)
+    if len(syndrome_basis) + int(np.log2(len(stabilizers))) > MAX_ENUMERATION_DIM:
+        raise ValueError("Too many syndromes times stabilizers to enumerate exactly.")
+
+    syndromes = gf2.unpack_rows(_span_table(syndrome_basis), m)
+    corrections = np.asarray(decoder.decode_batch(syndromes), dtype=np.uint8) & 1
+    # Corrections that do not reproduce their syndrome correct nothing
+    valid = ((corrections.astype(np.int64) @ H_detect.T) % 2 == syndromes).all(axis=1)
+    corrected = np.zeros(n + 1, dtype=np.int64)
+    for correction in gf2.pack_rows(corrections[valid]):
+        corrected += np.bincount(gf2.popcount_rows(stabilizers ^ correction), minlength=n + 1)
+
+    result = _as_counts([comb(n, w) - int(c) for w, c in enumerate(corrected)])
+    if key is not None:
+        _enumerator_cache[key] = result
+    return result
+
+
+def logical_error_curve(failures: Sequence[int], p: Union[float, Sequence[float]]) -> Union[float, np.ndarray]:
+    """
+    Exact logical error rate P_L(p) = sum_w F_w p^w (1 - p)^(n - w).
+
+    Args:
+        failures: Failing error counts F_0..F_n (from failure_counts)
+        p: Physical error rate(s)
+
+    Returns:
+        P_L for every p (a float for scalar p)
+    """
+    counts = np.array([float(f) for f in failures])
+    n = len(counts) - 1
+    w = np.arange(n + 1)
+    p_values = np.atleast_1d(np.asarray(p, dtype=np.float64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_terms = np.log(counts) + np.outer(np.log(p_values), w) + np.outer(np.log1p(-p_values), n - w)
+    rates = np.exp(np.nan_to_num(log_terms, nan=-np.inf)).sum(axis=1)
+    return float(rates[0]) if np.ndim(p) == 0 else rates
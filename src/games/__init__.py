@@ -2,4 +2,17 @@
 Game logic for quantum error correction puzzles and challenges.
 """
 
-__all__ = []
+from ..utils.lazy import lazy_exports
+
+# Exported name -> defining submodule, imported on first access (PEP 562)
+_EXPORTS = {
+    'SessionRecorder': '.analytics',
+    'SessionAnalysis': '.analytics',
+    'iter_session_chunks': '.analytics',
+    'analyze_sessions': '.analytics',
+    'BeatTheDecoderGame': '.adversarial',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
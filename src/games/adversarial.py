@@ -0,0 +1,90 @@
+"""
+Adversarial "Beat the Decoder" mode (roadmap section 4.2).
+
+The player plays the role of the noise: they choose a set of qubits to flip and
+win if the automatic decoder fails to correct it. The fewer qubits they need,
+the better the score; the cheapest failure found by find_decoder_failure and
+the minimum-weight logical operators are used as par scores.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from ..core.decoders import Decoder, LookupTableDecoder
+from ..core.logical_operators import find_decoder_failure, find_min_weight_logical, decoder_fails
+
+
+class BeatTheDecoderGame:
+    """
+    Player vs. Decoder game on any binary check matrix.
+
+    For CSS codes pass H_detect=Hz and H_stab=Hx to attack the X-error decoder.
+    """
+
+    def __init__(self, H_detect: np.ndarray, H_stab: Optional[np.ndarray] = None,
+                 decoder: Optional[Decoder] = None, seed: Optional[int] = None):
+        self.H_detect = np.asarray(H_detect, dtype=np.uint8) % 2
+        self.H_stab = H_stab
+        self.n = self.H_detect.shape[1]
+        self.decoder = decoder if decoder is not None else LookupTableDecoder(self.H_detect)
+        self.seed = seed
+        self.attempts = 0
+        self.wins = 0
+        self.best_weight: Optional[int] = None
+        self._par: Optional[Dict] = None
+
+    def par(self) -> Dict:
+        """
+        Reference scores for the current code and decoder.
+
+        Returns:
+            Dictionary with 'failure_weight' (cheapest known error that fools the
+            decoder), 'failure_error' and 'logical_weight' (minimum-weight logical)
+        """
+        if self._par is None:
+            failure = find_decoder_failure(self.decoder, self.H_detect, self.H_stab, seed=self.seed)
+            logical = find_min_weight_logical(self.H_detect, self.H_stab, seed=self.seed)
+            self._par = {
+                'failure_weight': None if failure is None else failure['weight'],
+                'failure_error': None if failure is None else failure['error'],
+                'logical_weight': logical.weight,
+            }
+        return self._par
+
+    def submit(self, locations: List[int]) -> Dict:
+        """
+        Apply the player's chosen error and let the decoder try to correct it.
+
+        Args:
+            locations: Qubit indices the player flips
+
+        Returns:
+            Dictionary with the syndrome, the decoder's correction and whether the player won
+        """
+        error = np.zeros(self.n, dtype=np.uint8)
+        error[list(locations)] = 1
+        syndrome = (self.H_detect @ error) % 2
+        correction = self.decoder.decode(syndrome)
+        won = bool(decoder_fails(self.decoder, self.H_detect, error[None, :], self.H_stab)[0])
+
+        self.attempts += 1
+        weight = int(error.sum())
+        if won:
+            self.wins += 1
+            if self.best_weight is None or weight < self.best_weight:
+                self.best_weight = weight
+
+        return {
+            'syndrome': syndrome,
+            'correction': correction,
+            'weight': weight,
+            'decoder_fooled': won,
+        }
+
+    def get_stats(self) -> Dict:
+        """Get game statistics."""
+        return {
+            'attempts': self.attempts,
+            'wins': self.wins,
+            'best_weight': self.best_weight,
+        }
@@ -0,0 +1,256 @@
+"""
+Decoder-vs-player analytics over recorded game sessions.
+
+Rounds played in SteaneGame / ReedMullerGame are recorded as chunks of flat
+arrays (one integer per syndrome, error set and guess). The analysis streams
+over those chunks, re-decodes every syndrome with each available decoder and
+accumulates per-syndrome statistics with vectorized group-bys keyed on the
+packed syndrome integer, so memory is bounded by the chunk size plus the
+number of distinct syndromes rather than by the number of rounds.
+"""
+
+import os
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from ..core.decoders import Decoder, pack_bits, unpack_bits
+
+# Default response-time histogram edges in seconds (log-spaced, 0.1s - 10min)
+DEFAULT_TIME_EDGES = np.concatenate([[0.0], np.logspace(-1, np.log10(600.0), 24)])
+
+ROUND_FIELDS = ('syndrome', 'true_mask', 'guess_mask', 'response_time')
+
+
+def locations_to_mask(locations: Union[None, int, Sequence[int]]) -> int:
+    """Convert a qubit index or list of indices into an integer bitmask."""
+    if locations is None:
+        return 0
+    if np.isscalar(locations):
+        locations = [locations]
+    mask = 0
+    for loc in locations:
+        mask |= 1 << int(loc)
+    return mask
+
+
+class SessionRecorder:
+    """
+    Records played rounds and flushes them to .npz chunk files.
+
+    Each chunk file holds the arrays named in ROUND_FIELDS:
+    packed syndromes, true error bitmasks, player guess bitmasks and
+    response times in seconds.
+    """
+
+    def __init__(self, directory: str, chunk_size: int = 100_000, prefix: str = "rounds"):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.prefix = prefix
+        self.files_written: List[str] = []
+        self._buffer: Dict[str, list] = {name: [] for name in ROUND_FIELDS}
+        os.makedirs(directory, exist_ok=True)
+
+    def record(self, round_info: Dict, guess: Union[None, int, Sequence[int]],
+               response_time: float):
+        """
+        Record one round.
+
+        Args:
+            round_info: Dictionary returned by a game's play_round()
+            guess: The player's guessed error location(s)
+            response_time: Seconds the player took to answer
+        """
+        self._buffer['syndrome'].append(int(pack_bits(np.asarray(round_info['syndrome']))))
+        self._buffer['true_mask'].append(locations_to_mask(round_info['true_locations']))
+        self._buffer['guess_mask'].append(locations_to_mask(guess))
+        self._buffer['response_time'].append(float(response_time))
+        if len(self._buffer['syndrome']) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> Optional[str]:
+        """Write buffered rounds to a new chunk file and return its path."""
+        if not self._buffer['syndrome']:
+            return None
+        path = os.path.join(self.directory,
+                            f"{self.prefix}-{len(self.files_written):05d}.npz")
+        np.savez(path,
+                 syndrome=np.array(self._buffer['syndrome'], dtype=np.uint64),
+                 true_mask=np.array(self._buffer['true_mask'], dtype=np.uint64),
+                 guess_mask=np.array(self._buffer['guess_mask'], dtype=np.uint64),
+                 response_time=np.array(self._buffer['response_time'], dtype=np.float32))
+        self.files_written.append(path)
+        self._buffer = {name: [] for name in ROUND_FIELDS}
+        return path
+
+
+def iter_session_chunks(paths: Iterable[str], chunk_size: int = 1_000_000) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Stream recorded rounds from chunk files in slices of at most chunk_size rounds.
+
+    Only one file is held in memory at a time.
+    """
+    for path in paths:
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in ROUND_FIELDS}
+        total = len(arrays['syndrome'])
+        for start in range(0, total, chunk_size):
+            yield {name: values[start:start + chunk_size] for name, values in arrays.items()}
+
+
+class SessionAnalysis:
+    """
+    Aggregate tables produced by analyze_sessions.
+
+    Per-syndrome columns are aligned with the sorted 'syndromes' array.
+    """
+
+    def __init__(self, decoder_names: List[str], time_edges: np.ndarray):
+        self.decoder_names = list(decoder_names)
+        self.time_edges = np.asarray(time_edges, dtype=np.float64)
+        self.syndromes = np.zeros(0, dtype=np.uint64)
+        self.columns: Dict[str, np.ndarray] = {
+            'rounds': np.zeros(0, dtype=np.int64),
+            'player_correct': np.zeros(0, dtype=np.int64),
+            'time_sum': np.zeros(0, dtype=np.float64),
+            'time_histogram': np.zeros((0, len(self.time_edges)), dtype=np.int64),
+        }
+        for name in self.decoder_names:
+            self.columns[f'{name}_agrees_player'] = np.zeros(0, dtype=np.int64)
+            self.columns[f'{name}_correct'] = np.zeros(0, dtype=np.int64)
+
+    def _merge(self, keys: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Add per-syndrome partial sums (keys sorted and unique) into the tables."""
+        merged = np.union1d(self.syndromes, keys)
+        if len(merged) != len(self.syndromes):
+            old_index = np.searchsorted(merged, self.syndromes)
+            for name, values in self.columns.items():
+                grown = np.zeros((len(merged),) + values.shape[1:], dtype=values.dtype)
+                grown[old_index] = values
+                self.columns[name] = grown
+            self.syndromes = merged
+        index = np.searchsorted(self.syndromes, keys)
+        for name, values in columns.items():
+            self.columns[name][index] += values
+
+    @property
+    def total_rounds(self) -> int:
+        return int(self.columns['rounds'].sum())
+
+    def player_accuracy(self) -> np.ndarray:
+        """Fraction of correct player answers for each syndrome."""
+        rounds = self.columns['rounds']
+        return self.columns['player_correct'] / np.maximum(rounds, 1)
+
+    def mean_response_time(self) -> np.ndarray:
+        """Mean time-to-answer for each syndrome."""
+        return self.columns['time_sum'] / np.maximum(self.columns['rounds'], 1)
+
+    def decoder_summary(self) -> Dict[str, Dict[str, float]]:
+        """Overall agreement-with-player and accuracy rate for each decoder."""
+        total = max(self.total_rounds, 1)
+        return {
+            name: {
+                'agreement_with_player': self.columns[f'{name}_agrees_player'].sum() / total,
+                'accuracy': self.columns[f'{name}_correct'].sum() / total,
+            }
+            for name in self.decoder_names
+        }
+
+    def write_tables(self, directory: str) -> List[str]:
+        """
+        Write the aggregate tables as CSV files.
+
+        Returns:
+            Paths of the files written
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+
+        per_syndrome = os.path.join(directory, 'per_syndrome.csv')
+        header = ['syndrome', 'rounds', 'player_accuracy', 'mean_response_time']
+        table = [self.syndromes, self.columns['rounds'],
+                 self.player_accuracy(), self.mean_response_time()]
+        # Integer columns stay exact (float64 holds counts up to 2^53); rates use %.6g
+        fmt = ['%d', '%d', '%.6g', '%.6g']
+        for name in self.decoder_names:
+            rounds = np.maximum(self.columns['rounds'], 1)
+            header += [f'{name}_agreement', f'{name}_accuracy']
+            table += [self.columns[f'{name}_agrees_player'] / rounds,
+                      self.columns[f'{name}_correct'] / rounds]
+            fmt += ['%.6g', '%.6g']
+        np.savetxt(per_syndrome, np.column_stack(table), delimiter=',',
+                   header=','.join(header), comments='', fmt=fmt)
+        paths.append(per_syndrome)
+
+        histogram = os.path.join(directory, 'response_time_histogram.csv')
+        bin_labels = [f'>={edge:.3g}s' for edge in self.time_edges]
+        np.savetxt(histogram,
+                   np.column_stack([self.syndromes.astype(np.int64),
+                                    self.columns['time_histogram']]),
+                   delimiter=',', header=','.join(['syndrome'] + bin_labels),
+                   comments='', fmt='%d')
+        paths.append(histogram)
+
+        summary = os.path.join(directory, 'decoder_summary.csv')
+        with open(summary, 'w') as handle:
+            handle.write('decoder,agreement_with_player,accuracy\n')
+            for name, stats in self.decoder_summary().items():
+                handle.write(f"{name},{stats['agreement_with_player']:.6g},{stats['accuracy']:.6g}\n")
+        paths.append(summary)
+        return paths
+
+
+def analyze_sessions(chunks: Iterable[Dict[str, np.ndarray]],
+                     decoders: Dict[str, Decoder],
+                     n_checks: int,
+                     time_edges: Optional[np.ndarray] = None) -> SessionAnalysis:
+    """
+    Re-decode recorded rounds and accumulate decoder-vs-player statistics.
+
+    Args:
+        chunks: Iterable of round chunks (see iter_session_chunks)
+        decoders: Decoders to compare, e.g. default_decoders(code)
+        n_checks: Number of syndrome bits of the recorded code
+        time_edges: Left edges of the response-time histogram bins
+
+    Returns:
+        SessionAnalysis with per-syndrome and per-decoder aggregates
+    """
+    edges = DEFAULT_TIME_EDGES if time_edges is None else np.asarray(time_edges)
+    analysis = SessionAnalysis(list(decoders), edges)
+    n_bins = len(edges)
+
+    for chunk in chunks:
+        syndromes = np.asarray(chunk['syndrome'], dtype=np.uint64)
+        if len(syndromes) == 0:
+            continue
+        true_mask = np.asarray(chunk['true_mask'], dtype=np.uint64)
+        guess_mask = np.asarray(chunk['guess_mask'], dtype=np.uint64)
+        times = np.asarray(chunk['response_time'], dtype=np.float64)
+
+        keys, inverse = np.unique(syndromes, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        n_keys = len(keys)
+
+        time_bin = np.clip(np.searchsorted(edges, times, side='right') - 1, 0, n_bins - 1)
+        columns = {
+            'rounds': np.bincount(inverse, minlength=n_keys),
+            'player_correct': np.bincount(inverse, weights=(guess_mask == true_mask),
+                                          minlength=n_keys).astype(np.int64),
+            'time_sum': np.bincount(inverse, weights=times, minlength=n_keys),
+            'time_histogram': np.bincount(inverse * n_bins + time_bin,
+                                          minlength=n_keys * n_bins).reshape(n_keys, n_bins),
+        }
+
+        # Decode each distinct syndrome once, then broadcast back to the rounds
+        syndrome_bits = unpack_bits(keys, n_checks)
+        for name, decoder in decoders.items():
+            correction_mask = pack_bits(decoder.decode_batch(syndrome_bits))[inverse]
+            columns[f'{name}_agrees_player'] = np.bincount(
+                inverse, weights=(correction_mask == guess_mask), minlength=n_keys).astype(np.int64)
+            columns[f'{name}_correct'] = np.bincount(
+                inverse, weights=(correction_mask == true_mask), minlength=n_keys).astype(np.int64)
+
+        analysis._merge(keys, columns)
+
+    return analysis
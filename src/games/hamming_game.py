@@ -1,6 +1,9 @@
 import random
 import numpy as np
 
+from ..core.rounds import RoundBatch, answered_batch, guesses_to_masks, locations_to_errors, sample_fixed_weight
+from ..utils.instrumentation import timed
+
 # --- Configuration ---
 # Hamming (7,4) Parity Check Matrix (H)
 # H is constructed such that its columns are the binary representations of 1 through 7.
@@ -13,11 +16,31 @@ H = np.array([
 
 # Map the 3-bit syndrome (p4, p2, p1) to the error position (1 to 7)
 # Note: P4 is the most significant bit in the standard representation.
+# Syndromes are computed in the order (p1, p2, p4), so they are reversed
+# before the lookup; the 1-based position is then int(s_p1 + 2 s_p2 + 4 s_p4),
+# the same value as RoundBatch.syndrome_decimal.
 SYNDROME_TO_ERROR = {
     '001': 1, '010': 2, '011': 3, '100': 4,
     '101': 5, '110': 6, '111': 7
 }
 
+# Generator matrix used by _encode: c = [m1, m2, m3, m4, p1, p2, p3]
+# Every row is in the kernel of H (and H_PUZZLE), so codewords have syndrome 000
+G = np.array([
+    [1, 0, 0, 0, 0, 1, 1],  # m1 -> c0, c5, c6
+    [0, 1, 0, 0, 1, 0, 1],  # m2 -> c1, c4, c6
+    [0, 0, 1, 0, 1, 1, 0],  # m3 -> c2, c4, c5
+    [0, 0, 0, 1, 1, 1, 1]   # m4 -> c3, c4, c5, c6
+], dtype=np.int8)
+
+# Check matrix used by calculate_syndrome, rows ordered (P1, P2, P4):
+# column j is the binary representation of position j + 1, least significant bit first
+H_PUZZLE = np.array([
+    [1, 0, 1, 0, 1, 0, 1],  # Row 0: P1 (checks positions 1, 3, 5, 7)
+    [0, 1, 1, 0, 0, 1, 1],  # Row 1: P2 (checks positions 2, 3, 6, 7)
+    [0, 0, 0, 1, 1, 1, 1]   # Row 2: P4 (checks positions 4, 5, 6, 7)
+], dtype=np.int8)
+
 class HammingGame:
     """
     A conceptual class for a Decodoku-style game using Hamming(7,4) codes.
@@ -30,6 +53,9 @@ class HammingGame:
         self.error_position = 0
         self.corrupted_codeword = []
         self._introduce_error()
+        self.score = 0
+        self.rounds_played = 0
+        self.last_batch = None
 
     def _generate_random_message(self):
         """Generates a 4-bit message (m4, m3, m2, m1)."""
@@ -66,15 +92,10 @@ class HammingGame:
         # Since the puzzle is about decoding a *received* word, we only need the H matrix.
         # Let's create a random *valid* codeword and then corrupt it.
         # c = [m1, m2, m3, m4, p1, p2, p3]
-        G = np.array([
-            [1, 0, 0, 0, 1, 1, 0],  # m1 -> c0, c4, c5
-            [0, 1, 0, 0, 1, 0, 1],  # m2 -> c1, c4, c6
-            [0, 0, 1, 0, 0, 1, 1],  # m3 -> c2, c5, c6
-            [0, 0, 0, 1, 1, 1, 1]   # m4 -> c3, c4, c5, c6
-        ], dtype=np.int8)
         codeword = np.dot(message, G) % 2
         return codeword
 
+    @timed('sample')
     def _introduce_error(self):
         """Randomly flips exactly one bit in the codeword."""
         self.corrupted_codeword = self.codeword.copy()
@@ -83,6 +104,7 @@ class HammingGame:
         # Flip the bit (XOR with 1)
         self.corrupted_codeword[self.error_position] ^= 1
 
+    @timed('syndrome')
     def calculate_syndrome(self, word):
         """
         Calculates the 3-bit syndrome for a 7-bit word (H @ word.T).
@@ -94,23 +116,58 @@ class HammingGame:
         # H rows are [p1 check, p2 check, p4 check] (by standard definition of column weights)
         # The lookup table uses the syndrome value (p4, p2, p1) for error location.
         # Since H is [p1, p2, p4] in this array, we read it as [s1, s2, s3].
-        # Let's adjust the H matrix definition to be [p4, p2, p1] for cleaner syndrome reading:
-        H_puzzle = np.array([
-            [1, 0, 1, 0, 1, 0, 1],  # Row 0: P4 (checks 3, 5, 7)
-            [0, 1, 1, 0, 0, 1, 1],  # Row 1: P2 (checks 2, 3, 6, 7)
-            [0, 0, 0, 1, 1, 1, 1]   # Row 2: P1 (checks 4, 5, 6, 7)
-        ], dtype=np.int8)
-        syndrome_vec = np.dot(H_puzzle, word) % 2
-        
-        # syndrome_vec is [s_p4, s_p2, s_p1]
+        # H_PUZZLE rows are [p1, p2, p4], the order play_rounds() uses too:
+        syndrome_vec = np.dot(H_PUZZLE, word) % 2
+
+        # syndrome_vec is [s_p1, s_p2, s_p4]
         syndrome_str = "".join(map(str, syndrome_vec))
         return syndrome_str
 
+    @timed('round')
+    def play_rounds(self, count, seed=None):
+        """
+        Generates many puzzles at once without prompting.
+
+        Each round draws a random 4-bit message, encodes it with G and flips one
+        random bit. The batch's 'syndromes' use the H_PUZZLE row order of
+        calculate_syndrome (p1, p2, p4), so batch.syndrome_decimal is the
+        1-based error position; 'messages', 'codewords' and 'received' words
+        are available in batch.extras.
+        """
+        rng = np.random.default_rng(seed)
+        messages = rng.integers(0, 2, size=(count, 4), dtype=np.int8)
+        codewords = (messages @ G) % 2
+        locations = sample_fixed_weight(rng, count, 7, 1)
+        errors = locations_to_errors(locations, 7)
+        received = codewords ^ errors
+        syndromes = ((received @ H_PUZZLE.T) % 2).astype(np.uint8)
+        batch = RoundBatch(errors, syndromes, locations, {
+            'messages': messages,
+            'codewords': codewords.astype(np.int8),
+            'received': received.astype(np.int8),
+        })
+        self.rounds_played += count
+        self.last_batch = batch
+        return batch
+
+    @timed('verify')
+    def check_answers(self, guesses, batch=None):
+        """
+        Scores a batch of guessed error indices (0-6) against the flipped bits.
+
+        Returns a boolean array with one entry per round. Raises ValueError
+        if no batch is given and play_rounds was never called.
+        """
+        batch = answered_batch(batch, self.last_batch)
+        correct = (guesses_to_masks(guesses, 7) == batch.errors.astype(bool)).all(axis=1)
+        self.score += int(correct.sum())
+        return correct
+
     def start_game(self):
         """Runs a single round of the Hamming Decodoku puzzle."""
         print("--- Hamming(7,4) Decodoku: Bit-Flip Challenge ---")
         print("\nYour Goal: Find the single error and fix it.")
-        print(f"H Matrix Rows: P4, P2, P1 checks (indices 0-6)")
+        print(f"H Matrix Rows: P1, P2, P4 checks (indices 0-6)")
 
         # 1. Show the corrupted codeword
         print("\n[RECEIVED CODEWORD (7 bits)]")
@@ -119,7 +176,7 @@ class HammingGame:
 
         # 2. Calculate and display the syndrome (the puzzle hint)
         syndrome = self.calculate_syndrome(self.corrupted_codeword)
-        print(f"\n[CALCULATED SYNDROME (P4, P2, P1)]: {syndrome}")
+        print(f"\n[CALCULATED SYNDROME (P1, P2, P4)]: {syndrome}")
 
         if syndrome == '000':
             print("Syndrome is 000. No error detected. (This shouldn't happen in the challenge mode!)")
@@ -135,7 +192,7 @@ class HammingGame:
                 # The index is the position - 1. E.g., error at '101' means pos 5, index 4.
                 # SYNDROME_TO_ERROR maps the syndrome string to the 1-based index (1 to 7).
                 # We need to convert this 1-based index to the 0-based array index (0 to 6).
-                error_pos_1based = SYNDROME_TO_ERROR.get(syndrome)
+                error_pos_1based = SYNDROME_TO_ERROR.get(syndrome[::-1])
                 correct_index = error_pos_1based - 1 if error_pos_1based else -1
                 
                 if player_guess == correct_index:
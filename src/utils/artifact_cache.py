@@ -0,0 +1,182 @@
+"""
+Content-addressed on-disk cache for derived code artifacts.
+
+Expensive construction products (sparse check matrices, lookup tables,
+decoding graphs, ...) are stored as raw .npy arrays under a directory named
+by the hash of (owner, parameters, version). Loading memory-maps the arrays,
+so a new process or worker attaches to a large table in milliseconds instead
+of rebuilding it. A small in-process LRU sits on top of the disk cache.
+
+The disk layer is opt-in: pass a directory explicitly or set the
+CODOQ_CACHE_DIR environment variable. Without one, only the in-process LRU
+is used.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+import numpy as np
+
+# Bump when the on-disk layout changes; owners carry their own versions too
+CACHE_FORMAT_VERSION = 1
+
+CACHE_DIR_ENV = 'CODOQ_CACHE_DIR'
+
+Artifacts = Dict[str, np.ndarray]
+
+
+class ArtifactCache:
+    """
+    Disk + memory cache of named numpy arrays keyed by (owner, params, version).
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 32,
+                 mmap: bool = True):
+        """
+        Args:
+            directory: Cache root (default: $CODOQ_CACHE_DIR, or memory-only if unset)
+            max_entries: Number of artifact sets kept in the in-process LRU
+            mmap: Memory-map arrays on load (read-only) instead of reading them
+        """
+        self.directory = directory if directory is not None else os.environ.get(CACHE_DIR_ENV)
+        self.max_entries = max_entries
+        self.mmap = mmap
+        self._memory: 'OrderedDict[str, Artifacts]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(owner: str, params: Dict, version: int = 1) -> str:
+        """Content address for an artifact set; params must be JSON-serializable."""
+        payload = json.dumps([CACHE_FORMAT_VERSION, owner, version, params],
+                             sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Optional[str]:
+        return os.path.join(self.directory, key[:2], key) if self.directory else None
+
+    def remember(self, key: str, artifacts: Artifacts):
+        """
+        Insert artifacts into the in-process LRU only, under an existing cache key.
+
+        Nothing is written to disk; used to pre-fill a cache with arrays that
+        live elsewhere, such as views onto a shared memory block.
+        """
+        with self._lock:
+            self._memory[key] = artifacts
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, owner: str, params: Dict, version: int = 1) -> Optional[Artifacts]:
+        """Return cached artifacts or None."""
+        key = self.key(owner, params, version)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+        path = self._path(key)
+        if path is None or not os.path.isfile(os.path.join(path, 'meta.json')):
+            with self._lock:
+                self.misses += 1
+            return None
+        with open(os.path.join(path, 'meta.json')) as handle:
+            names = json.load(handle)['arrays']
+        mode = 'r' if self.mmap else None
+        artifacts = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode=mode)
+                     for name in names}
+        with self._lock:
+            self.disk_hits += 1
+        self.remember(key, artifacts)
+        return artifacts
+
+    def put(self, owner: str, params: Dict, artifacts: Artifacts, version: int = 1) -> Artifacts:
+        """
+        Store artifacts. The directory is written under a temporary name and
+        renamed into place, so concurrent readers never see partial entries.
+        """
+        key = self.key(owner, params, version)
+        artifacts = {name: np.asarray(array) for name, array in artifacts.items()}
+        path = self._path(key)
+        if path is not None and not os.path.isdir(path):
+            parent = os.path.dirname(path)
+            os.makedirs(parent, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=f'.{key}-', dir=parent)
+            for name, array in artifacts.items():
+                np.save(os.path.join(staging, f'{name}.npy'), array)
+            with open(os.path.join(staging, 'meta.json'), 'w') as handle:
+                json.dump({'owner': owner, 'params': params, 'version': version,
+                           'arrays': sorted(artifacts)}, handle, default=str)
+            try:
+                os.rename(staging, path)
+            except OSError:
+                # Another process published the same entry first
+                shutil.rmtree(staging, ignore_errors=True)
+        self.remember(key, artifacts)
+        return artifacts
+
+    def get_or_build(self, owner: str, params: Dict, build: Callable[[], Artifacts],
+                     version: int = 1) -> Artifacts:
+        """Return cached artifacts, building and storing them on a miss."""
+        artifacts = self.get(owner, params, version)
+        if artifacts is None:
+            artifacts = self.put(owner, params, build(), version)
+        return artifacts
+
+    def memory_entries(self, keys: Optional[Iterable[str]] = None) -> Dict[str, Artifacts]:
+        """
+        Snapshot of the in-process entries, by cache key.
+
+        Args:
+            keys: Only these cache keys (default: every entry in memory)
+        """
+        with self._lock:
+            return {key: dict(artifacts) for key, artifacts in self._memory.items()
+                    if keys is None or key in keys}
+
+    def clear_memory(self):
+        """Drop the in-process LRU (disk entries are kept)."""
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'memory_hits': self.hits, 'disk_hits': self.disk_hits,
+                'misses': self.misses, 'entries_in_memory': len(self._memory)}
+
+
+_default_cache: Optional[ArtifactCache] = None
+
+
+def default_cache() -> ArtifactCache:
+    """Process-wide cache configured from CODOQ_CACHE_DIR."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ArtifactCache()
+    return _default_cache
+
+
+def set_default_cache(cache: Optional[ArtifactCache]) -> Optional[ArtifactCache]:
+    """
+    Replace the process-wide cache returned by default_cache().
+
+    Args:
+        cache: The new default, or None to rebuild it from CODOQ_CACHE_DIR on next use
+
+    Returns:
+        The previous default (None if none was created yet)
+    """
+    global _default_cache
+    previous, _default_cache = _default_cache, cache
+    return previous
@@ -0,0 +1,513 @@
+"""
+Benchmark suite for the syndrome, decoding, sampling and game-loop hot paths.
+
+Each benchmark is a generator registered with @benchmark that yields cases
+(parameters, a zero-argument callable, and the number of items it processes).
+The runner reports time per call, throughput, peak traced memory and log-log
+scaling exponents, writes everything to JSON and can compare against a
+previous run to flag regressions.
+
+Usage:
+    python -m src.utils.benchmarks --profile quick --output bench.json
+    python -m src.utils.benchmarks --profile full --compare bench.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Sizes per profile: physical qubit counts and shot counts to sweep
+PROFILES = {
+    'quick': {'n': [7, 50, 450], 'shots': [1, 100, 10_000], 'min_time': 0.02},
+    'full': {'n': [7, 50, 450, 5_000, 20_000, 100_000],
+             'shots': [1, 100, 10_000, 1_000_000], 'min_time': 0.2},
+}
+
+# Cases whose working set would exceed this many bytes are skipped
+MEMORY_BUDGET = 512 * 2**20
+
+# (params, callable, items per call). Cases are measured as soon as they are
+# yielded, so callables may close over the generator's loop variables.
+Case = Tuple[Dict, Callable[[], object], int]
+
+BENCHMARKS: Dict[str, Callable[[Dict], Iterator[Case]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark generator under a name."""
+    def register(func: Callable[[Dict], Iterator[Case]]):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _toric_size(n: int) -> int:
+    """Toric code size L whose 2L^2 qubits are closest to n."""
+    return max(2, int(round((n / 2) ** 0.5)))
+
+
+# --- Benchmarks ---
+
+@benchmark('calculate_syndrome')
+def bench_calculate_syndrome(profile: Dict) -> Iterator[Case]:
+    from ..core.code_abstractions import ToricCode, calculate_syndrome
+    rng = np.random.default_rng(0)
+    for n in profile['n']:
+        L = _toric_size(n)
+        n_qubits = 2 * L * L
+        code = ToricCode(L)
+        for shots in profile['shots']:
+            if shots * n_qubits * 8 > MEMORY_BUDGET:
+                continue
+            errors = (rng.random((n_qubits, shots)) < 0.01).astype(np.uint8)
+            yield {'n': n_qubits, 'shots': shots}, lambda: calculate_syndrome(code, errors), shots
+
+
+@benchmark('qldpc.construct')
+def bench_qldpc_construct(profile: Dict) -> Iterator[Case]:
+    from ..codes.qldpc import BivariateBicycleCode, HypergraphProductCode, repetition_checks
+    from ..utils.artifact_cache import ArtifactCache
+    for n in profile['n']:
+        # Fresh memory-only caches so every call measures a full construction
+        L = max(2, int(round((n / 2) ** 0.5)))
+        yield ({'n': L * L + (L - 1) ** 2, 'family': 'hypergraph_product'},
+               lambda: HypergraphProductCode(repetition_checks(L), cache=ArtifactCache(directory='')), 1)
+        side = max(3, int(round((n / 2) ** 0.5)))
+        yield ({'n': 2 * side * side, 'family': 'bivariate_bicycle'},
+               lambda: BivariateBicycleCode(side, side, [(3, 0), (0, 1), (0, 2)], [(0, 3), (1, 0), (2, 0)],
+                                            cache=ArtifactCache(directory='')), 1)
+
+
+@benchmark('steane.compute_syndrome')
+def bench_steane_syndrome(profile: Dict) -> Iterator[Case]:
+    from ..codes.steane import SteaneCode
+    code = SteaneCode()
+    error = np.array([0, 0, 1, 0, 0, 0, 0])
+    yield {'n': 7, 'shots': 1}, lambda: code.compute_syndrome(error), 1
+
+
+@benchmark('reed_muller.compute_syndrome')
+def bench_reed_muller_syndrome(profile: Dict) -> Iterator[Case]:
+    from ..codes.reed_muller import ReedMullerCode
+    for extended in (False, True):
+        code = ReedMullerCode(use_extended=extended)
+        error, _ = code.apply_random_error(num_errors=1)
+        yield {'n': code.n, 'shots': 1}, lambda: code.compute_syndrome(error), 1
+
+
+@benchmark('steane.get_stabilizer_measurement')
+def bench_steane_measurement(profile: Dict) -> Iterator[Case]:
+    from ..codes.steane import SteaneCode
+    code = SteaneCode()
+    rng = np.random.default_rng(0)
+    for shots in profile['shots']:
+        errors = (rng.random((shots, 7)) < 0.1).astype(np.uint8)
+        yield {'n': 7, 'shots': shots}, lambda: code.get_stabilizer_measurement(errors), shots
+
+
+@benchmark('render.visualize_errors')
+def bench_visualize_errors(profile: Dict) -> Iterator[Case]:
+    from ..codes.reed_muller import ReedMullerCode
+    from ..codes.steane import SteaneCode
+    rng = np.random.default_rng(0)
+    for code in (SteaneCode(), ReedMullerCode()):
+        for shots in profile['shots']:
+            if shots * code.n * 40 > MEMORY_BUDGET:
+                continue
+            masks = rng.random((shots, code.n)) < 0.1
+            yield {'n': code.n, 'shots': shots}, lambda: code.visualize_errors(masks), shots
+
+
+@benchmark('engine.get_current_syndrome_string')
+def bench_engine_syndrome(profile: Dict) -> Iterator[Case]:
+    from ..core.qec_framework import QECGameEngine, SteaneCode
+    engine = QECGameEngine(SteaneCode())
+    engine.introduce_error()
+    yield {'n': 7, 'shots': 1}, engine.get_current_syndrome_string, 1
+
+
+@benchmark('game.play_rounds')
+def bench_play_rounds(profile: Dict) -> Iterator[Case]:
+    from ..codes.reed_muller import ReedMullerGame
+    from ..codes.steane import SteaneGame
+    for name, game in (('steane', SteaneGame()), ('reed_muller', ReedMullerGame())):
+        for shots in profile['shots']:
+            def play():
+                batch = game.play_rounds(shots)
+                return game.check_answers(batch.locations)
+            yield {'n': game.code.n, 'shots': shots, 'code': name}, play, shots
+
+
+@benchmark('sampling.apply_random_error')
+def bench_apply_random_error(profile: Dict) -> Iterator[Case]:
+    from ..codes.reed_muller import ReedMullerCode
+    from ..codes.steane import SteaneCode
+    steane, reed_muller = SteaneCode(), ReedMullerCode()
+    yield {'n': 7, 'shots': 1, 'code': 'steane'}, lambda: steane.apply_random_error(num_errors=1), 1
+    yield {'n': 15, 'shots': 1, 'code': 'reed_muller'}, lambda: reed_muller.apply_random_error(num_errors=1), 1
+
+
+@benchmark('sampling.bernoulli')
+def bench_bernoulli_sampling(profile: Dict) -> Iterator[Case]:
+    rng = np.random.default_rng(0)
+    for n in profile['n']:
+        for shots in profile['shots']:
+            if shots * n * 9 > MEMORY_BUDGET:
+                continue
+            yield {'n': n, 'shots': shots}, lambda: rng.random((shots, n)) < 0.01, shots
+
+
+@benchmark('sampling.qudit')
+def bench_qudit_sampling(profile: Dict) -> Iterator[Case]:
+    from ..core.code_abstractions import QuditSurfaceCode
+    for n in profile['n']:
+        L = _toric_size(n)
+        n_qudits = 2 * L * L
+        # The code holds its charge checks sparsely; only the samples scale with shots
+        if n_qudits * 64 > MEMORY_BUDGET:
+            continue
+        code = QuditSurfaceCode(d=10, L=L)
+        for shots in profile['shots']:
+            if shots * n_qudits * 24 > MEMORY_BUDGET:
+                continue
+            yield {'n': n_qudits, 'shots': shots}, lambda: code.sample_errors(0.01, shots), shots
+
+
+@benchmark('decoder.lookup')
+def bench_lookup_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.reed_muller import ReedMullerCode
+    from ..codes.steane import SteaneCode
+    from ..core.decoders import default_decoders
+    rng = np.random.default_rng(0)
+    for code in (SteaneCode(), ReedMullerCode()):
+        m = code.H.shape[0]
+        for name, decoder in default_decoders(code).items():
+            for shots in profile['shots']:
+                syndromes = rng.integers(0, 2, size=(shots, m))
+                yield ({'n': code.n, 'shots': shots, 'decoder': name},
+                       lambda: decoder.decode_batch(syndromes), shots)
+
+
+@benchmark('decoder.qudit_cluster')
+def bench_qudit_decoder(profile: Dict) -> Iterator[Case]:
+    from ..core.code_abstractions import QuditSurfaceCode
+    from ..core.qudit_decoders import QuditClusterDecoder
+    for n in profile['n']:
+        L = _toric_size(n)
+        if L > 40:
+            continue
+        code = QuditSurfaceCode(d=10, L=L)
+        decoder = QuditClusterDecoder(code)
+        for shots in profile['shots']:
+            if shots * code.n_physical > 10**6:
+                continue
+            syndromes = code.charges(code.sample_errors(0.01, shots, seed=1))
+            yield {'n': code.n_physical, 'shots': shots}, lambda: decoder.decode_batch(syndromes), shots
+
+
+@benchmark('decoder.color_restriction')
+def bench_color_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.color import ColorCodeRestrictionDecoder, TriangularColorCode
+    rng = np.random.default_rng(0)
+    for n in profile['n']:
+        distance = max(3, int((4 * n / 3) ** 0.5) | 1)
+        if distance > 15:
+            continue
+        code = TriangularColorCode(distance)
+        decoder = ColorCodeRestrictionDecoder(code)
+        for shots in profile['shots']:
+            if shots > 10_000:
+                continue
+            errors = (rng.random((shots, code.n_physical)) < 0.01).astype(np.uint8)
+            syndromes = (errors @ code.H.T) % 2
+            yield ({'n': code.n_physical, 'shots': shots},
+                   lambda: decoder.decode_batch(syndromes), shots)
+
+
+@benchmark('decoder.shor_staged')
+def bench_shor_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.shor import ShorDecoder
+    decoder = ShorDecoder()
+    rng = np.random.default_rng(0)
+    for shots in profile['shots']:
+        syndromes = rng.integers(0, 2, (shots, decoder.m), dtype=np.uint8)
+        yield {'shots': shots}, lambda: decoder.decode_batch(syndromes), shots
+
+
+@benchmark('visualizer.600cell_frames')
+def bench_six_hundred_cell_frames(profile: Dict) -> Iterator[Case]:
+    from ..visualizers.six_hundred_cell import SixHundredCell
+    geometry = SixHundredCell()
+    for frames in profile['shots']:
+        angles = geometry.orbit_angles(frames)
+        yield {'shots': frames}, lambda: geometry.project(angles), frames
+
+
+@benchmark('decoder.memoized')
+def bench_memoized_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.color import ColorCodeRestrictionDecoder, TriangularColorCode
+    from ..core.decoders import MemoizedDecoder
+    code = TriangularColorCode(7)
+    decoder = MemoizedDecoder(ColorCodeRestrictionDecoder(code))
+    rng = np.random.default_rng(0)
+    for shots in profile['shots']:
+        # Low error rate: few distinct syndromes, almost every shot is a cache hit
+        errors = (rng.random((shots, code.n_physical)) < 0.003).astype(np.uint8)
+        syndromes = (errors @ code.H.T) % 2
+        decoder.decode_batch(syndromes)
+        yield ({'n': code.n_physical, 'shots': shots},
+               lambda: decoder.decode_batch(syndromes), shots)
+
+
+@benchmark('decoder.hierarchical')
+def bench_hierarchical_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.concatenated import ConcatenatedCode, HierarchicalDecoder
+    from ..codes.steane import SteaneCode
+    rng = np.random.default_rng(0)
+    for levels in (1, 2, 3):
+        code = ConcatenatedCode.repeated(SteaneCode(), levels)
+        decoder = HierarchicalDecoder(code, p=0.01)
+        for shots in profile['shots']:
+            errors = (rng.random((shots, code.n_physical)) < 0.01).astype(np.uint8)
+            syndromes = code.syndromes(errors)
+            yield ({'n': code.n_physical, 'shots': shots},
+                   lambda: decoder.decode_batch(syndromes), shots)
+
+
+@benchmark('decoder.neural')
+def bench_neural_decoder(profile: Dict) -> Iterator[Case]:
+    from ..codes.color import ColorCodeRestrictionDecoder, TriangularColorCode
+    from ..core.decoders import LookupTableDecoder
+    from ..core.neural_decoder import NeuralDecoder
+    code = TriangularColorCode(5)
+    # Inference cost does not depend on the trained values, so untrained weights suffice
+    decoders = {'neural': NeuralDecoder.for_code(code, hidden=(256, 256), seed=0),
+                'lookup': LookupTableDecoder(code.H),
+                'matching': ColorCodeRestrictionDecoder(code)}
+    rng = np.random.default_rng(0)
+    for shots in profile['shots']:
+        errors = (rng.random((shots, code.n_physical)) < 0.05).astype(np.uint8)
+        syndromes = (errors @ code.H.T) % 2
+        for name, decoder in decoders.items():
+            yield ({'n': code.n_physical, 'shots': shots, 'decoder': name},
+                   lambda: decoder.decode_batch(syndromes), shots)
+
+
+@benchmark('decoder.erasure')
+def bench_erasure_decoder(profile: Dict) -> Iterator[Case]:
+    from ..core.code_abstractions import ToricCode
+    from ..core.erasure import ErasureDecoder, UnionFindDecoder, sample_erasure_errors
+    rng = np.random.default_rng(0)
+    for n in profile['n']:
+        L = _toric_size(n)
+        if L > 40:
+            continue
+        H = ToricCode(L).get_css_matrices()[1]
+        n_qubits = H.shape[1]
+        decoders = {'erasure': ErasureDecoder(H), 'union_find': UnionFindDecoder(H)}
+        for shots in profile['shots']:
+            if shots * n_qubits > 10**6:
+                continue
+            # Same expected flips: erasure-only (known positions) against unlocated Pauli noise
+            errors, erasures = sample_erasure_errors(rng, shots, n_qubits, 0.1)
+            pauli = (rng.random((shots, n_qubits)) < 0.05).astype(np.uint8)
+            runs = {'erasure': (decoders['erasure'], (errors @ H.T) % 2, erasures),
+                    'union_find+erasure': (decoders['union_find'], (errors @ H.T) % 2, erasures),
+                    'union_find': (decoders['union_find'], (pauli @ H.T) % 2, None)}
+            for name, (decoder, syndromes, erased) in runs.items():
+                yield ({'n': n_qubits, 'shots': shots, 'decoder': name},
+                       lambda: decoder.decode_batch(syndromes, erased), shots)
+
+
+@benchmark('kernel.gray_code_weights')
+def bench_kernel_gray_code(profile: Dict) -> Iterator[Case]:
+    from . import gf2
+    from .kernels import KERNELS
+    rng = np.random.default_rng(0)
+    kernel = KERNELS['gray_code_weights']
+    for n in profile['n']:
+        # 2^10 table rows walked through 2^6 Gray-code steps
+        basis = gf2.pack_rows(rng.integers(0, 2, (16, n), dtype=np.uint8))
+        table = np.zeros((1, basis.shape[1]), dtype=np.uint64)
+        for row in basis[:10]:
+            table = np.concatenate([table, table ^ row])
+        walked = np.ascontiguousarray(basis[10:])
+        for backend, impl in kernel.implementations().items():
+            yield ({'n': n, 'backend': backend},
+                   lambda: impl(table, walked, n), len(table) << len(walked))
+
+
+@benchmark('kernel.merge_labels')
+def bench_kernel_merge_labels(profile: Dict) -> Iterator[Case]:
+    from .kernels import KERNELS
+    rng = np.random.default_rng(0)
+    kernel = KERNELS['merge_labels']
+    for n in profile['n']:
+        if n * n > MEMORY_BUDGET:
+            continue
+        # Defects scattered on a line, linked to their neighbours within distance 3
+        position = np.sort(rng.integers(0, 4 * n, n))
+        link = np.abs(position[:, None] - position[None, :]) <= 3
+        labels = np.arange(n)
+        for backend, impl in kernel.implementations().items():
+            yield {'n': n, 'backend': backend}, lambda: impl(labels, link), n
+
+
+# --- Runner ---
+
+def measure(func: Callable[[], object], min_time: float = 0.05,
+            repeats: int = 3) -> Tuple[float, int]:
+    """
+    Time a callable and record its peak traced allocation.
+
+    Args:
+        func: Zero-argument callable
+        min_time: Each repeat loops until this many seconds have elapsed
+        repeats: Number of repeats; the best per-call time is reported
+
+    Returns:
+        Tuple of (seconds per call, peak bytes allocated during one call)
+    """
+    func()  # warm-up (caches, lazy imports)
+    best = float('inf')
+    for _ in range(repeats):
+        calls, start = 0, time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        best = min(best, elapsed / calls)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponents(results: List[Dict]) -> Dict[str, Dict[str, float]]:
+    """
+    Fit time ~ size^alpha on a log-log scale for each benchmark, along 'n' and
+    along 'shots', using the longest series in which all other parameters are fixed.
+    """
+    exponents: Dict[str, Dict[str, float]] = {}
+    by_name = defaultdict(list)
+    for result in results:
+        by_name[result['name']].append(result)
+    for name, rows in by_name.items():
+        fits = {}
+        for axis in ('n', 'shots'):
+            series = defaultdict(list)
+            for row in rows:
+                if axis not in row['params']:
+                    continue
+                others = json.dumps({k: v for k, v in row['params'].items() if k != axis},
+                                    sort_keys=True)
+                series[others].append((row['params'][axis], row['seconds']))
+            if not series:
+                continue
+            best = max(series.values(), key=lambda points: len({size for size, _ in points}))
+            if len({size for size, _ in best}) >= 2:
+                sizes, seconds = np.log(np.array(best, dtype=float)).T
+                fits[axis] = float(np.polyfit(sizes, seconds, 1)[0])
+        if fits:
+            exponents[name] = fits
+    return exponents
+
+
+def run_benchmarks(profile_name: str = 'quick', only: Optional[str] = None,
+                   verbose: bool = True) -> Dict:
+    """
+    Run every registered benchmark (optionally filtered by substring).
+
+    Returns:
+        Dictionary with 'meta', 'results' and 'scaling' entries
+    """
+    profile = PROFILES[profile_name]
+    results = []
+    for name, generator in BENCHMARKS.items():
+        if only and only not in name:
+            continue
+        for params, func, items in generator(profile):
+            seconds, peak = measure(func, min_time=profile['min_time'])
+            row = {'name': name, 'params': params, 'seconds': seconds,
+                   'throughput': items / seconds, 'peak_bytes': peak}
+            results.append(row)
+            if verbose:
+                print(f"{name:40s} {json.dumps(params):50s} "
+                      f"{seconds * 1e6:12.1f} us  {row['throughput']:14.1f} /s  "
+                      f"{peak / 2**20:8.2f} MiB")
+    return {
+        'meta': {
+            'profile': profile_name,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+        'scaling': scaling_exponents(results),
+    }
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 1.25) -> List[Dict]:
+    """
+    Flag cases that got slower than threshold x their baseline time.
+
+    Returns:
+        List of {'name', 'params', 'baseline', 'current', 'ratio'} dictionaries
+    """
+    reference = {(r['name'], json.dumps(r['params'], sort_keys=True)): r['seconds']
+                 for r in baseline['results']}
+    regressions = []
+    for row in current['results']:
+        key = (row['name'], json.dumps(row['params'], sort_keys=True))
+        if key in reference:
+            ratio = row['seconds'] / reference[key]
+            if ratio > threshold:
+                regressions.append({'name': row['name'], 'params': row['params'],
+                                    'baseline': reference[key], 'current': row['seconds'],
+                                    'ratio': ratio})
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--only', help='Only run benchmarks whose name contains this string')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--compare', help='Baseline JSON file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='Slowdown ratio reported as a regression')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.profile, args.only)
+    print("\nScaling exponents (time ~ size^alpha):")
+    for name, fits in report['scaling'].items():
+        print(f"  {name:40s} " + "  ".join(f"{axis}: {alpha:.2f}" for axis, alpha in fits.items()))
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(json.load(handle), report, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['name']} {json.dumps(r['params'])}: "
+                  f"{r['baseline'] * 1e6:.1f} us -> {r['current'] * 1e6:.1f} us (x{r['ratio']:.2f})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Bit-packed linear algebra over GF(2).
+
+Matrices are stored row-wise with 64 columns per uint64 word: column j lives in
+word j // 64 at bit j % 64. Row operations are then a single XOR over a few
+words, which keeps Gaussian elimination fast for codes with thousands of qubits.
+"""
+
+import hashlib
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+
+WORD_BITS = 64
+
+# Number of set bits in every byte value, used for popcounts on packed rows
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def n_words(n: int) -> int:
+    """Number of uint64 words needed to hold n bits."""
+    return (n + WORD_BITS - 1) // WORD_BITS
+
+
+def pack_rows(matrix: np.ndarray) -> np.ndarray:
+    """
+    Pack a binary matrix of shape (rows, n) into uint64 words of shape (rows, n_words(n)).
+    """
+    matrix = np.atleast_2d(np.asarray(matrix)).astype(np.uint8) & 1
+    rows, n = matrix.shape
+    padded = np.zeros((rows, n_words(n) * WORD_BITS), dtype=np.uint8)
+    padded[:, :n] = matrix
+    packed = np.packbits(padded, axis=1, bitorder='little')
+    return packed.view('<u8').astype(np.uint64, copy=False).reshape(rows, -1)
+
+
+def unpack_rows(packed: np.ndarray, n: int) -> np.ndarray:
+    """Inverse of pack_rows; returns a uint8 matrix of shape (rows, n)."""
+    packed = np.ascontiguousarray(np.atleast_2d(packed), dtype='<u8')
+    bits = np.unpackbits(packed.view(np.uint8), axis=1, bitorder='little')
+    return bits[:, :n]
+
+
+def popcount_rows(packed: np.ndarray) -> np.ndarray:
+    """Number of set bits in each packed row (any leading shape)."""
+    packed = np.ascontiguousarray(packed, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(packed).sum(axis=-1, dtype=np.int64)
+    as_bytes = packed.view(np.uint8).reshape(packed.shape[:-1] + (-1,))
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+def matrix_key(*matrices: Optional[np.ndarray]) -> str:
+    """Stable hash of one or more matrices, used to memoize per-code results."""
+    digest = hashlib.sha1()
+    for matrix in matrices:
+        if matrix is None:
+            digest.update(b'none')
+            continue
+        matrix = np.ascontiguousarray(matrix)
+        digest.update(str(matrix.shape).encode())
+        digest.update(str(matrix.dtype).encode())
+        digest.update(matrix.tobytes())
+    return digest.hexdigest()
+
+
+def row_reduce(packed: np.ndarray, n: int,
+               columns: Optional[Iterable[int]] = None) -> Tuple[np.ndarray, List[int]]:
+    """
+    Reduced row echelon form of a packed GF(2) matrix.
+
+    Args:
+        packed: Packed matrix of shape (rows, n_words(n))
+        n: Number of columns
+        columns: Order in which to look for pivots (default 0..n-1). Passing a
+                 random permutation selects a random information set.
+
+    Returns:
+        Tuple of (reduced rows, pivot columns); only the rank-many nonzero rows are returned
+    """
+    A = np.array(packed, dtype=np.uint64, copy=True)
+    rows = A.shape[0]
+    pivots: List[int] = []
+    r = 0
+    for c in (range(n) if columns is None else columns):
+        if r == rows:
+            break
+        word, shift = divmod(int(c), WORD_BITS)
+        shift = np.uint64(shift)
+        candidates = np.flatnonzero((A[r:, word] >> shift) & np.uint64(1))
+        if candidates.size == 0:
+            continue
+        p = r + candidates[0]
+        if p != r:
+            A[[r, p]] = A[[p, r]]
+        hit = ((A[:, word] >> shift) & np.uint64(1)).astype(bool)
+        hit[r] = False
+        A[hit] ^= A[r]
+        pivots.append(int(c))
+        r += 1
+    return A[:r], pivots
+
+
+def rank(matrix: np.ndarray) -> int:
+    """Rank of a binary matrix over GF(2)."""
+    matrix = np.atleast_2d(np.asarray(matrix))
+    if matrix.size == 0:
+        return 0
+    return len(row_reduce(pack_rows(matrix), matrix.shape[1])[1])
+
+
+def inverse(matrix: np.ndarray) -> np.ndarray:
+    """Inverse of a square binary matrix over GF(2); raises ValueError if singular."""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.uint8)) & 1
+    k = matrix.shape[0]
+    augmented = np.hstack([matrix, np.eye(k, dtype=np.uint8)])
+    reduced, pivots = row_reduce(pack_rows(augmented), 2 * k)
+    if pivots[:k] != list(range(k)):
+        raise ValueError("Matrix is singular over GF(2).")
+    return unpack_rows(reduced, 2 * k)[:, k:]
+
+
+def nullspace(matrix: np.ndarray, n: Optional[int] = None) -> np.ndarray:
+    """
+    Basis of the right kernel {x : matrix @ x = 0 mod 2}.
+
+    Args:
+        matrix: Binary matrix of shape (rows, n); may have zero rows if n is given
+        n: Number of columns (needed when matrix is empty)
+
+    Returns:
+        uint8 matrix whose rows span the kernel
+    """
+    matrix = np.asarray(matrix)
+    n = matrix.shape[-1] if n is None else n
+    if matrix.size == 0:
+        return np.eye(n, dtype=np.uint8)
+    reduced, pivots = row_reduce(pack_rows(matrix), n)
+    free = np.setdiff1d(np.arange(n), pivots)
+    basis = np.zeros((len(free), n), dtype=np.uint8)
+    basis[np.arange(len(free)), free] = 1
+    if pivots:
+        basis[:, pivots] = unpack_rows(reduced, n)[:, free].T
+    return basis
+
+
+def complement_basis(span_of: np.ndarray, within: np.ndarray) -> np.ndarray:
+    """
+    Rows of 'within' that extend the row space of 'span_of', chosen greedily.
+
+    Used to pick logical operator representatives: for a CSS code,
+    complement_basis(Hz, nullspace(Hx)) returns k independent Z logicals.
+    """
+    span_of = np.atleast_2d(np.asarray(span_of, dtype=np.uint8))
+    within = np.atleast_2d(np.asarray(within, dtype=np.uint8))
+    stacked = np.vstack([span_of, within]) if span_of.size else within
+    offset = len(stacked) - len(within)
+    # Pivot columns of the transpose are the greedily independent rows
+    _, pivots = row_reduce(pack_rows(stacked.T), len(stacked))
+    chosen = [p - offset for p in pivots if p >= offset]
+    return within[chosen]
+
+
+def parity_products(packed_a: np.ndarray, packed_b: np.ndarray) -> np.ndarray:
+    """
+    GF(2) inner products between every row of packed_a and every row of packed_b.
+
+    Returns:
+        uint8 matrix of shape (len(packed_a), len(packed_b))
+    """
+    both = packed_a[:, None, :] & packed_b[None, :, :]
+    return (popcount_rows(both) & 1).astype(np.uint8)
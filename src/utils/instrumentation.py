@@ -0,0 +1,186 @@
+"""
+Lightweight hot-path instrumentation: per-stage counters, timing histograms
+and structured events.
+
+Stages (sample, syndrome, decode, verify, ...) are timed by the @timed
+decorator. When instrumentation is disabled the wrapper costs a single
+attribute check, so it can stay on the hot paths permanently.
+
+Enable it for a whole process with the CODOQ_INSTRUMENT=1 environment
+variable, or for a block of code with:
+
+    with instrumented() as probe:
+        game.play_round()
+    print(probe.snapshot())
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional
+
+ENV_VAR = 'CODOQ_INSTRUMENT'
+
+# Timing histograms use power-of-two nanosecond buckets: bucket b holds [2^b, 2^(b+1)) ns
+N_BUCKETS = 48
+
+
+class StageStats:
+    """Call count, total time and log2 histogram for one stage."""
+
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * N_BUCKETS
+
+    def add(self, elapsed_ns: int):
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[min(max(elapsed_ns, 1).bit_length() - 1, N_BUCKETS - 1)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper edge (seconds) of the bucket containing the q-th quantile."""
+        target = q * self.calls
+        seen = 0
+        for b, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return 2.0 ** (b + 1) * 1e-9
+        return 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'total_seconds': self.total_ns * 1e-9,
+            'mean_seconds': self.total_ns * 1e-9 / self.calls if self.calls else 0.0,
+            'max_seconds': self.max_ns * 1e-9,
+            'p50_seconds': self.percentile(0.5),
+            'p99_seconds': self.percentile(0.99),
+            'histogram_ns_log2': {str(b): c for b, c in enumerate(self.buckets) if c},
+        }
+
+
+class Instrumentation:
+    """Process-wide registry of stage timings, counters and recent events."""
+
+    def __init__(self, enabled: bool = False, max_events: int = 10_000):
+        self.enabled = enabled
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.events: deque = deque(maxlen=max_events)
+        self.listeners: List[Callable[[Dict], None]] = []
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, elapsed_ns: int):
+        with self._lock:
+            stats = self.stages.get(stage)
+            if stats is None:
+                stats = self.stages[stage] = StageStats()
+            stats.add(elapsed_ns)
+
+    def count(self, name: str, amount: int = 1):
+        """Increment a named counter (no-op when disabled)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def event(self, event: Dict):
+        """Keep a structured event and forward it to listeners (no-op when disabled)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.events.append(event)
+        # Listeners run outside the lock, so they may record or count themselves
+        for listener in self.listeners:
+            listener(event)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of code as one call of a stage."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter_ns() - start)
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+            self.counters.clear()
+            self.events.clear()
+
+    def snapshot(self, include_events: bool = False) -> Dict:
+        """Export the current statistics as a JSON-serializable dictionary."""
+        with self._lock:
+            snap = {
+                'timestamp': time.time(),
+                'stages': {name: stats.to_dict() for name, stats in sorted(self.stages.items())},
+                'counters': dict(self.counters),
+            }
+            if include_events:
+                snap['events'] = list(self.events)
+        return snap
+
+    def export(self, path: str, include_events: bool = False):
+        with open(path, 'w') as handle:
+            json.dump(self.snapshot(include_events), handle, indent=2, default=str)
+
+
+INSTRUMENTS = Instrumentation(enabled=os.environ.get(ENV_VAR, '') not in ('', '0', 'false'))
+
+
+def timed(stage: str):
+    """
+    Decorator timing every call of a function as one call of 'stage'.
+
+    Disabled instrumentation costs one attribute lookup per call.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTS.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                INSTRUMENTS.record(stage, time.perf_counter_ns() - start)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def instrumented(listener: Optional[Callable[[Dict], None]] = None,
+                 reset: bool = True) -> Iterator[Instrumentation]:
+    """
+    Enable instrumentation for the duration of a with-block.
+
+    Args:
+        listener: Optional callback receiving every structured event
+        reset: Clear previous statistics on entry
+    """
+    previous = INSTRUMENTS.enabled
+    if reset:
+        INSTRUMENTS.reset()
+    if listener is not None:
+        INSTRUMENTS.listeners.append(listener)
+    INSTRUMENTS.enabled = True
+    try:
+        yield INSTRUMENTS
+    finally:
+        INSTRUMENTS.enabled = previous
+        if listener is not None:
+            INSTRUMENTS.listeners.remove(listener)
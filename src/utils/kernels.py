@@ -0,0 +1,299 @@
+"""
+Hot-loop kernels with a NumPy reference and an optional JIT implementation.
+
+Some inner loops (union-find cluster merging, Gray-code codeword walks) are
+sequential by nature. NumPy can only express them as repeated whole-array
+passes. Every such routine is registered here twice:
+
+- a reference implementation in plain NumPy, always available;
+- a loop implementation written in the Numba subset of Python, compiled
+  with numba.njit when Numba is installed.
+
+The backend is picked once, at import time: the JIT one when Numba imports
+and CODOQ_DISABLE_JIT is unset, else the reference. Callers hold the
+Kernel object and just call it. Deployments without Numba run the reference
+unchanged, and can still execute the loop versions as (slow) pure Python.
+verify_kernels() uses this to check that all implementations agree.
+
+Usage:
+    python -m src.utils.kernels            # parity check and speedup report
+"""
+
+import os
+import numpy as np
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    import numba
+except ImportError:  # the NumPy references are used
+    numba = None
+
+JIT_AVAILABLE = numba is not None
+JIT_ENABLED = JIT_AVAILABLE and os.environ.get('CODOQ_DISABLE_JIT', '') in ('', '0')
+
+
+def _njit(func: Callable) -> Callable:
+    """numba.njit(cache=True) when Numba is installed, else the function itself."""
+    return numba.njit(cache=True)(func) if JIT_AVAILABLE else func
+
+
+class Kernel:
+    """
+    One hot routine and its implementations.
+
+    Calling the kernel runs the backend chosen at import time (see module docstring).
+    """
+
+    def __init__(self, name: str, reference: Callable,
+                 sample: Callable[[np.random.Generator], Tuple]):
+        self.name = name
+        self.reference = reference
+        self.sample = sample
+        self.loop: Optional[Callable] = None
+        self.jit: Optional[Callable] = None
+        self._active = reference
+
+    @property
+    def backend(self) -> str:
+        return 'jit' if self._active is self.jit and self.jit is not None else 'numpy'
+
+    def implementations(self, include_python: bool = False) -> Dict[str, Callable]:
+        """Available implementations by backend name ('numpy', 'jit', optionally 'python')."""
+        found = {'numpy': self.reference}
+        if self.jit is not None:
+            found['jit'] = self.jit
+        if include_python and self.loop is not None:
+            found['python'] = getattr(self.loop, 'py_func', self.loop)
+        return found
+
+    def __call__(self, *args):
+        return self._active(*args)
+
+    def __repr__(self):
+        return f"Kernel({self.name!r}, backend={self.backend!r})"
+
+
+KERNELS: Dict[str, Kernel] = {}
+
+
+def kernel(name: str, sample: Callable[[np.random.Generator], Tuple]):
+    """Register a NumPy reference implementation; sample(rng) builds test arguments."""
+    def register(func: Callable) -> Kernel:
+        KERNELS[name] = Kernel(name, func, sample)
+        return KERNELS[name]
+    return register
+
+
+def jit_variant(name: str):
+    """Attach a loop implementation to a registered kernel, compiled when Numba is available."""
+    def register(func: Callable) -> Callable:
+        entry = KERNELS[name]
+        entry.loop = _njit(func)
+        if JIT_AVAILABLE:
+            entry.jit = entry.loop
+            if JIT_ENABLED:
+                entry._active = entry.jit
+        return func
+    return register
+
+
+# --- Shared helpers ---
+
+@_njit
+def _popcount64(x):
+    """Set bits of one uint64 (SWAR, no multiplications so that NumPy scalars do not overflow)."""
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    x = x + (x >> np.uint64(8))
+    x = x + (x >> np.uint64(16))
+    x = x + (x >> np.uint64(32))
+    return x & np.uint64(0x7F)
+
+
+# --- Gray-code weight enumeration ---
+
+def _sample_gray_code(rng: np.random.Generator) -> Tuple:
+    from . import gf2
+    n = int(rng.integers(5, 90))
+    basis = gf2.pack_rows(rng.integers(0, 2, (int(rng.integers(1, 9)), n), dtype=np.uint8))
+    split = int(rng.integers(0, len(basis) + 1))
+    table = np.zeros((1, basis.shape[1]), dtype=np.uint64)
+    for row in basis[:split]:
+        table = np.concatenate([table, table ^ row])
+    return table, np.ascontiguousarray(basis[split:]), n
+
+
+@kernel('gray_code_weights', sample=_sample_gray_code)
+def gray_code_weights(table: np.ndarray, walked: np.ndarray, n: int) -> np.ndarray:
+    """
+    Weight distribution of {t ^ g : t in table, g in span(walked)}.
+
+    Args:
+        table: (T, words) packed rows, typically the span of the first basis rows
+        walked: (K, words) packed basis rows walked in Gray-code order
+        n: Code length (distribution has n + 1 entries)
+
+    Returns:
+        int64 counts of every weight 0..n
+    """
+    from .gf2 import popcount_rows
+    counts = np.zeros(n + 1, dtype=np.int64)
+    current = np.zeros(table.shape[1], dtype=np.uint64)
+    for step in range(1 << len(walked)):
+        if step:
+            # Gray code: step i flips the basis row at the lowest set bit of i
+            current ^= walked[(step & -step).bit_length() - 1]
+        counts += np.bincount(popcount_rows(table ^ current), minlength=n + 1)
+    return counts
+
+
+@jit_variant('gray_code_weights')
+def _gray_code_weights_loop(table, walked, n):
+    counts = np.zeros(n + 1, dtype=np.int64)
+    words = table.shape[1]
+    current = np.zeros(words, dtype=np.uint64)
+    for step in range(1 << walked.shape[0]):
+        if step:
+            low, index = step & -step, 0
+            while low > 1:
+                low >>= 1
+                index += 1
+            for w in range(words):
+                current[w] ^= walked[index, w]
+        for row in range(table.shape[0]):
+            weight = 0
+            for w in range(words):
+                weight += int(_popcount64(table[row, w] ^ current[w]))
+            counts[weight] += 1
+    return counts
+
+
+# --- Cluster merging (union-find) ---
+
+def _sample_merge_labels(rng: np.random.Generator) -> Tuple:
+    k = int(rng.integers(1, 40))
+    # Valid labels: every node points at the smallest member of its group
+    groups = rng.integers(0, max(1, k // 2), k)
+    first = {}
+    labels = np.array([first.setdefault(g, i) for i, g in enumerate(groups)], dtype=np.int64)
+    link = rng.random((k, k)) < 2.0 / k
+    return labels, link | link.T
+
+
+@kernel('merge_labels', sample=_sample_merge_labels)
+def merge_labels(labels: np.ndarray, link: np.ndarray) -> np.ndarray:
+    """
+    Merge labelled groups along a symmetric link matrix.
+
+    Args:
+        labels: (k,) int64 labels; labels[i] is the smallest index in i's group
+        link: (k, k) boolean adjacency
+
+    Returns:
+        (k,) int64 labels of the merged groups, again the smallest member index
+    """
+    k = len(labels)
+    labels = np.asarray(labels, dtype=np.int64)
+    # Label propagation until every connected component shares its minimum label
+    while True:
+        merged = np.minimum(labels, np.where(link, labels[None, :], k).min(axis=1, initial=k))
+        group_min = np.full(k, k)
+        np.minimum.at(group_min, labels, merged)
+        merged = np.minimum(merged, group_min[labels])
+        if np.array_equal(merged, labels):
+            return labels
+        labels = merged
+
+
+@_njit
+def _find(parent, i):
+    root = i
+    while parent[root] != root:
+        root = parent[root]
+    while parent[i] != root:  # path compression
+        following = parent[i]
+        parent[i] = root
+        i = following
+    return root
+
+
+@_njit
+def _union(parent, a, b):
+    # The smaller root wins, so every root is its component's minimum index
+    ra, rb = _find(parent, a), _find(parent, b)
+    if ra < rb:
+        parent[rb] = ra
+    elif rb < ra:
+        parent[ra] = rb
+
+
+@jit_variant('merge_labels')
+def _merge_labels_loop(labels, link):
+    k = labels.shape[0]
+    parent = np.arange(k)
+    for i in range(k):
+        _union(parent, i, labels[i])
+        for j in range(i + 1, k):
+            if link[i, j]:
+                _union(parent, i, j)
+    merged = np.empty(k, dtype=np.int64)
+    for i in range(k):
+        merged[i] = _find(parent, i)
+    return merged
+
+
+# --- Verification ---
+
+def verify_kernels(names: Optional[List[str]] = None, trials: int = 50,
+                   seed: int = 0) -> Dict[str, Dict]:
+    """
+    Check that every implementation of every kernel returns identical results.
+
+    The loop implementations are also run uncompiled, so that the check is
+    meaningful on machines without Numba.
+
+    Returns:
+        Per kernel: 'backend' (the active one), 'implementations' checked,
+        'trials' and 'mismatches' (count of trials where any output differed)
+    """
+    report = {}
+    rng = np.random.default_rng(seed)
+    for name, entry in KERNELS.items():
+        if names is not None and name not in names:
+            continue
+        implementations = entry.implementations(include_python=True)
+        mismatches = 0
+        for _ in range(trials):
+            args = entry.sample(rng)
+            outputs = [np.asarray(impl(*args)) for impl in implementations.values()]
+            mismatches += any(not np.array_equal(outputs[0], out) for out in outputs[1:])
+        report[name] = {'backend': entry.backend, 'implementations': list(implementations),
+                        'trials': trials, 'mismatches': mismatches}
+    return report
+
+
+def main() -> int:
+    from .benchmarks import BENCHMARKS, PROFILES, measure
+    print(f"Numba: {'available' if JIT_AVAILABLE else 'not installed'}; "
+          f"JIT {'enabled' if JIT_ENABLED else 'disabled'}")
+    failed = False
+    for name, row in verify_kernels().items():
+        status = 'ok' if row['mismatches'] == 0 else f"{row['mismatches']} MISMATCHES"
+        failed |= row['mismatches'] > 0
+        print(f"  {name:24s} active={row['backend']:6s} checked={','.join(row['implementations']):20s} {status}")
+
+    print("\nSpeedups (numpy time / jit time):")
+    for name in KERNELS:
+        timings = {}
+        for params, func, _ in BENCHMARKS[f'kernel.{name}'](PROFILES['quick']):
+            timings.setdefault(params['n'], {})[params['backend']] = measure(func, min_time=0.02)[0]
+        for size, by_backend in timings.items():
+            speedup = (f"{by_backend['numpy'] / by_backend['jit']:.1f}x" if 'jit' in by_backend
+                       else 'n/a (no JIT)')
+            print(f"  {name:24s} n={size:<8d} {speedup}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+"""
+Lazy package exports (PEP 562).
+
+Importing a package such as src.codes used to import every code, game and
+decoder module, along with their dependencies. Short-lived workers and CLI
+invocations that need a single class paid for all of them. A package now
+declares which submodule defines each exported name, and the submodule is
+imported on first attribute access:
+
+    __getattr__, __dir__ = lazy_exports(__name__, {'SteaneCode': '.steane'})
+"""
+
+import importlib
+import sys
+from typing import Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], object],
+                                                                 Callable[[], List[str]]]:
+    """
+    Build module-level __getattr__ and __dir__ for a package.
+
+    Args:
+        package: The package's __name__
+        exports: Exported name -> submodule, relative to the package (e.g. '.steane')
+
+    Returns:
+        (__getattr__, __dir__) to assign at package level
+    """
+    def __getattr__(name: str):
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        # Cache on the package so later lookups bypass __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
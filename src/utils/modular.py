@@ -0,0 +1,124 @@
+"""
+Linear algebra over GF(p) and Z_d for qudit codes.
+
+GF(p) ranks use vectorized Gauss-Jordan elimination. For composite d (the
+original Decodoku uses d=10) rank is not well defined, so the size of the image
+and kernel of a check matrix is computed from a diagonal (Smith-like) form
+obtained with unimodular row operations and column operations modulo d.
+"""
+
+import numpy as np
+from math import gcd, log
+from typing import List, Union
+
+
+def is_prime(p: int) -> bool:
+    """True if p is a prime number (trial division; moduli here are small)."""
+    return p >= 2 and all(p % q for q in range(2, int(p ** 0.5) + 1))
+
+
+def rank_mod_p(matrix: np.ndarray, p: int) -> int:
+    """
+    Rank of an integer matrix over the prime field GF(p).
+
+    Args:
+        matrix: Integer matrix of shape (rows, n)
+        p: A prime modulus
+
+    Returns:
+        Rank over GF(p)
+    """
+    if not is_prime(p):
+        raise ValueError(f"rank_mod_p needs a prime modulus, got {p}; use diagonal_mod for Z_d.")
+    A = np.mod(np.atleast_2d(np.asarray(matrix, dtype=np.int64)), p)
+    rows, n = A.shape
+    r = 0
+    for c in range(n):
+        if r == rows:
+            break
+        candidates = np.flatnonzero(A[r:, c])
+        if candidates.size == 0:
+            continue
+        pivot = r + candidates[0]
+        if pivot != r:
+            A[[r, pivot]] = A[[pivot, r]]
+        A[r] = (A[r] * pow(int(A[r, c]), -1, p)) % p
+        factors = A[:, c].copy()
+        factors[r] = 0
+        A = (A - np.outer(factors, A[r])) % p
+        r += 1
+    return r
+
+
+def diagonal_mod(matrix: np.ndarray, d: int) -> List[int]:
+    """
+    Diagonal entries of a Smith-like form of a matrix over Z_d.
+
+    The matrix is reduced with unimodular integer row operations and column
+    operations, working modulo d throughout (valid because d*Z^m lies in the
+    lattice spanned by the columns together with d*I). Each returned entry s
+    contributes a factor d / gcd(s, d) to the size of the image.
+
+    Args:
+        matrix: Integer matrix of shape (rows, n)
+        d: Modulus >= 2
+
+    Returns:
+        List of nonzero diagonal entries, each a divisor of d smaller than d
+    """
+    A = np.mod(np.atleast_2d(np.asarray(matrix, dtype=np.int64)), d)
+    rows, cols = A.shape
+    diagonal = []
+    r = 0
+    while r < min(rows, cols):
+        sub = A[r:, r:]
+        if not sub.any():
+            break
+        # Move the smallest nonzero entry to the pivot position
+        masked = np.where(sub > 0, sub, d)
+        i, j = np.unravel_index(np.argmin(masked), sub.shape)
+        A[[r, r + i]] = A[[r + i, r]]
+        A[:, [r, r + j]] = A[:, [r + j, r]]
+        while True:
+            pivot = A[r, r]
+            A[r + 1:] = (A[r + 1:] - np.outer(A[r + 1:, r] // pivot, A[r])) % d
+            A[:, r + 1:] = (A[:, r + 1:] - np.outer(A[:, r], A[r, r + 1:] // pivot)) % d
+            remainders = np.concatenate([A[r + 1:, r], A[r, r + 1:]])
+            if not remainders.any():
+                break
+            # Euclid step: a smaller remainder becomes the new pivot
+            k = np.argmin(np.where(remainders > 0, remainders, d))
+            if k < rows - r - 1:
+                A[[r, r + 1 + k]] = A[[r + 1 + k, r]]
+            else:
+                k -= rows - r - 1
+                A[:, [r, r + 1 + k]] = A[:, [r + 1 + k, r]]
+        s = gcd(int(A[r, r]), d)
+        if s != d:
+            diagonal.append(s)
+        r += 1
+    return diagonal
+
+
+def image_size_mod(matrix: np.ndarray, d: int) -> int:
+    """Number of distinct vectors H @ x mod d over all x in Z_d^n."""
+    size = 1
+    for s in diagonal_mod(matrix, d):
+        size *= d // s
+    return size
+
+
+def kernel_dimension_mod(matrix: np.ndarray, d: int) -> Union[int, float]:
+    """
+    log_d of the number of solutions of H @ x = 0 mod d.
+
+    For prime d this is n - rank; for composite d it can be fractional
+    (e.g. a kernel of size 2 * 10^k over Z_10). Whole dimensions are
+    returned as exact integers.
+    """
+    n = np.atleast_2d(np.asarray(matrix)).shape[1]
+    image = image_size_mod(matrix, d)
+    exponent = round(log(image, d))
+    if d ** exponent == image:
+        return n - exponent
+    return n - log(image, d)
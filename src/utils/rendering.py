@@ -0,0 +1,52 @@
+"""
+Batched text rendering of error patterns.
+
+A row of qubit labels is laid out once as a byte template with one marker
+slot per qubit. Rendering a batch then only writes the markers into a tiled
+copy of the template, instead of formatting every string in Python.
+"""
+
+import numpy as np
+from typing import List, Tuple
+
+
+def build_marker_template(prefixes: List[str], suffixes: List[str],
+                          separator: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute a byte template with one marker slot per qubit.
+
+    Args:
+        prefixes: Text before each qubit's marker
+        suffixes: Text after each qubit's marker
+        separator: Text between consecutive qubits
+
+    Returns:
+        Tuple of (template bytes as uint8 array, slot byte offsets)
+    """
+    template = bytearray()
+    slots = []
+    for i, (prefix, suffix) in enumerate(zip(prefixes, suffixes)):
+        if i:
+            template += separator.encode()
+        template += prefix.encode()
+        slots.append(len(template))
+        template += b' ' + suffix.encode()
+    return np.frombuffer(bytes(template), dtype=np.uint8), np.array(slots, dtype=np.intp)
+
+
+def fill_marker_template(template: np.ndarray, slots: np.ndarray, error_masks: np.ndarray) -> List[str]:
+    """
+    Fill the marker slots with 'X' where the mask is set and decode every row.
+
+    Args:
+        template, slots: Output of build_marker_template
+        error_masks: Boolean array of shape (shots, n) (or (n,) for one pattern)
+
+    Returns:
+        List of rendered strings, one per row
+    """
+    masks = np.atleast_2d(np.asarray(error_masks, dtype=bool))
+    rendered = np.tile(template, (len(masks), 1))
+    rendered[:, slots] = np.where(masks[:, :len(slots)], ord('X'), ord(' '))
+    width = template.size
+    return rendered.view(f'S{width}').ravel().astype(f'U{width}').tolist()
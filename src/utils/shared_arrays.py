@@ -0,0 +1,240 @@
+"""
+Zero-copy sharing of code artifacts with worker processes.
+
+Simulations that fan out to many processes would otherwise rebuild or
+unpickle every code's arrays (sparse check indices, lookup tables, decoding
+graphs) in each worker, multiplying resident memory by the number of
+workers. Instead, the parent publishes the arrays once, into a
+multiprocessing.shared_memory block or a file, and hands workers a small
+picklable handle. Workers attach read-only np.ndarray views onto the same
+physical pages.
+
+Because the repo's codes and decoders already obtain their arrays from an
+ArtifactCache, sharing a whole cache is the usual entry point:
+
+    cache = ArtifactCache()
+    code = BivariateBicycleCode.from_preset('gross', cache=cache)
+    with SharedArtifacts.publish(cache) as shared:
+        with ProcessPoolExecutor(64, initializer=install_shared_cache,
+                                 initargs=(shared.handle,)) as pool:
+            ...  # workers construct the same code; its arrays are views
+
+Lifetime: the publisher owns the block and unlinks it on close() (or when
+its with-block exits). Workers close their mapping on close(). An attached
+mapping stays valid after the publisher unlinks it, until the worker
+closes it.
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .artifact_cache import ArtifactCache, Artifacts, set_default_cache
+
+# Every array starts on a cache-line boundary
+ALIGNMENT = 64
+
+# Shared memory blocks created by this process, which its resource tracker must keep
+_published_lock = threading.Lock()
+_published_names = set()
+
+
+class SharedArraysHandle(NamedTuple):
+    """Picklable description of a published block: where it lives and its layout."""
+    kind: str                       # 'shm' or 'file'
+    location: str                   # shared memory name or file path
+    size: int                       # bytes
+    layout: Tuple[Tuple[str, int, Tuple[int, ...], str], ...]  # (name, offset, shape, dtype)
+
+
+def _layout(arrays: Mapping[str, np.ndarray]) -> Tuple[tuple, int]:
+    entries, offset = [], 0
+    for name, array in arrays.items():
+        entries.append((name, offset, tuple(int(s) for s in array.shape), array.dtype.str))
+        offset += -(-max(array.nbytes, 1) // ALIGNMENT) * ALIGNMENT
+    return tuple(entries), max(offset, 1)
+
+
+def _views(buffer, layout, writeable: bool = False) -> Dict[str, np.ndarray]:
+    views = {}
+    for name, offset, shape, dtype in layout:
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+        view.flags.writeable = writeable
+        views[name] = view
+    return views
+
+
+def _open_untracked(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block without leaving it registered for cleanup here."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Older Pythons register every attachment with the resource tracker, which
+    # unlinks the block when the tracker's processes have exited. Processes
+    # started by multiprocessing share the tracker of the process that started
+    # them, where a second registration is a no-op and unregistering would drop
+    # the publisher's own entry; so only a process running its own tracker, and
+    # not the publisher, unregisters the attachment again.
+    block = shared_memory.SharedMemory(name=name)
+    with _published_lock:
+        published = name in _published_names
+    if os.name == 'posix' and not published and multiprocessing.parent_process() is None:
+        # Registered under the POSIX name, which carries a leading slash
+        resource_tracker.unregister('/' + block.name, 'shared_memory')
+    return block
+
+
+class SharedArrays(Mapping):
+    """
+    A set of named arrays in one shared block, as published or as attached.
+
+    Behaves as a read-only mapping from name to np.ndarray view.
+    """
+
+    def __init__(self, handle: SharedArraysHandle, views: Dict[str, np.ndarray],
+                 resource, owner: bool):
+        self.handle = handle
+        self._views = views
+        self._resource = resource
+        self._owner = owner
+
+    @classmethod
+    def publish(cls, arrays: Mapping[str, np.ndarray], path: Optional[str] = None) -> 'SharedArrays':
+        """
+        Copy arrays into a new shared block owned by this process.
+
+        Args:
+            arrays: Arrays to share, by name
+            path: Back the block with this file (np.memmap) instead of shared memory;
+                  useful when workers run outside this process tree
+
+        Returns:
+            The owning SharedArrays; pass .handle to workers
+        """
+        arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        layout, size = _layout(arrays)
+        if path is None:
+            resource = shared_memory.SharedMemory(create=True, size=size)
+            buffer, location, kind = resource.buf, resource.name, 'shm'
+            with _published_lock:
+                _published_names.add(location)
+        else:
+            resource = np.memmap(path, dtype=np.uint8, mode='w+', shape=(size,))
+            buffer, location, kind = resource, os.path.abspath(path), 'file'
+        handle = SharedArraysHandle(kind, location, size, layout)
+        writable = _views(buffer, layout, writeable=True)
+        for name, array in arrays.items():
+            writable[name][...] = array
+        if kind == 'file':
+            resource.flush()
+        return cls(handle, _views(buffer, layout), resource, owner=True)
+
+    @classmethod
+    def attach(cls, handle: SharedArraysHandle) -> 'SharedArrays':
+        """Map a published block into this process as read-only views (no copy)."""
+        if handle.kind == 'shm':
+            resource = _open_untracked(handle.location)
+            buffer = resource.buf
+        else:
+            resource = np.memmap(handle.location, dtype=np.uint8, mode='r', shape=(handle.size,))
+            buffer = resource
+        return cls(handle, _views(buffer, handle.layout), resource, owner=False)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._views[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._views)
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    @property
+    def nbytes(self) -> int:
+        return self.handle.size
+
+    def close(self):
+        """
+        Release this process's mapping; the owner also deletes the block.
+
+        Views handed out earlier must not be used afterwards.
+        """
+        if self._resource is None:
+            return
+        self._views = {}
+        if self.handle.kind == 'shm':
+            try:
+                self._resource.close()
+            except BufferError:
+                # Views are still referenced elsewhere; the mapping goes with the process
+                pass
+            if self._owner:
+                self._resource.unlink()
+                with _published_lock:
+                    _published_names.discard(self.handle.location)
+        elif self._owner:
+            os.remove(self.handle.location)
+        self._resource = None
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        role = 'owner' if self._owner else 'attached'
+        return f"{type(self).__name__}({self.handle.kind}:{self.handle.location}, {len(self)} arrays, {self.nbytes} bytes, {role})"
+
+
+class SharedArtifacts(SharedArrays):
+    """The entries of an ArtifactCache published as one shared block."""
+
+    @classmethod
+    def publish(cls, cache: ArtifactCache, keys: Optional[List[str]] = None,
+                path: Optional[str] = None) -> 'SharedArtifacts':
+        """
+        Args:
+            cache: Cache whose in-memory entries (everything built or loaded so far) are shared
+            keys: Only share these cache keys (default: all in-memory entries)
+            path: Optional backing file, as in SharedArrays.publish
+        """
+        entries = cache.memory_entries(keys)
+        flat = {f'{key}/{name}': array for key, artifacts in entries.items()
+                for name, array in artifacts.items()}
+        return super().publish(flat, path)
+
+    def entries(self) -> Dict[str, Artifacts]:
+        """Views grouped back into artifact sets by cache key."""
+        grouped: Dict[str, Artifacts] = {}
+        for flat_name, view in self.items():
+            key, name = flat_name.split('/', 1)
+            grouped.setdefault(key, {})[name] = view
+        return grouped
+
+    def to_cache(self) -> ArtifactCache:
+        """A memory-only ArtifactCache pre-filled with the shared views."""
+        entries = self.entries()
+        cache = ArtifactCache(directory='', max_entries=max(32, 2 * len(entries)))
+        for key, artifacts in entries.items():
+            cache.remember(key, artifacts)
+        # Keep the mapping alive as long as the cache
+        cache.shared = self
+        return cache
+
+
+def install_shared_cache(handle: SharedArraysHandle) -> ArtifactCache:
+    """
+    Attach published artifacts and make them this process's default cache.
+
+    Meant as a ProcessPoolExecutor / multiprocessing.Pool initializer: every
+    code or decoder built afterwards with the default cache gets views onto
+    the shared block instead of private copies.
+    """
+    cache = SharedArtifacts.attach(handle).to_cache()
+    set_default_cache(cache)
+    return cache
@@ -0,0 +1,163 @@
+"""
+Minimal sparse binary matrices (CSR) for large LDPC check matrices.
+
+Quantum LDPC codes with 10^4-10^5 qubits have check matrices that are far too
+large to hold densely, but each row has only a handful of ones. CSRMatrix
+keeps just the column indices of those ones, row by row, and supports the
+operations the codes need: construction from coordinate lists with GF(2)
+cancellation, transposition, stacking, batched syndrome products and
+conversion to and from the artifact cache's CSR layout.
+"""
+
+import numpy as np
+from typing import Dict, Iterable, Tuple
+
+
+def _as_index_array(array) -> np.ndarray:
+    array = np.asarray(array)
+    return array if array.dtype.kind in 'iu' else array.astype(np.int64)
+
+
+class CSRMatrix:
+    """Binary matrix in compressed sparse row form (all stored entries are 1)."""
+
+    def __init__(self, indptr: np.ndarray, indices: np.ndarray, shape: Tuple[int, int]):
+        """
+        Args:
+            indptr: Row pointers of length rows + 1
+            indices: Column index of every one, sorted within each row
+            shape: (rows, columns)
+        """
+        # Integer index arrays are kept as given (e.g. int32 views onto shared or
+        # memory-mapped artifacts); anything else is converted to int64
+        self.indptr = _as_index_array(indptr)
+        self.indices = _as_index_array(indices)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+    @classmethod
+    def from_coo(cls, rows: np.ndarray, cols: np.ndarray, shape: Tuple[int, int]) -> 'CSRMatrix':
+        """
+        Build from coordinate lists. Entries listed an even number of times
+        cancel (addition over GF(2)).
+        """
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        cols = np.asarray(cols, dtype=np.int64).ravel()
+        keys, counts = np.unique(rows * shape[1] + cols, return_counts=True)
+        keys = keys[counts % 2 == 1]
+        rows, cols = np.divmod(keys, shape[1])
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols, shape)
+
+    @classmethod
+    def from_dense(cls, matrix: np.ndarray) -> 'CSRMatrix':
+        matrix = np.asarray(matrix) % 2
+        rows, cols = np.nonzero(matrix)
+        return cls.from_coo(rows, cols, matrix.shape)
+
+    @classmethod
+    def hstack(cls, blocks: Iterable['CSRMatrix']) -> 'CSRMatrix':
+        """Concatenate blocks with equal row counts side by side."""
+        blocks = list(blocks)
+        rows, cols, offset = [], [], 0
+        for block in blocks:
+            r, c = block.coo()
+            rows.append(r)
+            cols.append(c + offset)
+            offset += block.shape[1]
+        return cls.from_coo(np.concatenate(rows), np.concatenate(cols), (blocks[0].shape[0], offset))
+
+    @classmethod
+    def vstack(cls, blocks: Iterable['CSRMatrix']) -> 'CSRMatrix':
+        """Stack blocks with equal column counts on top of each other."""
+        blocks = list(blocks)
+        indptr = [np.zeros(1, dtype=np.int64)]
+        for block in blocks:
+            indptr.append(block.indptr[1:] + indptr[-1][-1])
+        return cls(np.concatenate(indptr), np.concatenate([b.indices for b in blocks]),
+                   (sum(b.shape[0] for b in blocks), blocks[0].shape[1]))
+
+    @classmethod
+    def block_diagonal(cls, matrix: np.ndarray, blocks: int) -> 'CSRMatrix':
+        """I_blocks (x) matrix for a small dense binary matrix, without densifying."""
+        matrix = np.asarray(matrix) % 2
+        r, c = matrix.shape
+        rows, cols = np.nonzero(matrix)
+        offsets = np.arange(blocks)[:, None]
+        return cls.from_coo((offsets * r + rows).ravel(), (offsets * c + cols).ravel(),
+                            (blocks * r, blocks * c))
+
+    def matmul(self, other: 'CSRMatrix') -> 'CSRMatrix':
+        """Product with another sparse matrix over GF(2)."""
+        rows, mids = self.coo()
+        counts = other.row_weights()[mids]
+        starts = np.repeat(other.indptr[mids], counts)
+        # Position of every emitted entry within its row of 'other'
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return CSRMatrix.from_coo(np.repeat(rows, counts), other.indices[starts + within],
+                                  (self.shape[0], other.shape[1]))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.indices)
+
+    def coo(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column index of every one."""
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return rows, self.indices
+
+    @property
+    def T(self) -> 'CSRMatrix':
+        rows, cols = self.coo()
+        return CSRMatrix.from_coo(cols, rows, (self.shape[1], self.shape[0]))
+
+    def row_weights(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def column_weights(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.shape[1])
+
+    def to_dense(self, dtype=np.uint8) -> np.ndarray:
+        """Materialize as a dense array (only sensible for small matrices)."""
+        dense = np.zeros(self.shape, dtype=dtype)
+        dense[self.coo()] = 1
+        return dense
+
+    def multiply(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Products with binary vectors over GF(2), without densifying the matrix.
+
+        Args:
+            vectors: Binary array of shape (columns,) or (shots, columns)
+
+        Returns:
+            uint8 array of shape (rows,) or (shots, rows)
+        """
+        vectors = np.asarray(vectors)
+        single = vectors.ndim == 1
+        vectors = np.atleast_2d(vectors)
+        # Prefix sums of the gathered entries, differenced at the row pointers,
+        # give every row's sum even for empty rows.
+        gathered = (vectors[:, self.indices] & 1).astype(np.int32)
+        prefix = np.zeros((len(vectors), self.nnz + 1), dtype=np.int32)
+        np.cumsum(gathered, axis=1, out=prefix[:, 1:])
+        products = ((prefix[:, self.indptr[1:]] - prefix[:, self.indptr[:-1]]) & 1).astype(np.uint8)
+        return products[0] if single else products
+
+    def to_artifacts(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Arrays in the artifact cache's CSR layout, named '<prefix>_<part>'."""
+        return {
+            f'{prefix}_indptr': self.indptr,
+            f'{prefix}_indices': self.indices.astype(np.int32),
+            f'{prefix}_data': np.ones(self.nnz, dtype=np.uint8),
+            f'{prefix}_shape': np.array(self.shape, dtype=np.int64),
+        }
+
+    @classmethod
+    def from_artifacts(cls, artifacts: Dict[str, np.ndarray], prefix: str) -> 'CSRMatrix':
+        return cls(artifacts[f'{prefix}_indptr'], artifacts[f'{prefix}_indices'],
+                   tuple(artifacts[f'{prefix}_shape']))
+
+    def __repr__(self):
+        return f"CSRMatrix(shape={self.shape}, nnz={self.nnz})"
+
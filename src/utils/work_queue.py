@@ -0,0 +1,286 @@
+"""
+Work queue coordinated through a shared directory, without a broker.
+
+Any process that can see the directory (local processes, or nodes mounting
+the same network filesystem) can act as a worker. Layout:
+
+    root/tasks/<id>.json      task payloads, written once by submit()
+    root/leases/<id>.lease    held while a worker runs the task
+    root/results/<id>.json    result shard of a finished task
+    root/errors/<id>.json     last traceback of a task that raised
+
+Every state change is a single atomic filesystem operation. A lease is
+taken with O_CREAT | O_EXCL, so exactly one worker wins. Shards are
+written to a temporary file and renamed into place, so readers never see
+half a result.
+
+While it runs a task, a worker touches its lease every heartbeat seconds.
+A lease whose mtime is older than lease_timeout belongs to a dead or hung
+worker. The first worker to rename the stale lease away reclaims the task,
+unless the renamed lease turns out to be fresh (its owner beat in between),
+in which case it is linked back into place.
+Lease ages are measured against the filesystem's own clock (the mtime of a
+freshly touched probe file), so clock skew between nodes does not matter.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+# Tasks that raised this many times are skipped by claim()
+MAX_ATTEMPTS = 3
+
+
+def _write_atomic(path: str, payload: Dict):
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary, 'w') as handle:
+        json.dump(payload, handle)
+    os.replace(temporary, path)
+
+
+def _read(path: str) -> Optional[Dict]:
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def default_worker_id() -> str:
+    """host:pid, unique across the nodes sharing a queue."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class DirectoryQueue:
+    """
+    Tasks, leases and result shards in a shared directory.
+
+    Args:
+        root: Queue directory (created if missing)
+        lease_timeout: Seconds without a heartbeat after which a lease is reclaimed
+        heartbeat: Seconds between heartbeats of a running task
+    """
+
+    def __init__(self, root: str, lease_timeout: float = 60.0, heartbeat: float = 10.0):
+        if heartbeat >= lease_timeout:
+            raise ValueError("heartbeat must be shorter than lease_timeout.")
+        self.root = os.path.abspath(root)
+        self.lease_timeout = lease_timeout
+        self.heartbeat = heartbeat
+        for sub in ('tasks', 'leases', 'results', 'errors'):
+            os.makedirs(os.path.join(self.root, sub), exist_ok=True)
+
+    def _path(self, kind: str, task_id: str) -> str:
+        suffix = '.lease' if kind == 'leases' else '.json'
+        return os.path.join(self.root, kind, task_id + suffix)
+
+    def _ids(self, kind: str) -> Iterator[str]:
+        suffix = '.lease' if kind == 'leases' else '.json'
+        for name in os.listdir(os.path.join(self.root, kind)):
+            if name.endswith(suffix):
+                yield name[:-len(suffix)]
+
+    def _now(self) -> float:
+        """Current time on the shared filesystem's clock."""
+        probe = os.path.join(self.root, '.clock')
+        with open(probe, 'a'):
+            os.utime(probe)
+        return os.stat(probe).st_mtime
+
+    # --- Producer side ---
+
+    def submit(self, tasks: Dict[str, Dict]) -> int:
+        """
+        Add tasks by id; ids already present (pending or done) are left alone,
+        so resubmitting an interrupted sweep only adds what is missing.
+
+        Returns:
+            Number of tasks added
+        """
+        added = 0
+        for task_id, payload in tasks.items():
+            if os.sep in task_id or task_id.startswith('.'):
+                raise ValueError(f"Invalid task id {task_id!r}.")
+            path = self._path('tasks', task_id)
+            if not os.path.exists(path):
+                _write_atomic(path, payload)
+                added += 1
+        return added
+
+    def status(self) -> Dict[str, int]:
+        """Counts of 'tasks', 'done', 'leased' and 'failed' (raised MAX_ATTEMPTS times)."""
+        tasks, done = set(self._ids('tasks')), set(self._ids('results'))
+        failed = {task_id for task_id in self._ids('errors') if task_id not in done
+                  and (_read(self._path('errors', task_id)) or {}).get('attempts', 0) >= MAX_ATTEMPTS}
+        return {'tasks': len(tasks), 'done': len(done & tasks),
+                'leased': len(set(self._ids('leases')) - done), 'failed': len(failed)}
+
+    def finished(self) -> bool:
+        """True once every task has a result shard or has failed for good."""
+        status = self.status()
+        return status['done'] + status['failed'] >= status['tasks']
+
+    def results(self) -> Dict[str, Dict]:
+        """All result shards, by task id."""
+        return {task_id: _read(self._path('results', task_id)) for task_id in sorted(self._ids('results'))}
+
+    def wait(self, poll: float = 1.0, timeout: Optional[float] = None,
+             check: Optional[Callable[[], None]] = None) -> Dict[str, Dict]:
+        """
+        Block until finished(), then return results().
+
+        Args:
+            poll: Seconds between checks
+            timeout: Raise TimeoutError after this many seconds
+            check: Called before every poll; raise from it to stop waiting
+                   (e.g. when the local workers died)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.finished():
+            if check is not None:
+                check()
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Queue {self.root} not finished after {timeout} s: {self.status()}")
+            time.sleep(poll)
+        return self.results()
+
+    # --- Worker side ---
+
+    def _try_lease(self, task_id: str, worker_id: str) -> bool:
+        path = self._path('leases', task_id)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                age = self._now() - os.stat(path).st_mtime
+            except FileNotFoundError:
+                return False
+            if age < self.lease_timeout:
+                return False
+            # Stale: whoever renames it away first may retry the exclusive create
+            stale = f"{path}.{uuid.uuid4().hex}.stale"
+            try:
+                os.rename(path, stale)
+            except FileNotFoundError:
+                return False
+            # The owner may have beaten between the age check and the rename
+            if self._now() - os.stat(stale).st_mtime < self.lease_timeout:
+                try:
+                    os.link(stale, path)  # no-clobber: a lease taken meanwhile wins
+                except FileExistsError:
+                    pass
+                os.remove(stale)
+                return False
+            os.remove(stale)
+            return self._try_lease(task_id, worker_id)
+        with os.fdopen(fd, 'w') as handle:
+            handle.write(worker_id)
+        return True
+
+    def claim(self, worker_id: Optional[str] = None) -> Optional[Tuple[str, Dict]]:
+        """
+        Lease one unfinished task.
+
+        Returns:
+            (task id, payload), or None if every task is done or leased
+        """
+        worker_id = worker_id or default_worker_id()
+        done = set(self._ids('results'))
+        pending = [task_id for task_id in self._ids('tasks') if task_id not in done]
+        # Workers start at different offsets so that they rarely race for the same lease
+        offset = hash(worker_id) % len(pending) if pending else 0
+        for task_id in pending[offset:] + pending[:offset]:
+            error = _read(self._path('errors', task_id))
+            if error is not None and error.get('attempts', 0) >= MAX_ATTEMPTS:
+                continue
+            if not self._try_lease(task_id, worker_id):
+                continue
+            # The task may have finished between listing and leasing
+            if os.path.exists(self._path('results', task_id)):
+                self.release(task_id)
+                continue
+            payload = _read(self._path('tasks', task_id))
+            if payload is not None:
+                return task_id, payload
+            self.release(task_id)
+        return None
+
+    def touch(self, task_id: str):
+        """Heartbeat: refresh a held lease."""
+        try:
+            os.utime(self._path('leases', task_id))
+        except FileNotFoundError:
+            pass
+
+    def release(self, task_id: str):
+        """Drop a lease without recording a result."""
+        try:
+            os.remove(self._path('leases', task_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, task_id: str, result: Dict):
+        """Write the task's result shard and drop its lease."""
+        _write_atomic(self._path('results', task_id), result)
+        self.release(task_id)
+
+    def fail(self, task_id: str, error: str):
+        """Record a raised exception and drop the lease so the task can be retried."""
+        previous = _read(self._path('errors', task_id)) or {}
+        _write_atomic(self._path('errors', task_id),
+                      {'attempts': previous.get('attempts', 0) + 1, 'error': error})
+        self.release(task_id)
+
+    def work(self, run: Callable[[Dict], Dict], worker_id: Optional[str] = None,
+             poll: float = 1.0, max_tasks: Optional[int] = None) -> int:
+        """
+        Claim and run tasks until the queue is finished.
+
+        While a task runs, a background thread keeps its lease alive. A task
+        that raises is recorded in errors/ and left for a retry.
+
+        Args:
+            run: Maps a task payload to its (JSON-serializable) result
+            worker_id: Name recorded in leases (default host:pid)
+            poll: Seconds to wait when every open task is leased by someone else
+            max_tasks: Stop after this many tasks
+
+        Returns:
+            Number of tasks this worker completed
+        """
+        worker_id = worker_id or default_worker_id()
+        completed = 0
+        while max_tasks is None or completed < max_tasks:
+            claimed = self.claim(worker_id)
+            if claimed is None:
+                if self.finished():
+                    break
+                time.sleep(poll)
+                continue
+            task_id, payload = claimed
+            stop = threading.Event()
+            beat = threading.Thread(target=self._beat, args=(task_id, stop), daemon=True)
+            beat.start()
+            try:
+                result = run(payload)
+            except Exception:
+                self.fail(task_id, traceback.format_exc())
+                continue
+            finally:
+                stop.set()
+                beat.join()
+            self.complete(task_id, dict(result, worker=worker_id))
+            completed += 1
+        return completed
+
+    def _beat(self, task_id: str, stop: threading.Event):
+        while not stop.wait(self.heartbeat):
+            self.touch(task_id)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.root!r}, {self.status()})"
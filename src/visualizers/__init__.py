@@ -2,4 +2,15 @@
 Visualization logic for QEC structures (Fano planes, lattices, syndromes).
 """
 
-__all__ = []
+from ..utils.lazy import lazy_exports
+
+_EXPORTS = {
+    'SixHundredCell': '.six_hundred_cell',
+    'six_hundred_cell_vertices': '.six_hundred_cell',
+    'load_asset': '.six_hundred_cell',
+    'SyndromeStateTable': '.state_tables',
+    'load_state_table': '.state_tables',
+}
+
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
@@ -0,0 +1,85 @@
+"""
+Compact binary assets for the browser frontends.
+
+An asset is one file that a page fetches once and views with typed arrays,
+without parsing or copying. Layout (little endian):
+
+    4-byte magic | uint32 header length | UTF-8 JSON header | arrays
+
+The header holds free-form metadata and, under 'arrays', the dtype, shape
+and byte offset of every array, relative to the end of the header. Arrays
+(and the start of the data) are 4-byte aligned, so that Uint32Array and
+Float32Array views are legal. 64-bit arrays are 8-byte aligned.
+"""
+
+import json
+import struct
+import numpy as np
+from typing import Dict, Mapping, Tuple
+
+
+def _align(offset: int, alignment: int) -> int:
+    return -(-offset // alignment) * alignment
+
+
+def write_asset(path: str, magic: bytes, arrays: Mapping[str, np.ndarray], **meta) -> Dict:
+    """
+    Write named arrays and metadata as one binary asset.
+
+    Args:
+        path: Output file
+        magic: 4-byte file signature
+        arrays: Arrays by name, written in order
+        **meta: JSON-serializable metadata stored in the header
+
+    Returns:
+        The header dictionary
+    """
+    if len(magic) != 4:
+        raise ValueError(f"Asset magic must be 4 bytes, got {magic!r}.")
+    arrays = {name: np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder('<'))
+              for name, array in arrays.items()}
+    header = dict(meta, arrays={})
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset, max(4, array.dtype.itemsize))
+        header['arrays'][name] = {'dtype': array.dtype.name, 'shape': list(array.shape),
+                                  'offset': offset}
+        offset += array.nbytes
+    encoded = json.dumps(header, separators=(',', ':')).encode()
+    encoded += b' ' * (-(len(encoded) + 8) % 8)  # data starts 8-byte aligned
+
+    with open(path, 'wb') as handle:
+        handle.write(magic + struct.pack('<I', len(encoded)) + encoded)
+        written = 0
+        for name, array in arrays.items():
+            handle.write(b'\0' * (header['arrays'][name]['offset'] - written))
+            handle.write(array.tobytes())
+            written = header['arrays'][name]['offset'] + array.nbytes
+    return header
+
+
+def read_asset(path: str, magic: bytes) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """
+    Read an asset written by write_asset.
+
+    Returns:
+        (header, arrays); arrays are read-only views onto the file contents
+
+    Raises:
+        ValueError: If the file does not start with magic
+    """
+    with open(path, 'rb') as handle:
+        blob = handle.read()
+    if blob[:4] != magic:
+        raise ValueError(f"{path} is not a {magic.decode(errors='replace')} asset.")
+    (length,) = struct.unpack('<I', blob[4:8])
+    header = json.loads(blob[8:8 + length])
+    start = 8 + length
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype']).newbyteorder('<')
+        count = int(np.prod(spec['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(blob, dtype=dtype, count=count,
+                                     offset=start + spec['offset']).reshape(spec['shape'])
+    return header, arrays
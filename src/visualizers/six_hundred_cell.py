@@ -0,0 +1,219 @@
+"""
+600-cell geometry backend for the Gottesman Protocol game.
+
+The 600-cell ("hyper-crystal") has 120 vertices, 720 edges, 1200 triangular
+faces and 600 tetrahedral cells. In the game the vertices are qubits and
+the cells are stabilizers (docs/design/GOTTESMAN-GAME.md). The frontend used
+to regenerate the vertices, find the edges by an O(V^2) distance scan, and
+rotate and project every vertex in JavaScript on every frame.
+
+SixHundredCell builds the combinatorics once, caches them as artifacts and
+provides:
+
+- CSR neighbour and cell-incidence indexes;
+- the cell-qubit stabilizer matrix with batched syndromes;
+- rotate-and-project for a whole batch of frames in one vectorized call;
+- export_asset(), which writes everything into one compact binary file
+  that the page loads once.
+
+Rotations and the projection match gottesmann-game.html. The xw, yw and
+zw plane rotations are applied in that order. The stereographic projection
+is v3 = (x, y, z) / (R - w), with R = 2.5.
+"""
+
+import numpy as np
+from itertools import permutations
+from typing import Dict, Optional
+
+from ..utils.artifact_cache import ArtifactCache, default_cache
+from ..utils.sparse import CSRMatrix
+from .assets import read_asset, write_asset
+
+PHI = (1 + 5 ** 0.5) / 2
+
+# Edge length of the unit-radius 600-cell
+EDGE_LENGTH = 1 / PHI
+
+PROJECTION_DISTANCE = 2.5
+
+ASSET_MAGIC = b'C600'
+ASSET_VERSION = 1
+
+
+def _even_permutations():
+    for perm in permutations(range(4)):
+        inversions = sum(perm[i] > perm[j] for i in range(4) for j in range(i + 1, 4))
+        if inversions % 2 == 0:
+            yield perm
+
+
+def six_hundred_cell_vertices() -> np.ndarray:
+    """
+    The 120 unit vectors of the 600-cell, shape (120, 4):
+    8 of the form (+-1, 0, 0, 0), 16 of the form (+-1/2, +-1/2, +-1/2, +-1/2)
+    and 96 even permutations of (+-phi, +-1, +-1/phi, 0) / 2.
+    """
+    signs = np.array([[1 - 2 * ((i >> b) & 1) for b in range(4)] for i in range(16)], dtype=np.float64)
+    axis = np.vstack([np.eye(4), -np.eye(4)])
+    half = signs / 2
+    seed = np.array([PHI, 1.0, 1 / PHI, 0.0]) / 2
+    golden = np.array([[seed[p] for p in perm] for perm in _even_permutations()])
+    # Sign flips of the zero coordinate produce duplicates, kept once
+    golden = np.unique(np.round((golden[:, None, :] * signs[None, :, :]).reshape(-1, 4), 12), axis=0)
+    return np.vstack([axis, half, golden])
+
+
+class SixHundredCell:
+    """
+    Combinatorics, stabilizers and projections of the 600-cell.
+
+    Attributes:
+        vertices: (120, 4) float64 unit vectors; vertex i is qubit i
+        edges: (720, 2) vertex pairs, i < j
+        faces: (1200, 3) triangles, sorted
+        cells: (600, 4) tetrahedra, sorted; cell c is stabilizer c
+        neighbours: CSRMatrix (120 x 120) adjacency; every vertex has 12 neighbours
+        vertex_cells: CSRMatrix (120 x 600) incidence; every vertex lies in 20 cells
+        H: CSRMatrix (600 x 120) cell-qubit stabilizer matrix
+    """
+    CACHE_VERSION = 1
+
+    def __init__(self, cache: Optional[ArtifactCache] = None):
+        """
+        Args:
+            cache: Artifact cache for the combinatorics (default: the process-wide cache)
+        """
+        cache = default_cache() if cache is None else cache
+        artifacts = cache.get_or_build('SixHundredCell', {}, self._build, version=self.CACHE_VERSION)
+        self.vertices = artifacts['vertices']
+        self.edges = artifacts['edges']
+        self.faces = artifacts['faces']
+        self.cells = artifacts['cells']
+        n, m = len(self.vertices), len(self.cells)
+        self.neighbours = CSRMatrix(artifacts['neighbour_indptr'], artifacts['neighbour_indices'], (n, n))
+        self.H = CSRMatrix(np.arange(0, 4 * m + 1, 4), self.cells.ravel(), (m, n))
+        self.vertex_cells = self.H.T
+
+    @staticmethod
+    def _build() -> Dict[str, np.ndarray]:
+        vertices = six_hundred_cell_vertices()
+        distances = np.linalg.norm(vertices[:, None, :] - vertices[None, :, :], axis=2)
+        adjacent = np.abs(distances - EDGE_LENGTH) < 1e-6
+        edges = np.argwhere(np.triu(adjacent))
+
+        # Triangles: edges (i, j) plus a common neighbour k > j; cells: triangles
+        # plus a common neighbour l > k. Every simplex is found once, sorted.
+        common = adjacent[edges[:, 0]] & adjacent[edges[:, 1]]
+        e_idx, k = np.nonzero(common)
+        keep = k > edges[e_idx, 1]
+        faces = np.column_stack([edges[e_idx[keep]], k[keep]])
+        common = adjacent[faces[:, 0]] & adjacent[faces[:, 1]] & adjacent[faces[:, 2]]
+        f_idx, l = np.nonzero(common)
+        keep = l > faces[f_idx, 2]
+        cells = np.column_stack([faces[f_idx[keep]], l[keep]])
+
+        rows, cols = np.nonzero(adjacent)
+        indptr = np.zeros(len(vertices) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(vertices)), out=indptr[1:])
+        return {
+            'vertices': vertices,
+            'edges': edges.astype(np.int32),
+            'faces': faces.astype(np.int32),
+            'cells': cells.astype(np.int32),
+            'neighbour_indptr': indptr,
+            'neighbour_indices': cols.astype(np.int32),
+        }
+
+    def syndromes(self, errors: np.ndarray) -> np.ndarray:
+        """
+        Lit cells for a batch of qubit flips.
+
+        Args:
+            errors: Binary array of shape (120,) or (shots, 120)
+
+        Returns:
+            uint8 array of shape (600,) or (shots, 600); a cell is lit when an
+            odd number of its four vertices are flipped
+        """
+        return self.H.multiply(errors)
+
+    @staticmethod
+    def rotation_matrices(angles: np.ndarray) -> np.ndarray:
+        """
+        4D rotations for a batch of (xw, yw, zw) angle triples.
+
+        Args:
+            angles: Array of shape (frames, 3), radians
+
+        Returns:
+            (frames, 4, 4) matrices R with rotated = R @ v, applying the
+            xw, yw and zw plane rotations in that order
+        """
+        angles = np.atleast_2d(np.asarray(angles, dtype=np.float64))
+        frames = len(angles)
+        R = np.broadcast_to(np.eye(4), (frames, 4, 4)).copy()
+        for axis in range(3):
+            c, s = np.cos(angles[:, axis]), np.sin(angles[:, axis])
+            plane = np.broadcast_to(np.eye(4), (frames, 4, 4)).copy()
+            plane[:, axis, axis] = c
+            plane[:, axis, 3] = -s
+            plane[:, 3, axis] = s
+            plane[:, 3, 3] = c
+            R = plane @ R
+        return R
+
+    def project(self, angles: np.ndarray, distance: float = PROJECTION_DISTANCE) -> np.ndarray:
+        """
+        Rotate and stereographically project the vertices for many frames at once.
+
+        Args:
+            angles: (frames, 3) array of (xw, yw, zw) angles in radians
+            distance: Projection distance R
+
+        Returns:
+            float32 array of shape (frames, 120, 3)
+        """
+        rotated = np.einsum('fij,vj->fvi', self.rotation_matrices(angles), self.vertices)
+        return (rotated[..., :3] / (distance - rotated[..., 3:])).astype(np.float32)
+
+    def orbit_angles(self, frames: int, rates=(1.0, 0.618, 0.382)) -> np.ndarray:
+        """Angles (frames, 3) for one smooth loop, each plane turning at its own rate."""
+        t = np.linspace(0.0, 2 * np.pi, frames, endpoint=False)
+        return np.outer(t, rates)
+
+    def export_asset(self, path: str, angles: Optional[np.ndarray] = None,
+                     distance: float = PROJECTION_DISTANCE) -> Dict:
+        """
+        Write the geometry (and optionally precomputed frames) as one binary asset.
+
+        The file uses the layout from visualizers.assets, with magic 'C600', so
+        that the page can view every array with typed arrays without copying.
+
+        Args:
+            path: Output file
+            angles: Optional (frames, 3) rotation angles to precompute projections for
+            distance: Projection distance R
+
+        Returns:
+            The header dictionary
+        """
+        arrays = {
+            'vertices': self.vertices.astype(np.float32),
+            'edges': self.edges.astype(np.uint16),
+            'cells': self.cells.astype(np.uint16),
+            'neighbour_indptr': self.neighbours.indptr.astype(np.uint16),
+            'neighbour_indices': self.neighbours.indices.astype(np.uint16),
+            'vertex_cell_indptr': self.vertex_cells.indptr.astype(np.uint16),
+            'vertex_cell_indices': self.vertex_cells.indices.astype(np.uint16),
+        }
+        if angles is not None:
+            arrays['angles'] = np.atleast_2d(np.asarray(angles, dtype=np.float32))
+            arrays['frames'] = self.project(angles, distance)
+
+        return write_asset(path, ASSET_MAGIC, arrays, version=ASSET_VERSION,
+                           projection_distance=distance)
+
+
+def load_asset(path: str) -> Dict[str, np.ndarray]:
+    """Read an asset written by SixHundredCell.export_asset back into arrays."""
+    return read_asset(path, ASSET_MAGIC)[1]
@@ -0,0 +1,176 @@
+"""
+Precomputed highlight and syndrome state tables for the syndrome visualizers.
+
+fano-plane-syndrome-visualizer.html works out, for the selected check, which
+nodes to highlight and whether the check fires. It scans lists in
+JavaScript on every click. The same facts follow from the code alone, so
+they are enumerated here once, for every error pattern and every
+selectable check, and packed into integer bitmasks. The page then answers
+any (selection, error) question with one array read:
+
+    word = state[selection * 2**n + error]       (error: bit i = qubit i)
+
+Bits of a state word, with n qubits and m syndrome checks:
+
+    [0, n)           qubits that carry an error inside the selected support
+    n                the selected check fires (odd overlap with the error)
+    [n + 1, n+1+m)   full syndrome of the error (bit j = check j)
+
+Per selection, 'highlights' and 'supports' give the node masks to draw
+(a Fano line and its 4-qubit complement, or a color code face and
+itself). 'corrections' maps each syndrome to the minimum-weight lookup
+correction. Tables are built for any check matrix up to MAX_TABLE_QUBITS
+qubits, so the Steane code and the small color codes share one exporter.
+They are cached as artifacts and written as versioned binary assets.
+"""
+
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+from ..core.decoders import LookupTableDecoder
+from ..utils.artifact_cache import ArtifactCache, default_cache
+from ..utils.gf2 import matrix_key
+from .assets import read_asset, write_asset
+
+# Dense tables hold num_selections * 2^n words
+MAX_TABLE_QUBITS = 20
+
+ASSET_MAGIC = b'SYST'
+TABLE_VERSION = 1
+
+
+def _masks(rows: Sequence[Sequence[int]], n: int) -> np.ndarray:
+    """Qubit index lists as bitmasks (bit i = qubit i)."""
+    masks = np.zeros(len(rows), dtype=np.uint64)
+    for index, row in enumerate(rows):
+        for q in row:
+            masks[index] |= np.uint64(1) << np.uint64(q)
+    return masks
+
+
+def _pack(bits: np.ndarray) -> np.ndarray:
+    """Rows of a binary matrix as integers (column i -> bit i)."""
+    weights = np.uint64(1) << np.arange(bits.shape[1], dtype=np.uint64)
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+class SyndromeStateTable:
+    """
+    Every (selected check, error pattern) visualizer state of a small code.
+
+    Attributes:
+        H: (m, n) syndrome check matrix
+        highlights: (S,) node masks drawn as the selection itself
+        supports: (S,) node masks of the selected checks
+        state: (S, 2^n) packed state words (layout in the module docstring)
+        syndromes: (2^n,) syndrome mask of every error pattern
+        corrections: (2^m,) lookup-decoder correction mask of every syndrome
+    """
+
+    def __init__(self, H: np.ndarray, supports: Sequence[Sequence[int]],
+                 highlights: Optional[Sequence[Sequence[int]]] = None,
+                 cache: Optional[ArtifactCache] = None):
+        """
+        Args:
+            H: Binary syndrome check matrix (m, n), n <= MAX_TABLE_QUBITS
+            supports: Qubits of every selectable check
+            highlights: Qubits drawn as each selection (default: its support)
+            cache: Artifact cache for the tables (default: the process-wide cache)
+        """
+        self.H = np.asarray(H, dtype=np.uint8) % 2
+        self.m, self.n = self.H.shape
+        if self.n > MAX_TABLE_QUBITS:
+            raise ValueError(f"A dense state table for {self.n} qubits needs 2^{self.n} entries per check; "
+                             f"the limit is {MAX_TABLE_QUBITS} qubits.")
+        self.supports = _masks(supports, self.n)
+        self.highlights = _masks(supports if highlights is None else highlights, self.n)
+        if len(self.highlights) != len(self.supports):
+            raise ValueError("Need one highlight per selectable check.")
+        self.word_dtype = np.uint32 if self.n + 1 + self.m <= 32 else np.uint64
+
+        cache = default_cache() if cache is None else cache
+        params = {'H': matrix_key(self.H, self.supports, self.highlights)}
+        artifacts = cache.get_or_build('SyndromeStateTable', params, self._build, version=TABLE_VERSION)
+        self.state = artifacts['state']
+        self.syndromes = artifacts['syndromes']
+        self.corrections = artifacts['corrections']
+
+    @classmethod
+    def for_steane(cls, code=None, cache: Optional[ArtifactCache] = None) -> 'SyndromeStateTable':
+        """Fano-plane table: selections are the 7 lines, supports their 4-qubit complements."""
+        from ..codes.steane import SteaneCode
+        code = SteaneCode() if code is None else code
+        return cls(code.H, code.fano_complements, code.fano_lines, cache=cache)
+
+    @classmethod
+    def for_color_code(cls, code, cache: Optional[ArtifactCache] = None) -> 'SyndromeStateTable':
+        """Color code table: selections are the faces of a TriangularColorCode."""
+        return cls(code.H, code.face_qubits, cache=cache)
+
+    def _build(self) -> Dict[str, np.ndarray]:
+        n, m = self.n, self.m
+        errors = np.arange(1 << n, dtype=np.uint64)
+        bits = ((errors[:, None] >> np.arange(n, dtype=np.uint64)) & np.uint64(1)).astype(np.uint8)
+        syndromes = _pack((bits.astype(np.int64) @ self.H.T.astype(np.int64)) % 2)
+
+        # One row per selection: errors inside the support, the parity bit, the syndrome
+        inside = errors[None, :] & self.supports[:, None]
+        parity = np.zeros(inside.shape, dtype=np.uint64)
+        for q in range(n):
+            parity ^= (inside >> np.uint64(q)) & np.uint64(1)
+        state = inside | (parity << np.uint64(n)) | (syndromes[None, :] << np.uint64(n + 1))
+
+        decoder = LookupTableDecoder(self.H)
+        all_syndromes = ((np.arange(1 << m)[:, None] >> np.arange(m)) & 1).astype(np.uint8)
+        corrections = _pack(decoder.decode_batch(all_syndromes))
+        return {
+            'state': state.astype(self.word_dtype),
+            'syndromes': syndromes.astype(self.word_dtype),
+            'corrections': corrections.astype(self.word_dtype),
+        }
+
+    def lookup(self, selection: int, error: int) -> Dict:
+        """Unpack one state word, e.g. to check the table against the page."""
+        word = int(self.state[selection, error])
+        n = self.n
+        return {
+            'highlight': [q for q in range(n) if (int(self.highlights[selection]) >> q) & 1],
+            'support': [q for q in range(n) if (int(self.supports[selection]) >> q) & 1],
+            'errors_in_support': [q for q in range(n) if (word >> q) & 1],
+            'fires': bool((word >> n) & 1),
+            'syndrome': [(word >> (n + 1 + j)) & 1 for j in range(self.m)],
+        }
+
+    def export_asset(self, path: str) -> Dict:
+        """
+        Write the tables as a binary asset (layout from visualizers.assets, magic 'SYST').
+
+        The header records the table version, n, m and a content key, so that
+        a page can detect a stale asset.
+
+        Returns:
+            The header dictionary
+        """
+        arrays = {
+            'highlights': self.highlights.astype(self.word_dtype),
+            'supports': self.supports.astype(self.word_dtype),
+            'state': self.state,
+            'syndromes': self.syndromes,
+            'corrections': self.corrections,
+        }
+        key = matrix_key(self.H, self.supports, self.highlights)
+        return write_asset(path, ASSET_MAGIC, arrays, version=TABLE_VERSION, key=key,
+                           n=self.n, m=self.m, H=self.H.tolist())
+
+
+def load_state_table(path: str) -> Dict[str, np.ndarray]:
+    """
+    Read a state table asset back into arrays.
+
+    Raises:
+        ValueError: If the asset was written by a different TABLE_VERSION
+    """
+    header, arrays = read_asset(path, ASSET_MAGIC)
+    if header.get('version') != TABLE_VERSION:
+        raise ValueError(f"{path} holds state table version {header.get('version')}, expected {TABLE_VERSION}.")
+    return arrays
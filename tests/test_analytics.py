@@ -0,0 +1,45 @@
+import os
+
+import numpy as np
+
+from src.codes.steane import SteaneGame
+from src.core.decoders import default_decoders
+from src.games.analytics import SessionRecorder, analyze_sessions, iter_session_chunks
+
+
+def _record(directory, rounds=500, chunk_size=37):
+    game = SteaneGame()
+    np.random.seed(0)
+    rng = np.random.default_rng(0)
+    recorder = SessionRecorder(str(directory), chunk_size=chunk_size)
+    for _ in range(rounds):
+        info = game.play_round()
+        # Right most of the time, otherwise a random qubit
+        guess = info['true_locations'] if rng.random() < 0.7 else int(rng.integers(0, 7))
+        recorder.record(info, guess, float(rng.exponential(5.0)))
+    recorder.flush()
+    return game, recorder.files_written
+
+
+def test_chunked_analysis_equals_one_chunk(tmp_path):
+    game, files = _record(tmp_path / 'rounds')
+    assert len(files) == 14
+    decoders = default_decoders(game.code)
+    n_checks = game.code.H.shape[0]
+    streamed = analyze_sessions(iter_session_chunks(files, chunk_size=11), decoders, n_checks)
+    merged = {name: np.concatenate([chunk[name] for chunk in iter_session_chunks(files)])
+              for name in ('syndrome', 'true_mask', 'guess_mask', 'response_time')}
+    whole = analyze_sessions([merged], decoders, n_checks)
+
+    assert streamed.total_rounds == whole.total_rounds == 500
+    np.testing.assert_array_equal(streamed.syndromes, whole.syndromes)
+    for name, values in whole.columns.items():
+        np.testing.assert_allclose(streamed.columns[name], values, rtol=1e-12)
+    assert streamed.decoder_summary() == whole.decoder_summary()
+
+    streamed_paths = streamed.write_tables(str(tmp_path / 'streamed'))
+    whole_paths = whole.write_tables(str(tmp_path / 'whole'))
+    for a, b in zip(streamed_paths, whole_paths):
+        assert os.path.basename(a) == os.path.basename(b)
+        with open(a) as left, open(b) as right:
+            assert left.read() == right.read()
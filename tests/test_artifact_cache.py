@@ -0,0 +1,66 @@
+import threading
+
+import numpy as np
+
+from src.core.code_abstractions import ToricCode, calculate_syndrome
+from src.utils.artifact_cache import ArtifactCache
+from src.utils.sparse import CSRMatrix
+
+
+def _build():
+    return {'table': np.arange(12, dtype=np.int32).reshape(3, 4)}
+
+
+def test_memory_hits_and_misses():
+    cache = ArtifactCache(directory=None)
+    first = cache.get_or_build('owner', {'n': 3}, _build)
+    second = cache.get_or_build('owner', {'n': 3}, _build)
+    assert second is first
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_disk_entries_are_memory_mapped_in_a_new_cache(tmp_path):
+    ArtifactCache(directory=str(tmp_path)).get_or_build('owner', {'n': 3}, _build)
+    cache = ArtifactCache(directory=str(tmp_path))
+    artifacts = cache.get('owner', {'n': 3})
+    assert isinstance(artifacts['table'], np.memmap)
+    np.testing.assert_array_equal(artifacts['table'], _build()['table'])
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_parameters_and_version_change_the_key(tmp_path):
+    cache = ArtifactCache(directory=str(tmp_path))
+    cache.get_or_build('owner', {'n': 3}, _build)
+    assert cache.get('owner', {'n': 4}) is None
+    assert cache.get('owner', {'n': 3}, version=2) is None
+    assert cache.stats()['misses'] == 3
+
+
+def test_concurrent_counters_add_up(tmp_path):
+    cache = ArtifactCache(directory=str(tmp_path))
+    lookups, threads = 200, 8
+
+    def look_up():
+        for i in range(lookups):
+            cache.get('owner', {'n': i % 5})
+
+    workers = [threading.Thread(target=look_up) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert cache.stats()['misses'] == lookups * threads
+
+
+def test_toric_code_checks_stay_sparse(tmp_path):
+    code = ToricCode(4, cache=ArtifactCache(directory=str(tmp_path)))
+    assert isinstance(code.Hx, CSRMatrix) and isinstance(code.Hz, CSRMatrix)
+    Hx, Hz = code.get_css_matrices()
+    assert Hx.shape == Hz.shape == (16, 32)
+    assert (Hx.sum(axis=1) == 4).all() and (Hz.sum(axis=1) == 4).all()
+    assert not ((Hx.astype(int) @ Hz.T) % 2).any()
+
+    errors = np.random.default_rng(0).integers(0, 2, (32, 10))
+    dense = (code.get_stabilizer_matrix().astype(int) @ errors) % 2
+    np.testing.assert_array_equal(calculate_syndrome(code, errors), dense)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.codes.reed_muller import ReedMullerCode
+from src.codes.steane import SteaneCode
+from src.core.code_abstractions import QuditSurfaceCode, ToricCode
+from src.core.code_parameters import _parameter_cache, cached_rank, code_parameters, distance_bounds
+
+
+def _nkd(params):
+    return params['n'], params['k'], params['distance']
+
+
+def test_steane_and_reed_muller_parameters():
+    assert _nkd(SteaneCode().parameters()) == (7, 1, 3)
+    assert (SteaneCode().k, SteaneCode().d) == (1, 3)
+    assert _nkd(ReedMullerCode().parameters()) == (15, 1, 3)
+    assert (ReedMullerCode().k, ReedMullerCode().d) == (1, 3)
+    assert _nkd(ReedMullerCode(use_extended=False).parameters()) == (8, 3, 2)
+
+
+@pytest.mark.parametrize('L', [3, 4])
+def test_toric_parameters(L):
+    code = ToricCode(L)
+    Hx, Hz = code.get_css_matrices()
+    assert _nkd(code_parameters(Hx=Hx, Hz=Hz)) == (2 * L * L, 2, L)
+    assert distance_bounds(Hz, Hx) == (L, L)
+
+
+@pytest.mark.parametrize('modulus', [3, 4])
+def test_repetition_code_over_z_d(modulus):
+    # x_0 = x_1 = x_2 is the only solution of the two difference checks
+    H = np.array([[1, modulus - 1, 0], [0, 1, modulus - 1]])
+    assert _nkd(code_parameters(H=H, modulus=modulus)) == (3, 1, 3)
+
+
+def test_ranks_are_memoized():
+    H = SteaneCode().H
+    assert cached_rank(H) == 3
+    entries = len(_parameter_cache)
+    assert cached_rank(H.copy()) == 3
+    assert len(_parameter_cache) == entries
+    assert cached_rank(np.array([[1, 2], [2, 1]]), modulus=3) == 1
+
+
+def test_verify_distance():
+    assert ToricCode(3).verify_distance() == 'confirmed'
+    assert QuditSurfaceCode(3, 2).verify_distance() == 'confirmed'
+    # The kernel of the charge checks alone has distance 2, below the nominal L = 3
+    assert QuditSurfaceCode(3, 3).verify_distance() == 'refuted'
+    # Too small a budget to enumerate any weight or find the lightest logical
+    assert ToricCode(6).verify_distance(enumeration_budget=10, iterations=3, seed=0) == 'inconclusive'
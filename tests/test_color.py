@@ -0,0 +1,48 @@
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from src.codes.color import ColorCodeRestrictionDecoder, TriangularColorCode
+from src.core.datasets import observable_matrix
+
+
+def _errors_up_to(n, weight):
+    supports = [s for w in range(1, weight + 1) for s in combinations(range(n), w)]
+    errors = np.zeros((len(supports), n), dtype=np.uint8)
+    for row, support in enumerate(supports):
+        errors[row, list(support)] = 1
+    return errors
+
+
+@pytest.mark.parametrize('distance', [3, 5, 7])
+def test_every_error_below_half_the_distance_is_corrected(distance):
+    code = TriangularColorCode(distance)
+    decoder = ColorCodeRestrictionDecoder(code)
+    errors = _errors_up_to(code.n_physical, (distance - 1) // 2)
+    syndromes = (errors @ code.H.T) % 2
+    corrections = decoder.decode_batch(syndromes)
+
+    np.testing.assert_array_equal((corrections @ code.H.T) % 2, syndromes)
+    residual = corrections ^ errors
+    assert not ((residual @ observable_matrix(code.H, code.H).T) % 2).any()
+
+
+def test_weight_four_errors_the_candidates_miss_are_found_by_search():
+    # Each of these leaves the true class only at weight 6 or more after descent
+    code = TriangularColorCode(9)
+    supports = [[29, 36, 45, 51], [11, 26, 32, 42], [5, 27, 28, 46], [6, 28, 34, 44],
+                [36, 41, 48, 58], [3, 11, 26, 49]]
+    errors = np.zeros((len(supports), code.n_physical), dtype=np.uint8)
+    for row, support in enumerate(supports):
+        errors[row, support] = 1
+    corrections = ColorCodeRestrictionDecoder(code).decode_batch((errors @ code.H.T) % 2)
+    assert not (((corrections ^ errors) @ observable_matrix(code.H, code.H).T) % 2).any()
+
+
+def test_random_corrections_reproduce_syndromes():
+    code = TriangularColorCode(9)
+    errors = (np.random.default_rng(0).random((200, code.n_physical)) < 0.08).astype(np.uint8)
+    syndromes = (errors @ code.H.T) % 2
+    corrections = ColorCodeRestrictionDecoder(code).decode_batch(syndromes)
+    np.testing.assert_array_equal((corrections @ code.H.T) % 2, syndromes)
@@ -0,0 +1,43 @@
+from itertools import combinations
+
+import numpy as np
+
+from src.codes.concatenated import CodeLevel, ConcatenatedCode, HierarchicalDecoder
+from src.codes.reed_muller import ReedMullerCode
+from src.codes.steane import SteaneCode
+from src.core.datasets import observable_matrix
+
+
+def test_steane_squared_corrects_every_pair_of_flips():
+    code = ConcatenatedCode.repeated(SteaneCode(), 2)
+    n = code.n_physical
+    supports = [(q,) for q in range(n)] + list(combinations(range(n), 2))
+    errors = np.zeros((len(supports), n), dtype=np.uint8)
+    for row, support in enumerate(supports):
+        errors[row, list(support)] = 1
+    syndromes = code.syndromes(errors)
+    corrections = HierarchicalDecoder(code).decode_batch(syndromes)
+
+    np.testing.assert_array_equal(code.syndromes(corrections), syndromes)
+    Hx, Hz = code.get_css_matrices()
+    assert not (((corrections ^ errors) @ observable_matrix(Hz, Hx).T) % 2).any()
+
+
+def test_random_corrections_reproduce_syndromes():
+    code = ConcatenatedCode.repeated(SteaneCode(), 3)
+    errors = (np.random.default_rng(0).random((64, code.n_physical)) < 0.05).astype(np.uint8)
+    syndromes = code.syndromes(errors)
+    corrections = HierarchicalDecoder(code, p=0.05).decode_batch(syndromes)
+    np.testing.assert_array_equal(code.syndromes(corrections), syndromes)
+
+
+def test_reed_muller_levels_use_their_own_css_checks():
+    assert CodeLevel(ReedMullerCode()).k == 1
+    assert CodeLevel(ReedMullerCode(False)).k == 3
+
+    code = ConcatenatedCode([SteaneCode(), ReedMullerCode()])
+    assert code.k_logical == 1
+    errors = (np.random.default_rng(1).random((32, code.n_physical)) < 0.03).astype(np.uint8)
+    syndromes = code.syndromes(errors)
+    corrections = HierarchicalDecoder(code, p=0.03).decode_batch(syndromes)
+    np.testing.assert_array_equal(code.syndromes(corrections), syndromes)
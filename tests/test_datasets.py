@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.codes.color import TriangularColorCode
+from src.core.datasets import SyndromeDataset, unpack, write_syndrome_dataset
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    write_syndrome_dataset(TriangularColorCode(5), str(tmp_path), samples=1000, p=0.1,
+                           shard_size=300, seed=0)
+    return SyndromeDataset(str(tmp_path))
+
+
+def test_labels_follow_the_stored_matrices(dataset):
+    assert len(dataset) == 1000 and dataset.num_shards == 4
+    columns = dataset.read(0, len(dataset), unpacked=True)
+    errors = columns['errors']
+    np.testing.assert_array_equal(columns['syndromes'], (errors @ dataset.H_detect.T) % 2)
+    np.testing.assert_array_equal(columns['observables'], (errors @ dataset.observables.T) % 2)
+    packed = dataset.read(250, 350)
+    np.testing.assert_array_equal(unpack(packed['errors'], dataset.bits['errors']), errors[250:350])
+
+
+def test_batches_cover_an_epoch_once(dataset):
+    reference = dataset.read(0, len(dataset), unpacked=True)['errors']
+    seen = np.concatenate([batch['errors'] for batch in dataset.batches(64, seed=1, unpacked=True)])
+    assert len(seen) == len(dataset)
+    order = lambda rows: rows[np.lexsort(rows.T)]
+    np.testing.assert_array_equal(order(seen), order(reference))
+
+    sizes = [len(batch['errors']) for batch in dataset.batches(64, shuffle=False, drop_last=True)]
+    assert sizes == [64] * (len(dataset) // 64)
+
+
+def test_exactly_one_noise_source(tmp_path):
+    with pytest.raises(ValueError):
+        write_syndrome_dataset(TriangularColorCode(3), str(tmp_path), samples=10)
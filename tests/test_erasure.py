@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.codes.color import TriangularColorCode
+from src.core.code_abstractions import ToricCode
+from src.core.datasets import observable_matrix
+from src.core.decoders import LookupTableDecoder
+from src.core.erasure import ErasureDecoder, UnionFindDecoder, sample_erasure_errors
+from src.utils.artifact_cache import ArtifactCache
+
+
+def _toric(L=4):
+    Hx, Hz = ToricCode(L, cache=ArtifactCache(directory='')).get_css_matrices()
+    return np.asarray(Hx, dtype=np.uint8), np.asarray(Hz, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('method', ['peel', 'solve'])
+def test_erasure_corrections_stay_on_the_erasures(method):
+    H = _toric()[1] if method == 'peel' else TriangularColorCode(5).H
+    decoder = ErasureDecoder(H)
+    assert decoder.method == method
+    errors, erasures = sample_erasure_errors(np.random.default_rng(0), 300, H.shape[1], 0.2)
+    syndromes = (errors @ H.T) % 2
+    corrections, solved = decoder.solve(syndromes, erasures)
+    assert solved.all()
+    np.testing.assert_array_equal((corrections @ H.T) % 2, syndromes)
+    assert not (corrections & ~erasures).any()
+
+
+def test_unexplained_shots_go_to_the_fallback():
+    H = TriangularColorCode(3).H
+    fallback = LookupTableDecoder(H, cache=ArtifactCache(directory=''))
+    errors = np.eye(7, dtype=np.uint8)
+    erasures = np.zeros((7, 7), dtype=bool)
+    syndromes = (errors @ H.T) % 2
+    corrections = ErasureDecoder(H, fallback=fallback).decode_batch(syndromes, erasures)
+    np.testing.assert_array_equal(corrections, errors)
+
+
+def test_union_find_reproduces_syndromes_with_and_without_erasures():
+    Hx, Hz = _toric(6)
+    decoder = UnionFindDecoder(Hz)
+    errors, erasures = sample_erasure_errors(np.random.default_rng(1), 300, Hz.shape[1], 0.1, p_flip=0.03)
+    syndromes = (errors @ Hz.T) % 2
+    for given in (None, erasures):
+        corrections = decoder.decode_batch(syndromes, given)
+        np.testing.assert_array_equal((corrections @ Hz.T) % 2, syndromes)
+
+
+def test_union_find_corrects_every_single_flip():
+    Hx, Hz = _toric(5)
+    errors = np.eye(Hz.shape[1], dtype=np.uint8)
+    corrections = UnionFindDecoder(Hz).decode_batch((errors @ Hz.T) % 2)
+    residual = corrections ^ errors
+    assert not ((residual @ Hz.T) % 2).any()
+    assert not ((residual @ observable_matrix(Hz, Hx).T) % 2).any()
+
+
+def test_union_find_shots_do_not_leak_state():
+    Hx, Hz = _toric(6)
+    decoder = UnionFindDecoder(Hz)
+    errors, erasures = sample_erasure_errors(np.random.default_rng(2), 200, Hz.shape[1], 0.1, p_flip=0.03)
+    syndromes = (errors @ Hz.T) % 2
+    alone = np.vstack([decoder.decode_batch(syndromes[i:i + 1], erasures[i:i + 1]) for i in range(200)])
+    np.testing.assert_array_equal(decoder.decode_batch(syndromes, erasures), alone)
+    np.testing.assert_array_equal(decoder.decode_batch(syndromes[::-1], erasures[::-1]), alone[::-1])
+    with ThreadPoolExecutor(4) as pool:
+        batches = pool.map(lambda i: decoder.decode_batch(syndromes[i::4], erasures[i::4]), range(4))
+    for i, corrections in enumerate(batches):
+        np.testing.assert_array_equal(corrections, alone[i::4])
+
+
+def test_union_find_needs_graph_like_checks():
+    with pytest.raises(ValueError):
+        UnionFindDecoder(TriangularColorCode(3).H)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from src.codes.reed_muller import ReedMullerGame
+from src.codes.steane import SteaneCode, SteaneGame
+from src.games.adversarial import BeatTheDecoderGame
+from src.games.hamming_game import G, H_PUZZLE, SYNDROME_TO_ERROR, HammingGame
+
+
+@pytest.mark.parametrize('game_class', [SteaneGame, ReedMullerGame, HammingGame])
+def test_check_answers_needs_a_batch(game_class):
+    with pytest.raises(ValueError, match='play_rounds'):
+        game_class().check_answers([0])
+
+
+@pytest.mark.parametrize('game_class', [SteaneGame, ReedMullerGame, HammingGame])
+def test_true_locations_score_every_round(game_class):
+    game = game_class()
+    batch = game.play_rounds(100, seed=0)
+    assert game.check_answers(batch.locations[:, 0]).all()
+    assert game.score == 100
+
+
+def test_hamming_codewords_have_zero_syndrome():
+    assert not ((G @ H_PUZZLE.T) % 2).any()
+
+
+def test_hamming_syndrome_readings_agree():
+    game = HammingGame()
+    batch = game.play_rounds(200, seed=1)
+    # syndrome_decimal is the 1-based error position, as is the game's lookup
+    np.testing.assert_array_equal(batch.syndrome_decimal, batch.locations[:, 0] + 1)
+    for i in range(len(batch)):
+        syndrome = game.calculate_syndrome(batch.extras['received'][i])
+        assert SYNDROME_TO_ERROR[syndrome[::-1]] == batch.syndrome_decimal[i]
+
+
+def test_beat_the_decoder_on_steane():
+    H = SteaneCode().H
+    game = BeatTheDecoderGame(H, H, seed=0)
+    assert game.par()['failure_weight'] == 2 and game.par()['logical_weight'] == 3
+
+    assert not game.submit([4])['decoder_fooled']
+    result = game.submit(np.flatnonzero(game.par()['failure_error']).tolist())
+    assert result['decoder_fooled'] and result['weight'] == 2
+    assert game.get_stats() == {'attempts': 2, 'wins': 1, 'best_weight': 2}
@@ -0,0 +1,27 @@
+import threading
+
+from src.utils.instrumentation import Instrumentation
+
+
+def test_snapshots_while_other_threads_emit_events():
+    instruments = Instrumentation(enabled=True, max_events=100)
+    seen = []
+    instruments.listeners.append(lambda event: instruments.count('heard'))
+    stop = threading.Event()
+
+    def emit():
+        while not stop.is_set():
+            instruments.event({'kind': 'tick'})
+
+    emitters = [threading.Thread(target=emit) for _ in range(4)]
+    for emitter in emitters:
+        emitter.start()
+    try:
+        for _ in range(2000):
+            seen.append(len(instruments.snapshot(include_events=True)['events']))
+    finally:
+        stop.set()
+        for emitter in emitters:
+            emitter.join()
+    assert max(seen) <= 100
+    assert instruments.snapshot()['counters']['heard'] >= len(instruments.events)
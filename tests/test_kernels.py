@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from src.utils.kernels import KERNELS, verify_kernels
+
+
+@pytest.mark.parametrize('name', sorted(KERNELS))
+def test_every_implementation_agrees_with_the_reference(name):
+    row = verify_kernels([name], trials=25)[name]
+    assert 'python' in row['implementations']
+    assert row['mismatches'] == 0
+
+
+@pytest.mark.parametrize('name', sorted(KERNELS))
+def test_active_backend_matches_the_reference(name):
+    entry = KERNELS[name]
+    args = entry.sample(np.random.default_rng(1))
+    np.testing.assert_array_equal(np.asarray(entry(*args)), np.asarray(entry.reference(*args)))
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.codes.steane import SteaneCode
+from src.core.code_abstractions import ToricCode
+from src.core.decoders import LookupTableDecoder
+from src.core.logical_operators import find_decoder_failure, find_min_weight_logical
+from src.utils import gf2
+
+
+def _nontrivial_logicals(operators, H_detect, H_stab):
+    """True if every row is undetected by H_detect and outside rowspace(H_stab)."""
+    silent = not ((operators.astype(np.int64) @ H_detect.T) % 2).any()
+    return silent and all(gf2.rank(np.vstack([H_stab, op])) > gf2.rank(H_stab) for op in operators)
+
+
+@pytest.mark.parametrize('name, distance', [('steane', 3), ('toric', 3)])
+def test_exact_minimum_weight_logicals(name, distance):
+    if name == 'steane':
+        H_stab = H_detect = SteaneCode().H
+    else:
+        H_stab, H_detect = ToricCode(3).get_css_matrices()
+    result = find_min_weight_logical(H_detect, H_stab, use_cache=False)
+    assert result.exact and result.weight == distance
+    assert result.operator.sum() == distance
+    assert (result.undetectable.sum(axis=1) == distance).all()
+    assert _nontrivial_logicals(result.undetectable, H_detect, H_stab)
+
+
+def test_randomized_search_is_an_upper_bound():
+    Hx, Hz = ToricCode(6).get_css_matrices()
+    result = find_min_weight_logical(Hz, Hx, seed=0, use_cache=False)
+    assert not result.exact and result.weight >= 6
+    assert _nontrivial_logicals(result.operator[None, :], Hz, Hx)
+
+
+def test_lookup_decoder_on_steane_fails_on_a_weight_two_error():
+    H = SteaneCode().H
+    decoder = LookupTableDecoder(H)
+    failure = find_decoder_failure(decoder, H, H, seed=0)
+    assert failure['weight'] == 2 and failure['exact']
+    residual = decoder.decode((H @ failure['error']) % 2) ^ failure['error']
+    assert _nontrivial_logicals(residual[None, :], H, H)
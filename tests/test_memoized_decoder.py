@@ -0,0 +1,63 @@
+import threading
+
+import numpy as np
+
+from src.codes.steane import SteaneCode
+from src.core.decoders import LookupTableDecoder, MemoizedDecoder
+from src.utils.artifact_cache import ArtifactCache
+
+
+def _lookup():
+    return LookupTableDecoder(SteaneCode().H, cache=ArtifactCache(directory=''))
+
+
+def _syndromes(shots, seed=0):
+    H = SteaneCode().H
+    errors = (np.random.default_rng(seed).random((shots, H.shape[1])) < 0.1).astype(np.uint8)
+    return (errors @ H.T) % 2
+
+
+def test_corrections_match_the_wrapped_decoder_and_reproduce_syndromes():
+    inner = _lookup()
+    decoder = MemoizedDecoder(inner)
+    syndromes = _syndromes(500)
+    corrections = decoder.decode_batch(syndromes)
+    np.testing.assert_array_equal(corrections, inner.decode_batch(syndromes))
+    np.testing.assert_array_equal((corrections @ SteaneCode().H.T) % 2, syndromes)
+
+    distinct = len(np.unique(syndromes, axis=0))
+    assert decoder.stats()['misses'] == distinct
+    assert decoder.stats()['hits'] == len(syndromes) - distinct
+    decoder.decode_batch(syndromes)
+    assert decoder.stats()['misses'] == distinct
+
+
+def test_lru_bounds_entries():
+    decoder = MemoizedDecoder(_lookup(), max_entries=3)
+    decoder.decode_batch(np.eye(3, dtype=np.uint8))
+    decoder.decode_batch(np.array([[1, 1, 0], [0, 1, 1]], dtype=np.uint8))
+    stats = decoder.stats()
+    assert stats['entries'] == 3 and stats['evictions'] == 2
+    decoder.clear()
+    assert decoder.stats()['entries'] == 0 and decoder.nbytes == 0
+
+
+def test_concurrent_batches_count_every_shot():
+    decoder = MemoizedDecoder(_lookup())
+    batches = [_syndromes(200, seed) for seed in range(8)]
+    expected = [_lookup().decode_batch(batch) for batch in batches]
+    results = [None] * len(batches)
+
+    def decode(i):
+        results[i] = decoder.decode_batch(batches[i])
+
+    threads = [threading.Thread(target=decode, args=(i,)) for i in range(len(batches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for result, reference in zip(results, expected):
+        np.testing.assert_array_equal(result, reference)
+    stats = decoder.stats()
+    assert stats['hits'] + stats['misses'] == 200 * len(batches)
+    assert stats['entries'] <= 8
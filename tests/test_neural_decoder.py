@@ -0,0 +1,46 @@
+import numpy as np
+
+from src.codes.color import TriangularColorCode
+from src.core.datasets import SyndromeDataset, write_syndrome_dataset
+from src.core.decoders import LookupTableDecoder
+from src.core.neural_decoder import NeuralDecoder, evaluate_decoder
+from src.utils.artifact_cache import ArtifactCache
+
+
+def test_corrections_reproduce_syndromes_and_predicted_classes():
+    code = TriangularColorCode(5)
+    decoder = NeuralDecoder.for_code(code, hidden=(32,), seed=0)
+    syndromes = np.random.default_rng(0).integers(0, 2, (300, code.H.shape[0])).astype(np.uint8)
+    corrections = decoder.decode_batch(syndromes)
+    np.testing.assert_array_equal((corrections @ code.H.T) % 2, syndromes)
+    classes = ((corrections @ decoder.observables.T) % 2) @ (1 << np.arange(decoder.k))
+    np.testing.assert_array_equal(classes, decoder.predict_classes(syndromes))
+
+
+def test_training_reaches_the_lookup_table_and_survives_a_round_trip(tmp_path):
+    code = TriangularColorCode(3)
+    write_syndrome_dataset(code, str(tmp_path / 'data'), samples=4000, p=0.05, seed=0)
+    dataset = SyndromeDataset(str(tmp_path / 'data'))
+    decoder = NeuralDecoder.for_code(code, hidden=(32,), seed=0)
+    history = decoder.fit(dataset, epochs=8, batch_size=128, learning_rate=1e-2, seed=0)
+    assert history[-1]['loss'] < history[0]['loss']
+
+    lookup = LookupTableDecoder(code.H, cache=ArtifactCache(directory=''))
+    assert evaluate_decoder(decoder, dataset)['failures'] <= evaluate_decoder(lookup, dataset)['failures']
+
+    decoder.save(str(tmp_path / 'model'))
+    loaded = NeuralDecoder.load(str(tmp_path / 'model'))
+    assert isinstance(loaded.weights[0], np.memmap)
+    syndromes = dataset.read(0, 500, unpacked=True)['syndromes']
+    np.testing.assert_array_equal(loaded.decode_batch(syndromes), decoder.decode_batch(syndromes))
+
+
+def test_varying_batch_sizes_reuse_the_largest_buffers():
+    code = TriangularColorCode(5)
+    decoder = NeuralDecoder.for_code(code, hidden=(32,), seed=0)
+    syndromes = np.random.default_rng(1).integers(0, 2, (64, code.H.shape[0])).astype(np.uint8)
+    expected = decoder.predict_classes(syndromes)
+    first = decoder._local.buffers[0]
+    for rows in (5, 64, 1, 33):
+        np.testing.assert_array_equal(decoder.predict_classes(syndromes[:rows]), expected[:rows])
+    assert decoder._local.buffers[0] is first
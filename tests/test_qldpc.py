@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.codes.qldpc import BivariateBicycleCode, HypergraphProductCode, repetition_checks
+from src.codes.steane import SteaneCode
+from src.utils.artifact_cache import ArtifactCache
+
+
+def _commute(code):
+    Hx, Hz = code.get_css_matrices()
+    return not ((Hx.astype(np.int64) @ Hz.T) % 2).any()
+
+
+@pytest.mark.parametrize('checks, n, k', [
+    (repetition_checks(3), 13, 1),              # planar surface code
+    (repetition_checks(3, cyclic=True), 18, 2),  # toric code
+    (SteaneCode().H, 58, 16),
+])
+def test_hypergraph_products(checks, n, k):
+    code = HypergraphProductCode(checks, cache=ArtifactCache(directory=''))
+    assert _commute(code)
+    assert (code.n_physical, code.k_logical) == (n, k)
+
+
+def test_gross_code():
+    code = BivariateBicycleCode.from_preset('gross', cache=ArtifactCache(directory=''))
+    assert _commute(code)
+    assert (code.n_physical, code.k_logical, code.distance) == (144, 12, 12)
+    assert code.check_weights() == {'max_row_weight': 6, 'max_column_weight': 3}
+
+
+@pytest.mark.parametrize('name', ['72_12_6', '90_8_10', '108_8_10'])
+def test_bivariate_bicycle_presets(name):
+    code = BivariateBicycleCode.from_preset(name, cache=ArtifactCache(directory=''))
+    n, k, _ = (int(part) for part in name.split('_'))
+    assert _commute(code)
+    assert (code.n_physical, code.k_logical) == (n, k)
+
+
+def test_sparse_syndromes_match_dense():
+    code = BivariateBicycleCode.from_preset('72_12_6', cache=ArtifactCache(directory=''))
+    Hx, Hz = code.get_css_matrices()
+    errors = (np.random.default_rng(0).random((16, code.n_physical)) < 0.1).astype(np.uint8)
+    np.testing.assert_array_equal(code.syndromes(errors, 'X'), (errors @ Hz.T) % 2)
+    np.testing.assert_array_equal(code.syndromes(errors, 'Z'), (errors @ Hx.T) % 2)
@@ -0,0 +1,18 @@
+import numpy as np
+
+from src.core.code_abstractions import QuditSurfaceCode
+from src.core.qudit_decoders import QuditClusterDecoder
+
+
+def test_charges_match_dense_checks():
+    code = QuditSurfaceCode(d=10, L=5)
+    errors = code.sample_errors(0.2, 40, seed=0)
+    np.testing.assert_array_equal(code.charges(errors), (errors @ code.H.T) % code.d)
+
+
+def test_cluster_corrections_reproduce_charges():
+    for d in (3, 10):
+        code = QuditSurfaceCode(d=d, L=6)
+        syndromes = code.charges(code.sample_errors(0.1, 200, seed=1))
+        corrections = QuditClusterDecoder(code).decode_batch(syndromes)
+        np.testing.assert_array_equal(code.charges(corrections), syndromes)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.codes.steane import SteaneCode
+from src.core.code_abstractions import ToricCode
+from src.core.decoders import LookupTableDecoder
+from src.core.erasure import UnionFindDecoder
+from src.core.rare_events import splitting_failure_rate, stratified_failure_rate
+from src.core.weight_enumerators import failure_counts, logical_error_curve
+
+
+def test_stratification_matches_the_exact_steane_curve():
+    H = SteaneCode().H
+    p = [1e-6, 1e-3, 0.05]
+    # Every stratum of 7 qubits has at most 35 patterns, so all are enumerated
+    result = stratified_failure_rate(LookupTableDecoder(H), H, p, H_stab=H, shots_per_weight=100, max_weight=7)
+    assert all(s['exact'] for s in result['strata'])
+    np.testing.assert_allclose(result['rate'], logical_error_curve(failure_counts(H, H), p), rtol=1e-9)
+    assert not result['std_error'].any()
+
+
+def test_splitting_agrees_with_stratification_on_a_toric_code():
+    Hx, Hz = ToricCode(3).get_css_matrices()
+    decoder = UnionFindDecoder(Hz)
+    reference = stratified_failure_rate(decoder, Hz, 0.005, H_stab=Hx, shots_per_weight=20_000, seed=0)
+    split = splitting_failure_rate(decoder, Hz, 0.005, H_stab=Hx, start_shots=20_000, chains=200,
+                                   steps=100, burn_in=30, seed=0)
+    assert split['ladder'][0] == 0.1 and len(split['ratios']) == len(split['ladder']) - 1
+    np.testing.assert_allclose(split['rate'], reference['rate'], rtol=0.25)
@@ -0,0 +1,17 @@
+import numpy as np
+
+from src.codes.steane import SteaneCode
+from src.utils.rendering import build_marker_template, fill_marker_template
+
+
+def test_fill_marker_template_marks_set_bits():
+    template = build_marker_template(['a[', 'b['], [']', ']'], ' ')
+    masks = np.array([[0, 0], [1, 0], [1, 1]], dtype=bool)
+    assert fill_marker_template(*template, masks) == ['a[ ] b[ ]', 'a[X] b[ ]', 'a[X] b[X]']
+
+
+def test_batched_rendering_matches_single_rendering():
+    code = SteaneCode()
+    masks = np.random.default_rng(0).random((20, 7)) < 0.3
+    rendered = code.visualize_errors(masks)
+    assert rendered == [code.visualize_error(np.flatnonzero(row).tolist()) for row in masks]
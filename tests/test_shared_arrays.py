@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.artifact_cache import ArtifactCache, default_cache, set_default_cache
+from src.utils.shared_arrays import SharedArrays, SharedArtifacts, install_shared_cache
+
+
+def _table_sum(handle):
+    register = resource_tracker.register
+    install_shared_cache(handle)
+    table = default_cache().get('owner', {'n': 3})['table']
+    return int(table.sum()), resource_tracker.register is register
+
+
+def _attached_sum(handle):
+    attached = SharedArrays.attach(handle)
+    total = int(attached['a'].sum())
+    attached.close()
+    return total
+
+
+# Spawned workers share the publisher's resource tracker, whose complaints go to stderr
+_SPAWN_SCRIPT = """
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+from src.utils.shared_arrays import SharedArrays
+from tests.test_shared_arrays import _attached_sum
+
+if __name__ == '__main__':
+    with SharedArrays.publish({'a': np.arange(10)}) as shared:
+        with ProcessPoolExecutor(2, mp_context=get_context('spawn')) as pool:
+            print(list(pool.map(_attached_sum, [shared.handle] * 2)))
+"""
+
+
+def test_attached_views_are_read_only_copies_of_the_published_arrays():
+    arrays = {'a': np.arange(10, dtype=np.int64), 'b': np.ones((3, 5), dtype=np.uint8)}
+    with SharedArrays.publish(arrays) as shared:
+        attached = SharedArrays.attach(shared.handle)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(attached[name], array)
+            assert not attached[name].flags.writeable
+        attached.close()
+
+
+def test_file_backed_blocks(tmp_path):
+    with SharedArrays.publish({'a': np.arange(7)}, path=str(tmp_path / 'block')) as shared:
+        np.testing.assert_array_equal(SharedArrays.attach(shared.handle)['a'], np.arange(7))
+
+
+def test_shared_cache_serves_workers():
+    cache = ArtifactCache(directory='')
+    table = cache.get_or_build('owner', {'n': 3}, lambda: {'table': np.arange(12).reshape(3, 4)})['table']
+    with SharedArtifacts.publish(cache) as shared:
+        np.testing.assert_array_equal(shared.to_cache().get('owner', {'n': 3})['table'], table)
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(_table_sum, [shared.handle] * 2))
+    assert results == [(66, True)] * 2
+
+
+def test_set_default_cache_returns_the_previous_one():
+    cache = ArtifactCache(directory='')
+    previous = set_default_cache(cache)
+    try:
+        assert default_cache() is cache
+    finally:
+        assert set_default_cache(previous) is cache
+
+
+def test_spawned_workers_leave_the_publisher_registered(tmp_path):
+    root = str(Path(__file__).resolve().parents[1])
+    script = tmp_path / 'spawn_workers.py'
+    script.write_text(_SPAWN_SCRIPT)
+    result = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=120,
+                            cwd=root, env={**os.environ, 'PYTHONPATH': root})
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '[45, 45]'
+    assert 'KeyError' not in result.stderr and 'leaked' not in result.stderr
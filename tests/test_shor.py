@@ -0,0 +1,34 @@
+import numpy as np
+
+from src.codes.shor import ShorCode, ShorDecoder
+from src.core.datasets import observable_matrix
+from src.core.decoders import unpack_bits
+
+
+def test_corrections_reproduce_every_syndrome():
+    code = ShorCode()
+    syndromes = unpack_bits(np.arange(1 << 8, dtype=np.uint64), 8)
+    corrections = ShorDecoder(code).decode_batch(syndromes)
+    x_part, z_part = corrections[:, :9], corrections[:, 9:]
+    np.testing.assert_array_equal(code.syndromes(x_part, z_part), syndromes)
+
+
+def test_every_single_qubit_pauli_is_corrected():
+    code = ShorCode()
+    eye = np.eye(9, dtype=np.uint8)
+    zeros = np.zeros_like(eye)
+    x_errors = np.vstack([eye, zeros, eye])   # X, Z and Y on every qubit
+    z_errors = np.vstack([zeros, eye, eye])
+    corrections = ShorDecoder(code).decode_batch(code.syndromes(x_errors, z_errors))
+
+    x_residual = corrections[:, :9] ^ x_errors
+    z_residual = corrections[:, 9:] ^ z_errors
+    assert not ((x_residual @ observable_matrix(code.Hz, code.Hx).T) % 2).any()
+    assert not ((z_residual @ observable_matrix(code.Hx, code.Hz).T) % 2).any()
+    assert not (code.syndromes(x_residual, z_residual)).any()
+
+
+def test_diagnose_reads_the_engine_string():
+    stages = ShorDecoder().diagnose('10' + '0000' + '00')
+    assert stages[0]['qubits'] == [0] and stages[0]['pauli'] == 'X'
+    assert stages[1]['qubits'] == []
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from src.utils.artifact_cache import ArtifactCache
+from src.visualizers.six_hundred_cell import PROJECTION_DISTANCE, SixHundredCell, load_asset
+
+
+@pytest.fixture(scope='module')
+def cell():
+    return SixHundredCell(cache=ArtifactCache(directory=''))
+
+
+def _page_projection(point, xw, yw, zw, R=PROJECTION_DISTANCE):
+    """rotate4D then project4Dto3D from gottesmann-game.html, line by line."""
+    x, y, z, w = point
+    c, s = np.cos(xw), np.sin(xw)
+    x, w = x * c - w * s, x * s + w * c
+    c, s = np.cos(yw), np.sin(yw)
+    y, w = y * c - w * s, y * s + w * c
+    c, s = np.cos(zw), np.sin(zw)
+    z, w = z * c - w * s, z * s + w * c
+    factor = 1 / (R - w)
+    return [x * factor, y * factor, z * factor]
+
+
+def test_counts(cell):
+    assert (len(cell.vertices), len(cell.edges), len(cell.faces), len(cell.cells)) == (120, 720, 1200, 600)
+    np.testing.assert_allclose(np.linalg.norm(cell.vertices, axis=1), 1.0)
+    assert len(np.unique(np.round(cell.vertices, 9), axis=0)) == 120
+
+
+def test_incidence(cell):
+    assert (cell.neighbours.row_weights() == 12).all()
+    assert (cell.vertex_cells.row_weights() == 20).all()
+    assert (cell.H.row_weights() == 4).all()
+    # Every cell's six vertex pairs are edges
+    edges = {tuple(e) for e in cell.edges.tolist()}
+    assert all((a, b) in edges for cell_vertices in cell.cells.tolist()
+               for i, a in enumerate(cell_vertices) for b in cell_vertices[i + 1:])
+
+
+def test_syndromes_light_the_cells_of_a_flipped_vertex(cell):
+    errors = np.zeros((2, 120), dtype=np.uint8)
+    errors[0, 5] = 1
+    errors[1, list(cell.edges[0])] = 1
+    syndromes = cell.syndromes(errors)
+    assert syndromes[0].sum() == 20
+    # Cells holding the whole edge see both flips and stay dark
+    shared = int(sum(set(cell.edges[0].tolist()) <= set(c) for c in cell.cells.tolist()))
+    assert syndromes[1].sum() == 2 * (20 - shared)
+
+
+def test_projection_matches_the_page(cell):
+    angles = np.array([[0.0, 0.0, 0.0], [0.3, -1.1, 2.4], [np.pi, 0.5, 0.25]])
+    frames = cell.project(angles)
+    assert frames.shape == (3, 120, 3) and frames.dtype == np.float32
+    for frame, (xw, yw, zw) in zip(frames, angles):
+        expected = [_page_projection(v, xw, yw, zw) for v in cell.vertices]
+        np.testing.assert_allclose(frame, expected, rtol=1e-5, atol=1e-6)
+
+
+def test_asset_round_trip(cell, tmp_path):
+    angles = cell.orbit_angles(8)
+    header = cell.export_asset(str(tmp_path / 'cell.bin'), angles)
+    assert header['projection_distance'] == PROJECTION_DISTANCE
+    arrays = load_asset(str(tmp_path / 'cell.bin'))
+    np.testing.assert_array_equal(arrays['cells'], cell.cells)
+    np.testing.assert_array_equal(arrays['neighbour_indices'], cell.neighbours.indices)
+    np.testing.assert_array_equal(arrays['vertex_cell_indptr'], cell.vertex_cells.indptr)
+    np.testing.assert_allclose(arrays['vertices'], cell.vertices, rtol=1e-6)
+    np.testing.assert_array_equal(arrays['frames'], cell.project(angles))
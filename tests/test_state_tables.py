@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from src.codes.color import TriangularColorCode
+from src.codes.steane import SteaneCode
+from src.utils.artifact_cache import ArtifactCache
+from src.visualizers.assets import write_asset
+from src.visualizers.state_tables import (ASSET_MAGIC, MAX_TABLE_QUBITS, TABLE_VERSION, SyndromeStateTable,
+                                          load_state_table)
+
+
+def test_steane_states_match_a_direct_scan():
+    code = SteaneCode()
+    table = SyndromeStateTable.for_steane(code, cache=ArtifactCache(directory=''))
+    assert table.state.shape == (7, 1 << 7)
+    rng = np.random.default_rng(0)
+    for selection, error in zip(rng.integers(0, 7, 50), rng.integers(0, 1 << 7, 50)):
+        flipped = [q for q in range(7) if (error >> q) & 1]
+        state = table.lookup(int(selection), int(error))
+        support = code.fano_complements[selection]
+        assert state['highlight'] == sorted(code.fano_lines[selection])
+        assert state['errors_in_support'] == sorted(set(flipped) & set(support))
+        assert state['fires'] == bool(len(state['errors_in_support']) % 2)
+        error_bits = np.zeros(7, dtype=np.uint8)
+        error_bits[flipped] = 1
+        assert state['syndrome'] == ((code.H @ error_bits) % 2).tolist()
+
+
+def test_corrections_reproduce_their_syndromes():
+    code = TriangularColorCode(3)
+    table = SyndromeStateTable.for_color_code(code, cache=ArtifactCache(directory=''))
+    corrections = table.corrections.astype(np.int64)
+    np.testing.assert_array_equal(table.syndromes[corrections], np.arange(1 << code.H.shape[0]))
+    # Single flips are corrected exactly
+    for q in range(code.n_physical):
+        assert table.corrections[table.syndromes[1 << q]] == 1 << q
+
+
+def test_asset_round_trip(tmp_path):
+    table = SyndromeStateTable.for_steane(cache=ArtifactCache(directory=''))
+    path = str(tmp_path / 'steane.bin')
+    header = table.export_asset(path)
+    assert (header['n'], header['m'], header['version']) == (7, 3, TABLE_VERSION)
+    arrays = load_state_table(path)
+    for name in ('state', 'syndromes', 'corrections', 'supports', 'highlights'):
+        np.testing.assert_array_equal(arrays[name], getattr(table, name))
+
+
+def test_stale_versions_and_large_codes_are_rejected(tmp_path):
+    path = str(tmp_path / 'stale.bin')
+    write_asset(path, ASSET_MAGIC, {'state': np.zeros(4, dtype=np.uint32)}, version=TABLE_VERSION + 1)
+    with pytest.raises(ValueError, match='version'):
+        load_state_table(path)
+    with pytest.raises(ValueError, match='limit'):
+        SyndromeStateTable(np.ones((1, MAX_TABLE_QUBITS + 1)), [[0]])
@@ -0,0 +1,42 @@
+from itertools import product
+
+import numpy as np
+
+from src.codes.steane import SteaneCode
+from src.core.weight_enumerators import (clear_enumerator_cache, css_enumerators, failure_counts,
+                                         kernel_enumerator, logical_error_curve, macwilliams_transform,
+                                         weight_enumerator)
+
+
+def _direct_enumerator(G):
+    """Weight distribution by summing every combination of the rows of G."""
+    G = np.asarray(G, dtype=np.int64)
+    words = {tuple((np.array(c) @ G) % 2) for c in product((0, 1), repeat=len(G))}
+    return np.bincount([sum(w) for w in words], minlength=G.shape[1] + 1)
+
+
+def test_steane_enumerators():
+    H = SteaneCode().H
+    np.testing.assert_array_equal(weight_enumerator(H), [1, 0, 0, 0, 7, 0, 0, 0])
+    np.testing.assert_array_equal(kernel_enumerator(H), [1, 0, 0, 7, 7, 0, 0, 1])
+    enumerators = css_enumerators(H, H)
+    np.testing.assert_array_equal(enumerators['logical_x'], [0, 0, 0, 7, 0, 0, 0, 1])
+    assert enumerators['distance'] == 3
+
+
+def test_steane_lookup_failures():
+    H = SteaneCode().H
+    failures = failure_counts(H, H)
+    np.testing.assert_array_equal(failures, [0, 0, 21, 7, 28, 0, 7, 1])
+    p = 0.01
+    expected = 21 * p**2 * (1 - p)**5 + 7 * p**3 * (1 - p)**4 + 28 * p**4 * (1 - p)**3 + 7 * p**6 * (1 - p) + p**7
+    assert np.isclose(logical_error_curve(failures, p), expected, rtol=1e-12)
+
+
+def test_macwilliams_path_matches_direct_enumeration():
+    # Dimension 8 of length 10: the 2-dimensional dual is enumerated instead
+    rng = np.random.default_rng(3)
+    G = np.hstack([np.eye(8, dtype=np.uint8), rng.integers(0, 2, (8, 2), dtype=np.uint8)])
+    clear_enumerator_cache()
+    np.testing.assert_array_equal(weight_enumerator(G), _direct_enumerator(G))
+    assert list(macwilliams_transform(macwilliams_transform(weight_enumerator(G)))) == list(weight_enumerator(G))
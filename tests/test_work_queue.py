@@ -0,0 +1,98 @@
+import os
+import time
+
+import pytest
+
+from src.core.sweeps import make_sweep, run_sweep
+from src.utils.work_queue import MAX_ATTEMPTS, DirectoryQueue
+
+
+class ExitingDecoder:
+    """Kills its worker process on the first batch."""
+
+    def __init__(self, H):
+        self.H = H
+
+    def decode_batch(self, syndromes):
+        os._exit(1)
+
+
+def _age(queue, task_id, seconds):
+    lease = queue._path('leases', task_id)
+    stamp = os.stat(lease).st_mtime - seconds
+    os.utime(lease, (stamp, stamp))
+
+
+def test_tasks_are_leased_once_and_completed(tmp_path):
+    queue = DirectoryQueue(str(tmp_path))
+    assert queue.submit({'a': {'x': 1}, 'b': {'x': 2}}) == 2
+    assert queue.submit({'a': {'x': 1}}) == 0
+
+    first, second = queue.claim('w1'), queue.claim('w2')
+    assert {first[0], second[0]} == {'a', 'b'}
+    assert queue.claim('w3') is None
+    for task_id, payload in (first, second):
+        queue.complete(task_id, {'y': payload['x'] * 10})
+    assert queue.finished()
+    assert queue.results() == {'a': {'y': 10}, 'b': {'y': 20}}
+
+
+def test_stale_leases_are_reclaimed(tmp_path):
+    queue = DirectoryQueue(str(tmp_path), lease_timeout=5.0, heartbeat=1.0)
+    queue.submit({'a': {}})
+    assert queue.claim('dead')[0] == 'a'
+    assert queue.claim('w2') is None
+    _age(queue, 'a', 60)
+    assert queue.claim('w2')[0] == 'a'
+
+
+def test_a_lease_refreshed_during_reclaim_is_put_back(tmp_path, monkeypatch):
+    queue = DirectoryQueue(str(tmp_path), lease_timeout=5.0, heartbeat=1.0)
+    queue.submit({'a': {}})
+    queue.claim('owner')
+    _age(queue, 'a', 60)
+    rename = os.rename
+
+    def heartbeat_then_rename(source, target):
+        if source.endswith('.lease'):
+            os.utime(source)   # the owner beats just before the reclaiming rename
+        rename(source, target)
+
+    monkeypatch.setattr(os, 'rename', heartbeat_then_rename)
+    assert queue.claim('thief') is None
+    with open(queue._path('leases', 'a')) as handle:
+        assert handle.read() == 'owner'
+    assert [name for name in os.listdir(os.path.join(queue.root, 'leases'))] == ['a.lease']
+
+
+def test_tasks_that_keep_raising_are_given_up(tmp_path):
+    queue = DirectoryQueue(str(tmp_path))
+    queue.submit({'a': {}})
+    calls = []
+
+    def run(payload):
+        calls.append(payload)
+        raise ValueError('boom')
+
+    assert queue.work(run, poll=0.01) == 0
+    assert len(calls) == MAX_ATTEMPTS
+    assert queue.status()['failed'] == 1 and queue.finished()
+
+
+def test_directory_sweep_matches_local_sweep(tmp_path):
+    tasks = make_sweep('src.codes.steane:SteaneCode', 'src.core.decoders:LookupTableDecoder',
+                       [0.05, 0.1], shots=400, chunks=2, seed=3)
+    local = run_sweep(tasks, backend='local', workers=2)
+    shared = run_sweep(tasks, backend='directory', workers=2, queue_dir=str(tmp_path), poll=0.05)
+    assert shared['failures'].tolist() == local['failures'].tolist()
+    assert shared['failed_tasks'] == []
+
+
+def test_directory_sweep_raises_when_a_worker_dies(tmp_path):
+    tasks = make_sweep('src.codes.steane:SteaneCode', 'tests.test_work_queue:ExitingDecoder',
+                       [0.1], shots=10)
+    start = time.monotonic()
+    with pytest.raises(RuntimeError):
+        run_sweep(tasks, backend='directory', workers=1, queue_dir=str(tmp_path), poll=0.05,
+                  timeout=60)
+    assert time.monotonic() - start < 30